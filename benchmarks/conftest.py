@@ -0,0 +1,64 @@
+"""Benchmarks run against the database of the settings, filled by
+``manage.py seed_benchmark_data``, instead of an empty test database.
+Every test still runs in a transaction that is rolled back."""
+
+import pytest
+from django.db.models import Count
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from jirabas.tasks.benchmarks import SEED_USERNAME_PREFIX
+from jirabas.tasks.models import Project, TasksRelation
+from jirabas.users.models import Role, User
+
+
+@pytest.fixture(scope="session")
+def django_db_setup():
+    pass
+
+
+@pytest.fixture(scope="session")
+def project(django_db_blocker) -> Project:
+    """The largest seeded project."""
+    with django_db_blocker.unblock():
+        project = (
+            Project.objects.filter(
+                members__member__username__startswith=SEED_USERNAME_PREFIX
+            )
+            .order_by("-task_counter")
+            .first()
+        )
+    if project is None:
+        pytest.skip("Run manage.py seed_benchmark_data first")
+    return project
+
+
+@pytest.fixture(scope="session")
+def manager(project: Project, django_db_blocker) -> User:
+    with django_db_blocker.unblock():
+        return User.objects.get(
+            projects__project=project,
+            projects__role=Role.get_project_manager(),
+        )
+
+
+@pytest.fixture(scope="session")
+def task_id(project: Project, django_db_blocker) -> int:
+    """The task of ``project`` with the most links."""
+    with django_db_blocker.unblock():
+        return (
+            TasksRelation.objects.filter(to_task__project=project)
+            .values("to_task")
+            .annotate(links=Count("id"))
+            .order_by("-links")
+            .values_list("to_task", flat=True)
+            .first()
+        )
+
+
+@pytest.fixture
+def api_client(manager: User, db) -> APIClient:
+    # A real token, so authentication is measured as well
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(manager)}")
+    return client
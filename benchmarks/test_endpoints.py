@@ -0,0 +1,71 @@
+import pytest
+from rest_framework.test import APIClient
+
+from jirabas.tasks.enums import StatusTask, TypeTask
+from jirabas.tasks.models import Project
+from jirabas.users.models import User
+
+
+def _get(benchmark, client: APIClient, url: str, params=None):
+    response = benchmark(client.get, url, params)
+    assert response.status_code == 200
+    return response
+
+
+@pytest.mark.benchmark(group="tasks")
+def test_task_list(benchmark, api_client: APIClient, project: Project):
+    _get(benchmark, api_client, "/api/tasks/", {"project": project.pk})
+
+
+@pytest.mark.benchmark(group="tasks")
+def test_task_list_filtered(benchmark, api_client: APIClient, project: Project):
+    _get(
+        benchmark,
+        api_client,
+        "/api/tasks/",
+        {
+            "project": project.pk,
+            "status": StatusTask.IN_PROGRESS,
+            "type": TypeTask.BUG,
+        },
+    )
+
+
+@pytest.mark.benchmark(group="tasks")
+def test_task_list_by_performer(benchmark, api_client: APIClient, manager: User):
+    _get(benchmark, api_client, "/api/tasks/", {"performer": manager.pk})
+
+
+@pytest.mark.benchmark(group="tasks")
+def test_task_related(benchmark, api_client: APIClient, task_id: int):
+    _get(benchmark, api_client, f"/api/tasks/{task_id}/related/")
+
+
+@pytest.mark.benchmark(group="tasks")
+def test_task_create(benchmark, api_client: APIClient, project: Project):
+    def create():
+        return api_client.post(
+            "/api/tasks/", {"name": "Benchmark task", "project": project.pk}
+        )
+
+    assert benchmark(create).status_code == 201
+
+
+@pytest.mark.benchmark(group="projects")
+def test_project_info(benchmark, api_client: APIClient, project: Project):
+    _get(benchmark, api_client, f"/api/projects/{project.pk}/info/")
+
+
+@pytest.mark.benchmark(group="projects")
+def test_users_to_add(benchmark, api_client: APIClient, project: Project):
+    _get(benchmark, api_client, f"/api/projects/{project.pk}/users_to_add/")
+
+
+@pytest.mark.benchmark(group="projects")
+def test_users_to_add_search(benchmark, api_client: APIClient, project: Project):
+    _get(
+        benchmark,
+        api_client,
+        f"/api/projects/{project.pk}/users_to_add/",
+        {"search": "bench-12"},
+    )
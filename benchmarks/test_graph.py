@@ -0,0 +1,76 @@
+import random
+
+import pytest
+from django.db import connection
+from rest_framework.test import APIClient
+
+from jirabas.tasks.enums import RelationType
+from jirabas.tasks.models import Project, Task, TasksRelation
+from jirabas.users.models import User
+
+EDGES_COUNT = 100_000
+EPIC_SIZE = 50
+
+
+@pytest.fixture
+def blocking_graph(project: Project, manager: User) -> list:
+    """Epics of EPIC_SIZE tasks in ``project``, each an acyclic web of
+    blocking links that together hold EDGES_COUNT edges."""
+    rnd = random.Random(42)
+    tasks = Task.objects.bulk_create(
+        Task(
+            custom_number=f"G-{i}",
+            name=f"Task {i}",
+            creator=manager,
+            project=project,
+        )
+        for i in range(EDGES_COUNT // 5)
+    )
+    ids = [task.pk for task in tasks]
+
+    edges = set()
+    while len(edges) < EDGES_COUNT:
+        epic = rnd.randrange(len(ids) // EPIC_SIZE) * EPIC_SIZE
+        blocker, blocked = sorted(rnd.sample(range(EPIC_SIZE), 2))
+        edges.add((ids[epic + blocker], ids[epic + blocked]))
+    TasksRelation.objects.bulk_create(
+        TasksRelation(
+            from_task_id=from_id,
+            to_task_id=to_id,
+            relation_type=RelationType.BLOCKS,
+        )
+        for from_id, to_id in edges
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {TasksRelation._meta.db_table}")
+
+    return ids
+
+
+@pytest.mark.benchmark(group="graph")
+def test_connect_rejects_cycle(benchmark, api_client: APIClient, blocking_graph: list):
+    first, last = blocking_graph[0], blocking_graph[EPIC_SIZE - 1]
+
+    response = benchmark(
+        api_client.post,
+        f"/api/tasks/{last}/connect/",
+        {"to_task": first, "relation_type": RelationType.BLOCKS},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.benchmark(group="graph")
+def test_connect_across_epics(benchmark, api_client: APIClient, blocking_graph: list):
+    first, other_epic = blocking_graph[0], blocking_graph[EPIC_SIZE]
+
+    def unlink():
+        TasksRelation.objects.filter(from_task_id=first, to_task_id=other_epic).delete()
+
+    def connect():
+        return api_client.post(
+            f"/api/tasks/{first}/connect/",
+            {"to_task": other_epic, "relation_type": RelationType.BLOCKS},
+        )
+
+    response = benchmark.pedantic(connect, setup=unlink, rounds=50)
+    assert response.status_code == 200
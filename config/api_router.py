@@ -1,7 +1,12 @@
 from django.conf import settings
 from rest_framework.routers import DefaultRouter, SimpleRouter
 
-from jirabas.tasks.views import ProjectViewSet, TaskViewSet
+from jirabas.tasks.views import (
+    CommentViewSet,
+    LogTimeTaskViewSet,
+    ProjectViewSet,
+    TaskViewSet,
+)
 from jirabas.users.views import RoleViewSet, UserViewSet
 
 if settings.DEBUG:
@@ -12,7 +17,11 @@ else:
 router.register("users", UserViewSet)
 router.register("projects", ProjectViewSet, basename="project")
 router.register("tasks", TaskViewSet, basename="task")
+router.register(
+    r"tasks/(?P<task_pk>\d+)/comments", CommentViewSet, basename="task-comment"
+)
 router.register("roles", RoleViewSet, basename="role")
+router.register("logged-time", LogTimeTaskViewSet, basename="logged-time")
 
 app_name = "api"
 urlpatterns = router.urls
@@ -13,6 +13,9 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["example.com"])
 DATABASES["default"] = env.db("DATABASE_URL")  # noqa F405
 DATABASES["default"]["ATOMIC_REQUESTS"] = True  # noqa F405
 DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)  # noqa F405
+DATABASES["default"]["OPTIONS"] = {  # noqa F405
+    "options": f"-c jirabas.time_zone={TIME_ZONE}"  # noqa F405
+}
 
 # CACHES
 # ------------------------------------------------------------------------------
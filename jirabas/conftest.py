@@ -1,4 +1,5 @@
 import pytest
+from django.db import connection
 
 from jirabas.users.models import User
 from jirabas.users.tests.factories import UserFactory
@@ -12,3 +13,19 @@ def media_storage(settings, tmpdir):
 @pytest.fixture
 def user() -> User:
     return UserFactory()
+
+
+@pytest.fixture
+def run_on_commit():
+    """Run the ``transaction.on_commit`` callbacks registered so far.
+
+    Tests run inside a transaction that is never committed, so these
+    callbacks would otherwise never fire.
+    """
+
+    def run():
+        callbacks, connection.run_on_commit = connection.run_on_commit, []
+        for _, callback in callbacks:
+            callback()
+
+    return run
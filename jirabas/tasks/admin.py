@@ -1,7 +1,7 @@
 from django.contrib import admin
 
 # Register your models here.
-from jirabas.tasks.models import Project, Task
+from jirabas.tasks.models import Comment, LogTimeTask, Project, Task
 
 
 @admin.register(Project)
@@ -12,3 +12,18 @@ class ProjectAdmin(admin.ModelAdmin):
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "date_create"]
+    # __str__ reads the task and the author
+    list_select_related = ["task", "user"]
+    raw_id_fields = ["task", "user"]
+
+
+@admin.register(LogTimeTask)
+class LogTimeTaskAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "date_logged"]
+    list_select_related = ["task", "user"]
+    raw_id_fields = ["task", "user"]
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class TasksConfig(AppConfig):
     name = "jirabas.tasks"
+
+    def ready(self):
+        try:
+            import jirabas.tasks.signals  # noqa F401
+        except ImportError:
+            pass
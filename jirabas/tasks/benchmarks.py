@@ -0,0 +1,263 @@
+"""Helpers of the benchmark_* and seed_benchmark_data management commands."""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from jirabas.tasks.enums import PriorityTask, RelationType, StatusTask, TypeTask
+from jirabas.tasks.models import (
+    Comment,
+    LogTimeTask,
+    Project,
+    ProjectMembership,
+    Task,
+    TasksRelation,
+)
+from jirabas.users.models import Role, User
+
+SEED_USERNAME_PREFIX = "bench-"
+SEED_START = datetime(2019, 1, 1, tzinfo=timezone.utc)
+SEED_PERIOD = timedelta(days=730)
+WORDS = (
+    "login form button page report export import filter search list user "
+    "project task comment deadline status release build test crash error "
+    "timeout cache database query index migration api token session email "
+    "notification dashboard chart permission role admin settings mobile "
+    "layout upload download payment invoice order customer backlog sprint"
+).split()
+# Rough shape of a tracker that has been in use for a while
+STATUS_WEIGHTS = {
+    StatusTask.DONE: 50,
+    StatusTask.BACKLOG: 25,
+    StatusTask.IN_PROGRESS: 10,
+    StatusTask.REVIEW: 5,
+    StatusTask.POSTPONED: 5,
+    StatusTask.IS_DELAYED: 3,
+    StatusTask.BEING_LATE: 2,
+}
+TYPE_WEIGHTS = {
+    TypeTask.WORK_ITEM: 50,
+    TypeTask.BUG: 25,
+    TypeTask.REQUIREMENT: 15,
+    TypeTask.TEST: 8,
+    TypeTask.KNOW_ISSUE: 2,
+}
+RELATION_TYPES = [
+    RelationType.BLOCKS,
+    RelationType.IS_BLOCKED_BY,
+    RelationType.CLONES,
+    RelationType.RELATES,
+    RelationType.HAS_TEST_CASE,
+]
+
+
+def cpu_ms(function, repeat: int) -> float:
+    """Best CPU time of ``repeat`` calls of ``function``, in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        started = time.process_time()
+        function()
+        elapsed = (time.process_time() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def sample_tasks(count: int) -> list:
+    """Unsaved tasks with every field filled in, descriptions of 2 KB."""
+    now = timezone.now()
+    return [
+        Task(
+            id=number,
+            custom_number=f"B-{number}",
+            name=f"Task {number}",
+            description="x" * 2000,
+            acceptance_criteria="y" * 500,
+            estimate_hours=8,
+            date_created=now,
+            date_modified=now,
+            deadline_date=now + timedelta(days=7),
+            creator_id=1,
+            project_id=1,
+            performer_id=2,
+        )
+        for number in range(count)
+    ]
+
+
+class DataGenerator:
+    """Deterministic synthetic data: the same ``seed`` and sizes always
+    produce the same rows (apart from database ids)."""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def text(self, words: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=words)).capitalize()
+
+    def date(self, start=SEED_START, period=SEED_PERIOD):
+        return start + timedelta(
+            seconds=self.rng.randrange(int(period.total_seconds()))
+        )
+
+    def choice(self, weights: dict):
+        return self.rng.choices(list(weights), weights=list(weights.values()))[0]
+
+    def users(self, count: int) -> list:
+        return [
+            User(
+                username=f"{SEED_USERNAME_PREFIX}{number}",
+                name=self.text(2),
+                email=f"{SEED_USERNAME_PREFIX}{number}@example.com",
+                # Unusable, see AbstractBaseUser.has_usable_password
+                password="!",
+                date_joined=self.date(),
+            )
+            for number in range(count)
+        ]
+
+    def project(self, number: int) -> Project:
+        return Project(
+            name=self.text(3),
+            short_name=f"B{number % 1000:03d}",
+            description=self.text(30),
+            date_start=self.date(),
+        )
+
+    def members(self, project: Project, user_ids: list, roles: list) -> list:
+        pm, *members = self.rng.sample(user_ids, self.rng.randint(4, 12))
+        return [
+            ProjectMembership(
+                project=project, member_id=pm, role=Role.get_project_manager()
+            )
+        ] + [
+            ProjectMembership(
+                project=project, member_id=member, role=self.rng.choice(roles)
+            )
+            for member in members
+        ]
+
+    def tasks(self, project: Project, count: int, member_ids: list) -> list:
+        tasks = []
+        for number in range(count):
+            created = self.date(project.date_start)
+            tasks.append(
+                Task(
+                    custom_number=f"{project.short_name}-{number}",
+                    name=self.text(self.rng.randint(3, 10)),
+                    description=self.text(self.rng.randint(0, 150)),
+                    acceptance_criteria=self.text(self.rng.randint(0, 40)),
+                    status=self.choice(STATUS_WEIGHTS),
+                    type=self.choice(TYPE_WEIGHTS),
+                    priority=self.rng.choice(PriorityTask.values),
+                    estimate_hours=self.rng.choice([None, 1, 2, 4, 8, 16, 40]),
+                    date_created=created,
+                    deadline_date=(
+                        created + timedelta(days=self.rng.randint(1, 60))
+                        if self.rng.random() < 0.6
+                        else None
+                    ),
+                    creator_id=self.rng.choice(member_ids),
+                    performer_id=(
+                        self.rng.choice(member_ids) if self.rng.random() < 0.8 else None
+                    ),
+                    project=project,
+                )
+            )
+        return tasks
+
+    def relations(self, tasks: list) -> list:
+        relations = []
+        for index, task in enumerate(tasks[1:], 1):
+            if self.rng.random() < 0.3:
+                relations.append(
+                    TasksRelation(
+                        from_task_id=task.pk,
+                        to_task_id=tasks[self.rng.randrange(index)].pk,
+                        relation_type=self.rng.choice(RELATION_TYPES),
+                    )
+                )
+        return relations
+
+    def comments(self, tasks: list, member_ids: list) -> list:
+        return [
+            Comment(
+                task_id=task.pk,
+                user_id=self.rng.choice(member_ids),
+                date_create=task.date_created
+                + timedelta(hours=self.rng.randint(1, 500)),
+                text=self.text(self.rng.randint(3, 60)),
+            )
+            for task in tasks
+            for _ in range(self.rng.choice([0, 0, 1, 1, 2, 3, 5]))
+        ]
+
+    def logged_time(self, tasks: list, member_ids: list) -> list:
+        return [
+            LogTimeTask(
+                task_id=task.pk,
+                user_id=self.rng.choice(member_ids),
+                date_logged=task.date_created
+                + timedelta(hours=self.rng.randint(1, 500)),
+                hours=self.rng.choice([0.5, 1, 2, 3, 4, 8]),
+                description=self.text(self.rng.randint(0, 10)),
+            )
+            for task in tasks
+            if task.status != StatusTask.BACKLOG
+            for _ in range(self.rng.randint(0, 4))
+        ]
+
+
+def seed_benchmark_data(
+    projects: int, tasks: int, users: int, seed: int, progress=None
+) -> dict:
+    """Generate ``users``, ``projects`` and about ``tasks`` tasks per project
+    with their relations, comments and logged time.
+
+    Every project is written in its own transaction; ``progress`` is called
+    with the running totals after each of them.
+    """
+    generator = DataGenerator(seed)
+    roles = list(Role.objects.exclude(name=Role.PROJECT_MANAGER))
+    user_ids = [
+        user.pk
+        for user in User.objects.bulk_create(generator.users(users), batch_size=5000)
+    ]
+    totals = dict.fromkeys(
+        ("projects", "tasks", "relations", "comments", "logged_time"), 0
+    )
+
+    for number in range(projects):
+        # Project sizes are skewed: most are small, a few are large
+        count = min(int(generator.rng.expovariate(1 / tasks)) + 1, tasks * 10)
+        with transaction.atomic():
+            project = generator.project(number)
+            project.task_counter = count
+            project.save()
+            members = generator.members(project, user_ids, roles)
+            ProjectMembership.objects.bulk_create(members)
+            member_ids = [member.member_id for member in members]
+
+            created = Task.objects.bulk_create(
+                generator.tasks(project, count, member_ids), batch_size=5000
+            )
+            relations = TasksRelation.objects.bulk_create(
+                generator.relations(created), batch_size=5000
+            )
+            comments = Comment.objects.bulk_create(
+                generator.comments(created, member_ids), batch_size=5000
+            )
+            logged_time = LogTimeTask.objects.bulk_create(
+                generator.logged_time(created, member_ids), batch_size=5000
+            )
+
+        totals["projects"] += 1
+        totals["tasks"] += len(created)
+        totals["relations"] += len(relations)
+        totals["comments"] += len(comments)
+        totals["logged_time"] += len(logged_time)
+        if progress is not None:
+            progress(totals)
+    return totals
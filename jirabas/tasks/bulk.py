@@ -0,0 +1,142 @@
+from collections import defaultdict
+
+from rest_framework.exceptions import ValidationError
+
+from jirabas.tasks.models import Project, Task
+from jirabas.tasks.serializers import TaskBulkItemSerializer
+from jirabas.users.models import User
+
+BULK_BATCH_SIZE = 500
+
+
+def _batches(items: list):
+    for start in range(0, len(items), BULK_BATCH_SIZE):
+        end = start + BULK_BATCH_SIZE
+        yield items[start:end]
+
+
+def _to_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _item_serializer(
+    batch: list, project_ids, partial: bool = False
+) -> TaskBulkItemSerializer:
+    """Projects outside ``project_ids`` (the caller's) are reported as not
+    found, like missing ones."""
+    item_project_ids = {_to_id(item.get("project")) for item in batch}
+    performer_ids = {_to_id(item.get("performer")) for item in batch}
+    return TaskBulkItemSerializer(
+        partial=partial,
+        context={
+            "projects": Project.objects.in_bulk(item_project_ids & set(project_ids)),
+            "users": User.objects.in_bulk(performer_ids - {None}),
+        },
+    )
+
+
+def _renumber(tasks: list):
+    """Allocate numbers of their (new) project to ``tasks``."""
+    by_project = defaultdict(list)
+    for task in tasks:
+        by_project[task.project_id].append(task)
+    # Lock project rows in a stable order so concurrent requests cannot
+    # deadlock on them
+    for project_id in sorted(by_project):
+        project_tasks = by_project[project_id]
+        project = project_tasks[0].project
+        numbers = project.allocate_task_numbers(len(project_tasks))
+        for task, number in zip(project_tasks, numbers):
+            task.custom_number = f"{project.short_name}-{number}"
+
+
+def bulk_create_tasks(items: list, creator: User, project_ids) -> list:
+    """Create tasks from ``items`` in the projects ``project_ids``, returning
+    a result per item in order.
+
+    Task numbers are allocated per project for the whole batch with a
+    single counter update each.
+    """
+    results = []
+    for batch in _batches(items):
+        serializer = _item_serializer(batch, project_ids)
+        created = []
+        for item in batch:
+            result = {}
+            results.append(result)
+            try:
+                attrs = serializer.run_validation(item)
+            except ValidationError as exc:
+                result["errors"] = exc.detail
+                continue
+            created.append((result, Task(creator=creator, **attrs)))
+
+        _renumber([task for _, task in created])
+
+        Task.objects.bulk_create(task for _, task in created)
+        for result, task in created:
+            result.update(id=task.pk, custom_number=task.custom_number)
+
+    return results
+
+
+def bulk_update_tasks(items: list, project_ids) -> list:
+    """Apply partial updates from ``items`` (each carrying the task ``id``)
+    to tasks of the projects ``project_ids``, returning a result per item in
+    order.
+
+    Tasks are written in groups sharing the same set of changed fields, so
+    no item overwrites fields it did not send.
+    """
+    results = []
+    for batch in _batches(items):
+        serializer = _item_serializer(batch, project_ids, partial=True)
+        tasks = Task.objects.filter(project_id__in=project_ids).in_bulk(
+            {_to_id(item.get("id")) for item in batch} - {None}
+        )
+        updated, moved = {}, []
+        for item in batch:
+            task = tasks.get(_to_id(item.get("id")))
+            result = {"id": item.get("id")}
+            results.append(result)
+            if task is None:
+                result["errors"] = {"id": ["Задача не найдена"]}
+                continue
+            try:
+                attrs = serializer.run_validation(item)
+            except ValidationError as exc:
+                result["errors"] = exc.detail
+                continue
+
+            fields = set(attrs)
+            if "project" in attrs and attrs["project"].pk != task.project_id:
+                moved.append(task)
+                fields.add("custom_number")
+            for field, value in attrs.items():
+                setattr(task, field, value)
+            # The last update of a task sent twice wins
+            task_fields = updated.get(task.pk, (task, set()))[1]
+            updated[task.pk] = (task, task_fields | fields)
+
+        _renumber(moved)
+        groups = defaultdict(list)
+        for task, fields in updated.values():
+            groups[frozenset(fields)].append(task)
+        for fields, group in groups.items():
+            if fields:
+                Task.objects.bulk_update(group, fields)
+
+    return results
+
+
+def bulk_delete_tasks(ids: list, project_ids) -> list:
+    existing = set(
+        Task.objects.filter(id__in=ids, project_id__in=project_ids).values_list(
+            "id", flat=True
+        )
+    )
+    Task.objects.filter(id__in=existing).delete()
+    return [{"id": pk, "deleted": pk in existing} for pk in ids]
@@ -0,0 +1,114 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from jirabas.tasks.models import ProjectMembership
+from jirabas.users.models import User
+from jirabas.users.roles import role_registry
+
+MEMBERS_CACHE_TIMEOUT = 60 * 60
+STATS_KEY = "project-members:stats:%s"
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def _version_key(project_id) -> str:
+    return f"project-members:version:{project_id}"
+
+
+def _members_key(project_id) -> str:
+    version = cache.get(_version_key(project_id), 0)
+    return f"project-members:{project_id}:{version}"
+
+
+def _count(outcome: str):
+    _incr(STATS_KEY % outcome)
+
+
+def get_project_members(project_id) -> list:
+    """Return the members of a project with their roles.
+
+    Only the (member, role) ids are cached per project, under a key
+    versioned by ``invalidate_project_members``; user fields are read on
+    every call and roles come from the role registry, so edits of users
+    and roles show up at once.
+    """
+    key = _members_key(project_id)
+    members = cache.get(key)
+    if members is None:
+        _count("miss")
+        members = list(
+            ProjectMembership.objects.filter(project_id=project_id)
+            .order_by("id")
+            .values_list("member_id", "role_id")
+        )
+        cache.set(key, members, MEMBERS_CACHE_TIMEOUT)
+    else:
+        _count("hit")
+
+    users = {
+        user["id"]: user
+        for user in User.objects.filter(
+            pk__in=[member_id for member_id, _ in members]
+        ).values("id", "name", "username", "email")
+    }
+    result = []
+    for member_id, role_id in members:
+        if member_id not in users:
+            continue
+        role = role_registry.get_by_id(role_id)
+        result.append(
+            {
+                **users[member_id],
+                "role": role.name,
+                "role_abbreviation": role.abbreviation,
+            }
+        )
+    return result
+
+
+def invalidate_project_members(project_id):
+    """Move the project to a new cache key once the current transaction
+    commits. A reader that loaded the old state can then only write it
+    under the old key, where nobody looks any more."""
+    transaction.on_commit(lambda: _incr(_version_key(project_id)))
+
+
+def _projects_key(user_id) -> str:
+    return f"member-projects:{user_id}"
+
+
+def get_member_projects(user_id) -> dict:
+    """Return ``{project_id: role_id}`` for the projects of a user, cached
+    per user until ``invalidate_member_projects`` drops it."""
+    key = _projects_key(user_id)
+    projects = cache.get(key)
+    if projects is None:
+        projects = dict(
+            ProjectMembership.objects.filter(member_id=user_id).values_list(
+                "project_id", "role_id"
+            )
+        )
+        cache.set(key, projects, MEMBERS_CACHE_TIMEOUT)
+    return projects
+
+
+def invalidate_member_projects(*user_ids):
+    keys = [_projects_key(user_id) for user_id in user_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def get_cache_stats() -> dict:
+    stats = cache.get_many([STATS_KEY % "hit", STATS_KEY % "miss"])
+    hits = stats.get(STATS_KEY % "hit", 0)
+    misses = stats.get(STATS_KEY % "miss", 0)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else None,
+    }
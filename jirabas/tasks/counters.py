@@ -0,0 +1,73 @@
+from django.db import connection, transaction
+from django.db.models import Count
+
+from jirabas.tasks.models import ProjectTaskCounter, Task
+
+
+def get_project_stats(project_id) -> dict:
+    """Task counts of a project by status and type, read from the counters
+    maintained by the tasks_task triggers (migration 0015)."""
+    counters = (
+        ProjectTaskCounter.objects.filter(project_id=project_id, count__gt=0)
+        .order_by("status", "type")
+        .values_list("status", "type", "count")
+    )
+
+    stats = {"total": 0, "by_status": {}, "by_type": {}, "counters": []}
+    for status, type_, count in counters:
+        stats["total"] += count
+        stats["by_status"][status] = stats["by_status"].get(status, 0) + count
+        stats["by_type"][type_] = stats["by_type"].get(type_, 0) + count
+        stats["counters"].append({"status": status, "type": type_, "count": count})
+    return stats
+
+
+def reconcile_task_counters(project_ids=None) -> int:
+    """Rewrite the counters of the given projects (all by default) that
+    drifted from the tasks, returning the number of corrected counters.
+
+    Writes to tasks are blocked (SHARE lock, taken once for the run) while
+    the tasks are counted, so no concurrent change can be lost or counted
+    twice.
+    """
+    tasks = Task.objects.all()
+    counters = ProjectTaskCounter.objects.all()
+    if project_ids is not None:
+        tasks = tasks.filter(project_id__in=project_ids)
+        counters = counters.filter(project_id__in=project_ids)
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {Task._meta.db_table} IN SHARE MODE")
+
+        actual = {
+            (project_id, status, type_): count
+            for project_id, status, type_, count in tasks.values_list(
+                "project_id", "status", "type"
+            )
+            .annotate(count=Count("id"))
+            .order_by()
+        }
+        stored = {
+            (counter.project_id, counter.status, counter.type): counter
+            for counter in counters
+        }
+
+        changed, created = [], []
+        for key in actual.keys() | stored.keys():
+            count = actual.get(key, 0)
+            counter = stored.get(key)
+            if counter is None:
+                project_id, status, type_ = key
+                created.append(
+                    ProjectTaskCounter(
+                        project_id=project_id, status=status, type=type_, count=count
+                    )
+                )
+            elif counter.count != count:
+                counter.count = count
+                changed.append(counter)
+
+        ProjectTaskCounter.objects.bulk_update(changed, ["count"])
+        ProjectTaskCounter.objects.bulk_create(created)
+    return len(changed) + len(created)
@@ -52,3 +52,16 @@ class RelationType(IntegerChoices):
 
     HAS_TEST_CASE = 90, "описана тест-кейсом"
     COVERS_REQUIREMENT = 91, "покрывает требования"
+
+
+class ImportFormat(TextChoices):
+    CSV = "csv", _("CSV")
+    XML = "xml", _("XML")
+
+
+class ImportStage(TextChoices):
+    # задачи, комментарии, списанное время
+    TASKS = "tasks", _("Tasks")
+    # связи между задачами, второй проход по файлу
+    RELATIONS = "relations", _("Relations")
+    DONE = "done", _("Done")
@@ -0,0 +1,92 @@
+import csv
+
+from django.db import transaction
+
+from jirabas.tasks.models import Comment, LogTimeTask, Task, TasksRelation
+from jirabas.utils.json import dumps
+
+EXPORT_CHUNK_SIZE = 2000
+
+TASK_EXPORT_FIELDS = (
+    "id",
+    "custom_number",
+    "name",
+    "description",
+    "status",
+    "type",
+    "acceptance_criteria",
+    "priority",
+    "estimate_hours",
+    "date_created",
+    "date_modified",
+    "deadline_date",
+    "creator_id",
+    "performer_id",
+)
+
+# Extra records that can be added to an NDJSON export:
+# (record name, model, project lookup, fields)
+EXPORT_INCLUDES = {
+    "comments": (
+        "comment",
+        Comment,
+        "task__project_id",
+        ("id", "task_id", "user_id", "date_create", "text"),
+    ),
+    "relations": (
+        "relation",
+        TasksRelation,
+        "from_task__project_id",
+        ("id", "from_task_id", "to_task_id", "relation_type"),
+    ),
+    "logged_time": (
+        "logged_time",
+        LogTimeTask,
+        "task__project_id",
+        ("id", "task_id", "user_id", "hours", "date_logged", "description"),
+    ),
+}
+
+
+def _rows(queryset, fields):
+    # values() + iterator() reads through a server-side cursor in chunks,
+    # without building model instances or caching the result
+    return (
+        queryset.order_by("id").values(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def iter_ndjson(project_id, include=()):
+    """Yield one JSON document per line: the project's tasks, followed by
+    the requested ``EXPORT_INCLUDES`` records.
+
+    The generators run while the response is streamed, after the request
+    transaction has ended; they open their own so the server-side cursors
+    are not declared WITH HOLD (materialized when the transaction commits).
+    """
+    with transaction.atomic():
+        tasks = Task.objects.filter(project_id=project_id)
+        for row in _rows(tasks, TASK_EXPORT_FIELDS):
+            yield dumps({"record": "task", **row}) + b"\n"
+
+        for name in include:
+            record, model, lookup, fields = EXPORT_INCLUDES[name]
+            queryset = model.objects.filter(**{lookup: project_id})
+            for row in _rows(queryset, fields):
+                yield dumps({"record": record, **row}) + b"\n"
+
+
+class _Echo:
+    """File-like object handing each written line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(project_id):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(TASK_EXPORT_FIELDS)
+    with transaction.atomic():
+        tasks = Task.objects.filter(project_id=project_id)
+        for row in _rows(tasks, TASK_EXPORT_FIELDS):
+            yield writer.writerow(row[field] for field in TASK_EXPORT_FIELDS)
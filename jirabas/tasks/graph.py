@@ -0,0 +1,157 @@
+from django.db import connection
+
+from jirabas.tasks.enums import RelationType
+from jirabas.tasks.models import Task, TasksRelation
+
+BLOCKING_TYPES = (RelationType.BLOCKS, RelationType.IS_BLOCKED_BY)
+# pg_advisory_xact_lock key serializing blocking link changes, see lock_task_links
+TASK_LINKS_LOCK = 0x7461736B
+
+# Walks blocking links downstream (tasks blocked by the start task) and
+# upstream (tasks blocking it). Rows are (task, depth) pairs merged with
+# UNION, so a task is expanded at most once per depth and cycles end at the
+# depth limit instead of looping.
+DEPENDENCY_GRAPH_SQL = """
+WITH RECURSIVE blocked(task_id, depth) AS (
+    SELECT %(task)s, 0
+    UNION
+    SELECT
+        CASE WHEN r.relation_type = %(blocks)s
+            THEN r.to_task_id ELSE r.from_task_id END,
+        w.depth + 1
+    FROM blocked w
+    JOIN {relation} r ON (
+        (r.from_task_id = w.task_id AND r.relation_type = %(blocks)s)
+        OR (r.to_task_id = w.task_id AND r.relation_type = %(is_blocked_by)s)
+    )
+    WHERE w.depth < %(max_depth)s
+), blockers(task_id, depth) AS (
+    SELECT %(task)s, 0
+    UNION
+    SELECT
+        CASE WHEN r.relation_type = %(is_blocked_by)s
+            THEN r.to_task_id ELSE r.from_task_id END,
+        w.depth + 1
+    FROM blockers w
+    JOIN {relation} r ON (
+        (r.from_task_id = w.task_id AND r.relation_type = %(is_blocked_by)s)
+        OR (r.to_task_id = w.task_id AND r.relation_type = %(blocks)s)
+    )
+    WHERE w.depth < %(max_depth)s
+), walked AS (
+    SELECT task_id, depth FROM blocked
+    UNION ALL
+    SELECT task_id, depth FROM blockers
+)
+SELECT {columns}, MIN(walked.depth)
+FROM walked
+JOIN {task} t ON t.id = walked.task_id
+WHERE t.project_id = ANY(%(projects)s)
+GROUP BY t.id
+ORDER BY MIN(walked.depth), t.id
+"""
+
+
+# Plain reachability: rows are bare task ids merged with UNION, so every
+# task reachable from the start is expanded once and the walk ends on
+# cycles. EXISTS stops pulling rows as soon as the target shows up.
+REACHABILITY_SQL = """
+WITH RECURSIVE blocked(task_id) AS (
+    SELECT %(start)s
+    UNION
+    SELECT
+        CASE WHEN r.relation_type = %(blocks)s
+            THEN r.to_task_id ELSE r.from_task_id END
+    FROM blocked w
+    JOIN {relation} r ON (
+        (r.from_task_id = w.task_id AND r.relation_type = %(blocks)s)
+        OR (r.to_task_id = w.task_id AND r.relation_type = %(is_blocked_by)s)
+    )
+)
+SELECT EXISTS (SELECT 1 FROM blocked WHERE task_id = %(target)s)
+"""
+
+
+def lock_task_links():
+    """Serialize blocking link changes until the current transaction ends.
+
+    Without it two concurrent links (A blocks B, B blocks A) both pass the
+    cycle check. Links may join tasks of different projects, so a cycle can
+    span any number of them and the lock is not keyed on a project.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [TASK_LINKS_LOCK])
+
+
+def blocks_transitively(blocker_id: int, blocked_id: int) -> bool:
+    """Check in the database whether a chain of blocking links leads
+    from ``blocker_id`` to ``blocked_id``."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            REACHABILITY_SQL.format(relation=TasksRelation._meta.db_table),
+            {
+                "start": blocker_id,
+                "target": blocked_id,
+                "blocks": RelationType.BLOCKS.value,
+                "is_blocked_by": RelationType.IS_BLOCKED_BY.value,
+            },
+        )
+        ((reachable,),) = cursor.fetchall()
+
+    return reachable
+
+
+def creates_blocking_cycle(from_task: Task, to_task: Task, relation_type) -> bool:
+    """Check whether linking ``from_task`` to ``to_task`` would close a
+    BLOCKS / IS_BLOCKED_BY cycle."""
+    if relation_type not in BLOCKING_TYPES:
+        return False
+
+    if relation_type == RelationType.BLOCKS:
+        blocker, blocked = from_task, to_task
+    else:
+        blocker, blocked = to_task, from_task
+    return blocks_transitively(blocked.pk, blocker.pk)
+
+
+def get_dependency_graph(task: Task, max_depth: int, project_ids) -> dict:
+    """Return the transitive BLOCKS / IS_BLOCKED_BY graph around ``task``.
+
+    Nodes carry the TaskShortSerializer fields plus their distance from
+    ``task``; edges always point from the blocking task to the blocked one.
+    Only tasks of the projects ``project_ids`` are returned.
+    """
+    sql = DEPENDENCY_GRAPH_SQL.format(
+        relation=TasksRelation._meta.db_table,
+        task=Task._meta.db_table,
+        columns=", ".join(f"t.{field}" for field in Task.SHORT_FIELDS),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql,
+            {
+                "task": task.pk,
+                "max_depth": max_depth,
+                "projects": list(project_ids),
+                "blocks": RelationType.BLOCKS.value,
+                "is_blocked_by": RelationType.IS_BLOCKED_BY.value,
+            },
+        )
+        nodes = [
+            {**dict(zip(Task.SHORT_FIELDS, row)), "depth": row[-1]}
+            for row in cursor.fetchall()
+        ]
+
+    ids = [node["id"] for node in nodes]
+    relations = TasksRelation.objects.filter(
+        relation_type__in=BLOCKING_TYPES, from_task_id__in=ids, to_task_id__in=ids
+    ).values_list("from_task_id", "to_task_id", "relation_type")
+    edges = {
+        (from_id, to_id) if relation_type == RelationType.BLOCKS else (to_id, from_id)
+        for from_id, to_id, relation_type in relations
+    }
+
+    return {
+        "nodes": nodes,
+        "edges": [{"blocker": edge[0], "blocked": edge[1]} for edge in sorted(edges)],
+    }
@@ -0,0 +1,412 @@
+"""Streaming import of Jira CSV and XML (RSS) issue exports.
+
+The file is read twice: the first pass (ImportStage.TASKS) creates tasks,
+comments and logged time, the second one (ImportStage.RELATIONS) links the
+tasks once every issue key is known. Issues are parsed lazily and written
+in batches with bulk_create; each batch commits together with the job
+position, so an interrupted import resumes after the last committed batch.
+"""
+
+import csv
+import re
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from itertools import islice
+from xml.etree.ElementTree import iterparse
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from jirabas.tasks.enums import (
+    ImportFormat,
+    ImportStage,
+    PriorityTask,
+    RelationType,
+    StatusTask,
+    TypeTask,
+)
+from jirabas.tasks.graph import BLOCKING_TYPES, blocks_transitively, lock_task_links
+from jirabas.tasks.models import (
+    Comment,
+    ImportedIssue,
+    ImportJob,
+    LogTimeTask,
+    Task,
+    TasksRelation,
+)
+from jirabas.users.models import User
+
+IMPORT_BATCH_SIZE = 500
+
+TYPES = {
+    "bug": TypeTask.BUG,
+    "story": TypeTask.REQUIREMENT,
+    "requirement": TypeTask.REQUIREMENT,
+    "test": TypeTask.TEST,
+}
+STATUSES = {
+    "open": StatusTask.BACKLOG,
+    "to do": StatusTask.BACKLOG,
+    "backlog": StatusTask.BACKLOG,
+    "in progress": StatusTask.IN_PROGRESS,
+    "review": StatusTask.REVIEW,
+    "in review": StatusTask.REVIEW,
+    "done": StatusTask.DONE,
+    "closed": StatusTask.DONE,
+    "resolved": StatusTask.DONE,
+}
+PRIORITIES = {
+    "highest": PriorityTask.HIGH,
+    "high": PriorityTask.HIGH,
+    "medium": PriorityTask.MEDIUM,
+    "low": PriorityTask.LOW,
+    "lowest": PriorityTask.LOW,
+}
+# Outward side of Jira link types; the inward side describes the same link
+# from the other issue and is skipped
+LINK_TYPES = {
+    "blocks": RelationType.BLOCKS,
+    "cloners": RelationType.CLONES,
+    "relates": RelationType.RELATES,
+}
+CSV_DATE_FORMATS = ("%d/%b/%y %I:%M %p", "%d/%b/%Y %I:%M %p")
+CSV_LINK_COLUMN = re.compile(r"^Outward issue link \((?P<type>.+)\)$")
+
+
+def parse_date(value):
+    if not value:
+        return None
+
+    date = parse_datetime(value)
+    if date is None:
+        for date_format in CSV_DATE_FORMATS:
+            try:
+                date = datetime.strptime(value, date_format)
+                break
+            except ValueError:
+                pass
+    if date is None:
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+    if timezone.is_naive(date):
+        date = timezone.make_aware(date)
+    return date
+
+
+def _issue(key, **fields):
+    issue = {
+        "key": key,
+        "summary": "",
+        "description": "",
+        "type": "",
+        "status": "",
+        "priority": "",
+        "created": None,
+        "due": None,
+        "assignee": None,
+        "reporter": None,
+        "estimate": None,
+        "comments": [],
+        "worklogs": [],
+        "links": [],
+    }
+    issue.update(fields)
+    return issue
+
+
+def iter_csv_issues(path):
+    """Yield issues of a Jira CSV export one row at a time.
+
+    Repeated columns (Comment, Log Work, issue links) are read by position.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as source:
+        reader = csv.reader(source)
+        header = next(reader, [])
+        columns = {}
+        for index, name in enumerate(header):
+            columns.setdefault(name, []).append(index)
+        links = [
+            (LINK_TYPES[match["type"].lower()], indexes)
+            for name, indexes in columns.items()
+            for match in [CSV_LINK_COLUMN.match(name)]
+            if match and match["type"].lower() in LINK_TYPES
+        ]
+
+        def values(row, name):
+            return [row[i] for i in columns.get(name, []) if i < len(row) and row[i]]
+
+        def value(row, name):
+            found = values(row, name)
+            return found[0] if found else ""
+
+        for row in reader:
+            comments = []
+            for comment in values(row, "Comment"):
+                created, author, body = (comment.split(";", 2) + ["", ""])[:3]
+                comments.append((author, parse_date(created), body))
+
+            worklogs = []
+            for worklog in values(row, "Log Work"):
+                parts = worklog.rsplit(";", 3)
+                if len(parts) == 4 and parts[3].isdigit():
+                    description, started, author, seconds = parts
+                    worklogs.append(
+                        (author, parse_date(started), int(seconds), description)
+                    )
+
+            estimate = value(row, "Original Estimate")
+            yield _issue(
+                value(row, "Issue key"),
+                summary=value(row, "Summary"),
+                description=value(row, "Description"),
+                type=value(row, "Issue Type"),
+                status=value(row, "Status"),
+                priority=value(row, "Priority"),
+                created=parse_date(value(row, "Created")),
+                due=parse_date(value(row, "Due Date") or value(row, "Due date")),
+                assignee=value(row, "Assignee") or None,
+                reporter=value(row, "Reporter") or None,
+                estimate=int(estimate) if estimate.isdigit() else None,
+                comments=comments,
+                worklogs=worklogs,
+                links=[
+                    (relation_type, key)
+                    for relation_type, indexes in links
+                    for key in (row[i] for i in indexes if i < len(row))
+                    if key
+                ],
+            )
+
+
+def _user_attribute(element):
+    if element is None:
+        return None
+    return element.get("username") or element.text or None
+
+
+def iter_xml_issues(path):
+    """Yield issues of a Jira XML (RSS) export one <item> at a time.
+
+    Every parsed <item> is detached from the tree, so memory does not grow
+    with the size of the file.
+    """
+    channel = None
+    for event, element in iterparse(path, events=("start", "end")):
+        if event == "start":
+            if element.tag == "channel":
+                channel = element
+            continue
+        if element.tag != "item":
+            continue
+
+        estimate = element.find("timeoriginalestimate")
+        links = []
+        for link_type in element.iterfind("issuelinks/issuelinktype"):
+            relation_type = LINK_TYPES.get(link_type.findtext("name", "").lower())
+            if relation_type is None:
+                continue
+            for key in link_type.iterfind("outwardlinks/issuelink/issuekey"):
+                links.append((relation_type, key.text))
+
+        yield _issue(
+            element.findtext("key", ""),
+            summary=element.findtext("summary", ""),
+            description=element.findtext("description", ""),
+            type=element.findtext("type", ""),
+            status=element.findtext("status", ""),
+            priority=element.findtext("priority", ""),
+            created=parse_date(element.findtext("created")),
+            due=parse_date(element.findtext("due")),
+            assignee=_user_attribute(element.find("assignee")),
+            reporter=_user_attribute(element.find("reporter")),
+            estimate=(
+                int(estimate.get("seconds"))
+                if estimate is not None and (estimate.get("seconds") or "").isdigit()
+                else None
+            ),
+            comments=[
+                (
+                    comment.get("author"),
+                    parse_date(comment.get("created")),
+                    comment.text or "",
+                )
+                for comment in element.iterfind("comments/comment")
+            ],
+            links=links,
+        )
+
+        element.clear()
+        if channel is not None:
+            channel.remove(element)
+
+
+PARSERS = {
+    ImportFormat.CSV: iter_csv_issues,
+    ImportFormat.XML: iter_xml_issues,
+}
+
+
+def _batches(issues, size):
+    while True:
+        batch = list(islice(issues, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _import_issues(job: ImportJob, issues: list):
+    usernames = {issue["assignee"] for issue in issues} | {
+        issue["reporter"] for issue in issues
+    }
+    for issue in issues:
+        usernames.update(author for author, *_ in issue["comments"])
+        usernames.update(author for author, *_ in issue["worklogs"])
+    users = dict(
+        User.objects.filter(username__in=usernames - {None}).values_list(
+            "username", "id"
+        )
+    )
+
+    project = job.project
+    numbers = project.allocate_task_numbers(len(issues))
+    tasks = Task.objects.bulk_create(
+        Task(
+            custom_number=f"{project.short_name}-{number}",
+            name=(issue["summary"] or issue["key"])[:255],
+            description=issue["description"],
+            type=TYPES.get(issue["type"].lower(), TypeTask.WORK_ITEM),
+            status=STATUSES.get(issue["status"].lower(), StatusTask.BACKLOG),
+            priority=PRIORITIES.get(issue["priority"].lower(), PriorityTask.MEDIUM),
+            estimate_hours=(
+                round(issue["estimate"] / 3600)
+                if issue["estimate"] is not None
+                else None
+            ),
+            date_created=issue["created"] or timezone.now(),
+            deadline_date=issue["due"],
+            creator_id=users.get(issue["reporter"], job.user_id),
+            performer_id=users.get(issue["assignee"]),
+            project=project,
+        )
+        for issue, number in zip(issues, numbers)
+    )
+
+    ImportedIssue.objects.bulk_create(
+        ImportedIssue(job=job, key=issue["key"], task=task)
+        for issue, task in zip(issues, tasks)
+    )
+    Comment.objects.bulk_create(
+        Comment(
+            task=task,
+            user_id=users.get(author, job.user_id),
+            date_create=created or timezone.now(),
+            text=body,
+        )
+        for issue, task in zip(issues, tasks)
+        for author, created, body in issue["comments"]
+    )
+    LogTimeTask.objects.bulk_create(
+        LogTimeTask(
+            task=task,
+            user_id=users.get(author, job.user_id),
+            date_logged=started or timezone.now(),
+            hours=seconds / 3600,
+            description=description,
+        )
+        for issue, task in zip(issues, tasks)
+        for author, started, seconds, description in issue["worklogs"]
+    )
+
+
+def _import_links(job: ImportJob, issues: list):
+    """Link the tasks of ``issues`` under the rules of the connect endpoint.
+
+    Links already stored from either end (including symmetric ones listed
+    by both issues) are dropped; blocking links that would close a cycle
+    are skipped and counted in ``job.skipped_links``.
+    """
+    keys = {issue["key"] for issue in issues}
+    for issue in issues:
+        keys.update(key for _, key in issue["links"])
+    tasks = dict(job.issues.filter(key__in=keys).values_list("key", "task_id"))
+
+    links = [
+        (tasks[issue["key"]], tasks[key], relation_type)
+        for issue in issues
+        for relation_type, key in issue["links"]
+        if issue["key"] in tasks and key in tasks and key != issue["key"]
+    ]
+    if not links:
+        return
+
+    lock_task_links()
+    ids = {task_id for link in links for task_id in link[:2]}
+    stored = set(
+        TasksRelation.objects.filter(
+            from_task_id__in=ids, to_task_id__in=ids
+        ).values_list("from_task_id", "to_task_id", "relation_type")
+    )
+    other_links = []
+    for from_id, to_id, relation_type in links:
+        inverse = (to_id, from_id, TasksRelation.INVERSE_TYPES[relation_type])
+        if (from_id, to_id, relation_type) in stored or inverse in stored:
+            continue
+
+        if relation_type in BLOCKING_TYPES:
+            blocker, blocked = (
+                (from_id, to_id)
+                if relation_type == RelationType.BLOCKS
+                else (to_id, from_id)
+            )
+            if blocks_transitively(blocked, blocker):
+                job.skipped_links += 1
+                continue
+            # Written at once, so the next links are checked against it
+            TasksRelation.objects.create(
+                from_task_id=from_id, to_task_id=to_id, relation_type=relation_type
+            )
+        else:
+            other_links.append(
+                TasksRelation(
+                    from_task_id=from_id, to_task_id=to_id, relation_type=relation_type
+                )
+            )
+        stored.add((from_id, to_id, relation_type))
+
+    TasksRelation.objects.bulk_create(other_links)
+
+
+STAGES = (
+    (ImportStage.TASKS, _import_issues, ImportStage.RELATIONS),
+    (ImportStage.RELATIONS, _import_links, ImportStage.DONE),
+)
+
+
+def run_import(job: ImportJob, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    """Run (or resume) ``job`` until it is done.
+
+    ``progress`` is called with the job after every committed batch.
+    """
+    for stage, import_batch, next_stage in STAGES:
+        if job.stage != stage:
+            continue
+
+        issues = PARSERS[job.format](job.source)
+        for batch in _batches(islice(issues, job.position, None), batch_size):
+            with transaction.atomic():
+                import_batch(job, batch)
+                job.position += len(batch)
+                job.date_modified = timezone.now()
+                job.save(update_fields=["position", "skipped_links", "date_modified"])
+            if progress is not None:
+                progress(job)
+
+        job.stage, job.position = next_stage, 0
+        job.date_modified = timezone.now()
+        job.save(update_fields=["stage", "position", "date_modified"])
+
+    return job
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from jirabas.tasks.benchmarks import cpu_ms, sample_tasks
+from jirabas.tasks.models import Task
+from jirabas.tasks.serializers import TaskSerializer
+from jirabas.utils.json import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the CPU time DRF's stdlib-based JSONRenderer and "
+        "ORJSONRenderer spend on a page of serialized tasks"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--from-db",
+            action="store_true",
+            help="Serialize the latest tasks of the database instead of samples",
+        )
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        if options["from_db"]:
+            tasks = list(Task.objects.order_by("-date_created", "-id")[:count])
+        else:
+            tasks = sample_tasks(count)
+        # Same shape as a page of tasks/
+        payload = {
+            "next": None,
+            "previous": None,
+            "results": TaskSerializer(tasks, many=True).data,
+        }
+
+        stdlib = cpu_ms(lambda: JSONRenderer().render(payload), options["repeat"])
+        fast = cpu_ms(lambda: ORJSONRenderer().render(payload), options["repeat"])
+
+        per_thousand = 1000 / max(len(tasks), 1)
+        self.stdout.write(
+            f"JSONRenderer:   {stdlib * per_thousand:8.2f} ms CPU per 1000 tasks"
+        )
+        self.stdout.write(
+            f"ORJSONRenderer: {fast * per_thousand:8.2f} ms CPU per 1000 tasks"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Saved {(stdlib - fast) * per_thousand:.2f} ms per 1000 tasks "
+                f"({stdlib / fast:.1f}x faster)"
+            )
+        )
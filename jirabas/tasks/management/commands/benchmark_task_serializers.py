@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from jirabas.tasks.benchmarks import cpu_ms, sample_tasks
+from jirabas.tasks.serializers import (
+    TaskSerializer,
+    TaskValuesSerializer,
+    parse_task_fields,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the CPU time TaskSerializer and TaskValuesSerializer spend "
+        "on a list of in-memory tasks (no database access)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--fields", default="", help="Comma-separated fields, as in ?fields="
+        )
+
+    def handle(self, *args, **options):
+        count, fields = options["count"], parse_task_fields(options["fields"])
+        tasks = sample_tasks(count)
+        columns = TaskValuesSerializer.columns(fields)
+        rows = [{column: getattr(task, column) for column in columns} for task in tasks]
+
+        model = cpu_ms(
+            lambda: TaskSerializer(tasks, many=True, fields=fields).data,
+            options["repeat"],
+        )
+        values = cpu_ms(
+            lambda: TaskValuesSerializer(rows, fields=fields).data, options["repeat"]
+        )
+
+        per_thousand = 1000 / count
+        self.stdout.write(
+            f"TaskSerializer:       {model * per_thousand:8.2f} ms CPU per 1000 tasks"
+        )
+        self.stdout.write(
+            f"TaskValuesSerializer: {values * per_thousand:8.2f} ms CPU per 1000 tasks"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Saved {(model - values) * per_thousand:.2f} ms per 1000 tasks "
+                f"({model / values:.1f}x faster)"
+            )
+        )
@@ -0,0 +1,94 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jirabas.tasks.enums import ImportFormat
+from jirabas.tasks.importer import IMPORT_BATCH_SIZE, run_import
+from jirabas.tasks.models import ImportJob, Project
+from jirabas.tasks.tasks import import_jira_export
+from jirabas.users.models import User
+
+
+class Command(BaseCommand):
+    help = "Import issues from a Jira CSV or XML export into a project"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="Path to the export file")
+        parser.add_argument("--project", type=int, help="Id of the target project")
+        parser.add_argument(
+            "--user", help="Username used for issues with an unknown reporter"
+        )
+        parser.add_argument(
+            "--format",
+            choices=ImportFormat.values,
+            help="Format of the export, guessed from the file extension by default",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help="Number of issues written per transaction",
+        )
+        parser.add_argument(
+            "--resume",
+            type=int,
+            metavar="JOB_ID",
+            help="Continue an interrupted import",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="run_async",
+            help="Run the import in a Celery worker",
+        )
+
+    def _create_job(self, options) -> ImportJob:
+        path = options["path"]
+        if not path or not options["project"] or not options["user"]:
+            raise CommandError("path, --project and --user are required")
+        if not os.path.isfile(path):
+            raise CommandError(f"File {path} does not exist")
+
+        import_format = options["format"] or os.path.splitext(path)[1][1:].lower()
+        if import_format not in ImportFormat.values:
+            raise CommandError("Unable to guess the format, pass --format")
+
+        try:
+            project = Project.objects.get(pk=options["project"])
+            user = User.objects.get(username=options["user"])
+        except (Project.DoesNotExist, User.DoesNotExist) as error:
+            raise CommandError(error)
+
+        return ImportJob.objects.create(
+            source=os.path.abspath(path),
+            format=import_format,
+            project=project,
+            user=user,
+        )
+
+    def _progress(self, job):
+        self.stdout.write(f"Import {job.pk}: {job.stage}, {job.position} issues")
+
+    def handle(self, *args, **options):
+        if options["resume"]:
+            try:
+                job = ImportJob.objects.select_related("project").get(
+                    pk=options["resume"]
+                )
+            except ImportJob.DoesNotExist:
+                raise CommandError(f"Import {options['resume']} does not exist")
+        else:
+            job = self._create_job(options)
+
+        if options["run_async"]:
+            result = import_jira_export.delay(job.pk, options["batch_size"])
+            self.stdout.write(f"Import {job.pk} queued as {result.id}")
+            return
+
+        run_import(job, batch_size=options["batch_size"], progress=self._progress)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Import {job.pk} finished, {job.skipped_links} links skipped "
+                "as blocking cycles"
+            )
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from jirabas.tasks.tasks import OVERDUE_CHUNK_SIZE, mark_overdue_tasks
+
+
+class Command(BaseCommand):
+    help = "Move tasks with an expired deadline to the IS_DELAYED status"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=OVERDUE_CHUNK_SIZE,
+            help="Number of tasks updated per transaction",
+        )
+
+    def handle(self, *args, **options):
+        updated = mark_overdue_tasks(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Marked {updated} tasks as delayed"))
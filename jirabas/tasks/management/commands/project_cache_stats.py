@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from jirabas.tasks.cache import get_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters of the project members cache"
+
+    def handle(self, *args, **options):
+        stats = get_cache_stats()
+        hit_rate = stats["hit_rate"]
+        self.stdout.write(
+            "hits: {hits}, misses: {misses}, hit rate: {rate}".format(
+                rate="n/a" if hit_rate is None else f"{hit_rate:.1%}", **stats
+            )
+        )
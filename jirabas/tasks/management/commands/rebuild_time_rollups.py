@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jirabas.tasks.timesheet import rebuild_time_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the per-day logged time rollups, needed after TIME_ZONE "
+        "has changed"
+    )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_time_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} rollups"))
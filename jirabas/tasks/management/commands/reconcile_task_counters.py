@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from jirabas.tasks.counters import reconcile_task_counters
+
+
+class Command(BaseCommand):
+    help = "Repair per-project task counters that drifted from the tasks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project",
+            type=int,
+            action="append",
+            dest="projects",
+            help="Id of a project to reconcile, all projects by default",
+        )
+
+    def handle(self, *args, **options):
+        fixed = reconcile_task_counters(options["projects"])
+        self.stdout.write(self.style.SUCCESS(f"Corrected {fixed} counters"))
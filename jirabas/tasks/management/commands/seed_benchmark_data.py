@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jirabas.tasks.benchmarks import SEED_USERNAME_PREFIX, seed_benchmark_data
+from jirabas.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with synthetic users, projects, tasks, relations, "
+        "comments and logged time for benchmarks; the defaults make about a "
+        "million tasks"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=2000)
+        parser.add_argument(
+            "--tasks", type=int, default=500, help="Average number of tasks per project"
+        )
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if options["users"] < 12:
+            raise CommandError("At least 12 users are needed to staff a project")
+        if User.objects.filter(username__startswith=SEED_USERNAME_PREFIX).exists():
+            raise CommandError("Benchmark data is already in the database")
+
+        def progress(totals):
+            if totals["projects"] % 100 == 0:
+                self.stdout.write(
+                    f"{totals['projects']} projects, {totals['tasks']} tasks"
+                )
+
+        totals = seed_benchmark_data(
+            options["projects"],
+            options["tasks"],
+            options["users"],
+            options["seed"],
+            progress=progress,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Created {projects} projects, {tasks} tasks, {relations} relations, "
+                "{comments} comments and {logged_time} time logs".format(**totals)
+            )
+        )
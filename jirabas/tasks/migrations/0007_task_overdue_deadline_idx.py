@@ -0,0 +1,17 @@
+# Generated by Django 3.0.11 on 2026-10-18 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_auto_20201227_2349'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(status__in=['BL', 'IP', 'RV']), fields=['deadline_date'], name='task_overdue_deadline_idx'),
+        ),
+    ]
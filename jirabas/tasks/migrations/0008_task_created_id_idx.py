@@ -0,0 +1,17 @@
+# Generated by Django 3.0.11 on 2026-10-18 13:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_overdue_deadline_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['date_created', 'id'], name='task_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 3.0.11 on 2026-10-18 13:34
+
+from django.db import migrations, models
+
+
+def parse_number(custom_number):
+    try:
+        return int(custom_number.rsplit("-", 1)[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def backfill_task_counter(apps, schema_editor):
+    # We can't import the models directly as they may be a newer
+    # version than this migration expects. We use the historical version.
+    Project = apps.get_model('tasks', 'Project')
+    Task = apps.get_model('tasks', 'Task')
+
+    for project in Project.objects.all():
+        tasks = list(
+            Task.objects.filter(project=project)
+            .order_by('id')
+            .only('id', 'custom_number')
+        )
+        numbers = [parse_number(task.custom_number) for task in tasks]
+        counter = max((n + 1 for n in numbers if n is not None), default=0)
+
+        # Concurrent creates used to produce duplicate numbers: keep the
+        # oldest task and renumber the rest from the counter.
+        seen = set()
+        for task in tasks:
+            if task.custom_number in seen:
+                task.custom_number = f'{project.short_name}-{counter}'
+                task.save(update_fields=['custom_number'])
+                counter += 1
+            seen.add(task.custom_number)
+
+        project.task_counter = counter
+        project.save(update_fields=['task_counter'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='task_counter',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of allocated task numbers'),
+        ),
+        migrations.RunPython(
+            backfill_task_counter,
+            reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(fields=('project', 'custom_number'), name='task_project_custom_number_uniq'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.0.11 on 2026-10-18 13:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks', '0009_project_task_counter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'date_created'], name='task_project_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(performer__isnull=False), fields=['performer', 'status', 'date_created'], name='task_performer_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'type'], name='task_status_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['type', 'date_created'], name='task_type_created_idx'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='performer',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='performer_tasks', to=settings.AUTH_USER_MODEL, verbose_name='Performer of task'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='project',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='tasks.Project', verbose_name='Project'),
+        ),
+    ]
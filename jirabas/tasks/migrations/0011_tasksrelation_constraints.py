@@ -0,0 +1,52 @@
+# Generated by Django 3.0.11 on 2026-10-18 13:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.expressions
+
+
+def remove_invalid_links(apps, schema_editor):
+    # We can't import the TasksRelation model directly as it may be a newer
+    # version than this migration expects. We use the historical version.
+    TasksRelation = apps.get_model('tasks', 'TasksRelation')
+
+    TasksRelation.objects.filter(from_task=models.F('to_task')).delete()
+
+    duplicates = (
+        TasksRelation.objects.values('from_task', 'to_task', 'relation_type')
+        .annotate(first_id=models.Min('id'), links=models.Count('id'))
+        .filter(links__gt=1)
+    )
+    for link in duplicates:
+        TasksRelation.objects.filter(
+            from_task=link['from_task'],
+            to_task=link['to_task'],
+            relation_type=link['relation_type'],
+        ).exclude(id=link['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_invalid_links,
+            reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='tasksrelation',
+            constraint=models.UniqueConstraint(fields=('from_task', 'to_task', 'relation_type'), name='tasksrelation_unique_link'),
+        ),
+        migrations.AddConstraint(
+            model_name='tasksrelation',
+            constraint=models.CheckConstraint(check=models.Q(_negated=True, from_task=django.db.models.expressions.F('to_task')), name='tasksrelation_no_self_link'),
+        ),
+        migrations.AlterField(
+            model_name='tasksrelation',
+            name='from_task',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='child_tasks', to='tasks.Task'),
+        ),
+    ]
@@ -0,0 +1,131 @@
+# Generated by Django 3.0.11 on 2026-10-18 13:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("tasks", "0011_tasksrelation_constraints"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportJob",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        max_length=1000, verbose_name="Path to the export file"
+                    ),
+                ),
+                (
+                    "format",
+                    models.CharField(
+                        choices=[("csv", "CSV"), ("xml", "XML")], max_length=3
+                    ),
+                ),
+                (
+                    "stage",
+                    models.CharField(
+                        choices=[
+                            ("tasks", "Tasks"),
+                            ("relations", "Relations"),
+                            ("done", "Done"),
+                        ],
+                        default="tasks",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "position",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Processed issues"
+                    ),
+                ),
+                (
+                    "date_created",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Creation date"
+                    ),
+                ),
+                (
+                    "date_modified",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Modification date"
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="imports",
+                        to="tasks.Project",
+                        verbose_name="Project",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="imports",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Started by",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ImportedIssue",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=255, verbose_name="Issue key")),
+                (
+                    "job",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="issues",
+                        to="tasks.ImportJob",
+                        verbose_name="Import",
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="tasks.Task",
+                        verbose_name="Task",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="importedissue",
+            constraint=models.UniqueConstraint(
+                fields=("job", "key"), name="importedissue_job_key_uniq"
+            ),
+        ),
+    ]
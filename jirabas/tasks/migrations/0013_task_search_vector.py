@@ -0,0 +1,65 @@
+# Generated by Django 3.0.11 on 2026-10-18 13:48
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Keep in sync with jirabas.tasks.search.SEARCH_CONFIG
+SEARCH_VECTOR = """
+    setweight(to_tsvector('russian', coalesce({row}name, '')), 'A')
+    || setweight(to_tsvector('russian', coalesce({row}acceptance_criteria, '')), 'B')
+    || setweight(to_tsvector('russian', coalesce({row}description, '')), 'C')
+"""
+
+# The vector is rebuilt in the same statement as every write to the task,
+# including bulk_create() and queryset update(); writes that do not touch
+# the text keep the previous vector.
+CREATE_TRIGGER = f"""
+CREATE FUNCTION tasks_task_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND NEW.name IS NOT DISTINCT FROM OLD.name
+        AND NEW.acceptance_criteria IS NOT DISTINCT FROM OLD.acceptance_criteria
+        AND NEW.description IS NOT DISTINCT FROM OLD.description
+    THEN
+        NEW.search_vector := OLD.search_vector;
+    ELSE
+        NEW.search_vector := {SEARCH_VECTOR.format(row='NEW.')};
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_task_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON tasks_task
+    FOR EACH ROW EXECUTE PROCEDURE tasks_task_search_vector_update();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER tasks_task_search_vector_trigger ON tasks_task;
+DROP FUNCTION tasks_task_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0012_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(
+            f'UPDATE tasks_task SET search_vector = {SEARCH_VECTOR.format(row="")}',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, reverse_sql=DROP_TRIGGER),
+        migrations.AddIndex(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='task_search_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 3.0.11 on 2026-10-18 13:50
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Days are counted in the project time zone; rollups have to be rebuilt
+# (see the backfill below) if settings.TIME_ZONE changes.
+DAY = f"(({{row}}date_logged AT TIME ZONE '{settings.TIME_ZONE}')::date)"
+
+BACKFILL = f"""
+INSERT INTO tasks_loggedtimerollup (task_id, user_id, date, hours, entries)
+SELECT task_id, user_id, {DAY.format(row='')}, sum(hours), count(*)
+FROM tasks_logtimetask
+GROUP BY 1, 2, 3
+"""
+
+# Moves the hours of every written LogTimeTask row between rollups in the
+# same transaction as the write, including bulk_create() and queryset
+# update()/delete().
+CREATE_TRIGGER = f"""
+CREATE FUNCTION tasks_logtimetask_rollup() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND NEW.hours = OLD.hours
+        AND NEW.task_id = OLD.task_id
+        AND NEW.user_id = OLD.user_id
+        AND {DAY.format(row='NEW.')} = {DAY.format(row='OLD.')}
+    THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE tasks_loggedtimerollup
+        SET hours = hours - OLD.hours, entries = entries - 1
+        WHERE task_id = OLD.task_id
+            AND user_id = OLD.user_id
+            AND date = {DAY.format(row='OLD.')};
+
+        DELETE FROM tasks_loggedtimerollup
+        WHERE task_id = OLD.task_id
+            AND user_id = OLD.user_id
+            AND date = {DAY.format(row='OLD.')}
+            AND entries = 0;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO tasks_loggedtimerollup (task_id, user_id, date, hours, entries)
+        VALUES (NEW.task_id, NEW.user_id, {DAY.format(row='NEW.')}, NEW.hours, 1)
+        ON CONFLICT (task_id, user_id, date) DO UPDATE
+        SET hours = tasks_loggedtimerollup.hours + EXCLUDED.hours,
+            entries = tasks_loggedtimerollup.entries + 1;
+    END IF;
+
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_logtimetask_rollup_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON tasks_logtimetask
+    FOR EACH ROW EXECUTE PROCEDURE tasks_logtimetask_rollup();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER tasks_logtimetask_rollup_trigger ON tasks_logtimetask;
+DROP FUNCTION tasks_logtimetask_rollup();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks', '0013_task_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoggedTimeRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Day')),
+                ('hours', models.FloatField(default=0.0)),
+                ('entries', models.PositiveIntegerField(default=0)),
+                ('task', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='time_rollups', to='tasks.Task', verbose_name='Task')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='time_rollups', to=settings.AUTH_USER_MODEL, verbose_name='Performer')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='loggedtimerollup',
+            index=models.Index(fields=['user', 'date'], name='loggedtimerollup_user_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='loggedtimerollup',
+            constraint=models.UniqueConstraint(fields=('task', 'user', 'date'), name='loggedtimerollup_uniq'),
+        ),
+        migrations.RunSQL(BACKFILL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(CREATE_TRIGGER, reverse_sql=DROP_TRIGGER),
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 3.0.11 on 2026-10-18 13:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BACKFILL = """
+INSERT INTO tasks_projecttaskcounter (project_id, status, type, count)
+SELECT project_id, status, type, count(*)
+FROM tasks_task
+GROUP BY 1, 2, 3
+"""
+
+# Statement-level triggers: a bulk write such as the overdue sweep's update()
+# adjusts each affected counter once, from the rows grouped by
+# (project, status, type), in the same transaction as the write. Counters
+# are only decremented by UPDATE, so deleting a project never re-creates
+# counter rows for it.
+ADD_COUNTS = """
+INSERT INTO tasks_projecttaskcounter (project_id, status, type, count)
+SELECT project_id, status, type, count FROM delta WHERE count > 0
+ORDER BY 1, 2, 3
+ON CONFLICT (project_id, status, type) DO UPDATE
+SET count = tasks_projecttaskcounter.count + EXCLUDED.count
+"""
+
+SUBTRACT_COUNTS = """
+UPDATE tasks_projecttaskcounter counter
+SET count = counter.count + delta.count
+FROM delta
+WHERE counter.project_id = delta.project_id
+    AND counter.status = delta.status
+    AND counter.type = delta.type
+    AND delta.count < 0
+"""
+
+CREATE_TRIGGERS = f"""
+CREATE FUNCTION tasks_task_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        WITH delta AS (
+            SELECT project_id, status, type, count(*) AS count
+            FROM new_rows GROUP BY 1, 2, 3
+        )
+        {ADD_COUNTS};
+    ELSIF TG_OP = 'DELETE' THEN
+        WITH delta AS (
+            SELECT project_id, status, type, -count(*) AS count
+            FROM old_rows GROUP BY 1, 2, 3
+        )
+        {SUBTRACT_COUNTS};
+    ELSE
+        WITH delta AS (
+            SELECT project_id, status, type, sum(change) AS count
+            FROM (
+                SELECT project_id, status, type, 1 AS change FROM new_rows
+                UNION ALL
+                SELECT project_id, status, type, -1 AS change FROM old_rows
+            ) AS changes
+            GROUP BY 1, 2, 3
+            HAVING sum(change) <> 0
+        ),
+        subtracted AS ({SUBTRACT_COUNTS})
+        {ADD_COUNTS};
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_task_count_insert
+    AFTER INSERT ON tasks_task REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE tasks_task_count();
+
+CREATE TRIGGER tasks_task_count_update
+    AFTER UPDATE ON tasks_task REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE tasks_task_count();
+
+CREATE TRIGGER tasks_task_count_delete
+    AFTER DELETE ON tasks_task REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE tasks_task_count();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER tasks_task_count_insert ON tasks_task;
+DROP TRIGGER tasks_task_count_update ON tasks_task;
+DROP TRIGGER tasks_task_count_delete ON tasks_task;
+DROP FUNCTION tasks_task_count();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0014_loggedtimerollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectTaskCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('BL', 'BACKLOG'), ('IP', 'IN_PROGRESS'), ('PP', 'POSTPONED'), ('DN', 'DONE'), ('ID', 'IS_DELAYED'), ('LT', 'BEING_LATE'), ('RV', 'REVIEW')], max_length=2)),
+                ('type', models.CharField(choices=[('WI', 'Work item'), ('BUG', 'Bug'), ('REQ', 'Requirement'), ('TT', 'Test'), ('KI', 'Know issue')], max_length=3)),
+                ('count', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='task_counters', to='tasks.Project', verbose_name='Project')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='projecttaskcounter',
+            constraint=models.UniqueConstraint(fields=('project', 'status', 'type'), name='projecttaskcounter_uniq'),
+        ),
+        migrations.RunSQL(BACKFILL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(CREATE_TRIGGERS, reverse_sql=DROP_TRIGGERS),
+    ]
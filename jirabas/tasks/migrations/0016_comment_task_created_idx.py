@@ -0,0 +1,24 @@
+# Generated by Django 3.0.11 on 2026-10-18 13:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0015_projecttaskcounter'),
+    ]
+
+    operations = [
+        # The composite index replaces the FK index, create it first
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['task', 'date_create', 'id'], name='comment_task_created_idx'),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='task',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='tasks.Task', verbose_name='Task'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 3.0.11 on 2026-10-18 13:55
+
+from django.db import migrations, models
+
+BACKFILL = """
+UPDATE tasks_task SET date_modified = date_created WHERE date_modified IS NULL;
+UPDATE tasks_project SET date_modified = now();
+"""
+
+# save() sets date_modified itself (auto_now); the trigger covers writes
+# that leave it untouched, such as queryset update() and bulk_update().
+# A membership change touches its project, since it changes what the
+# project is served with and to whom. clock_timestamp() rather than now(),
+# so that several writes in one transaction still move date_modified.
+CREATE_TRIGGERS = """
+CREATE FUNCTION tasks_touch_date_modified() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        NEW.date_modified := coalesce(NEW.date_modified, clock_timestamp());
+    ELSIF NEW.date_modified IS NOT DISTINCT FROM OLD.date_modified THEN
+        NEW.date_modified := clock_timestamp();
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_task_date_modified_trigger
+    BEFORE INSERT OR UPDATE ON tasks_task
+    FOR EACH ROW EXECUTE PROCEDURE tasks_touch_date_modified();
+
+CREATE TRIGGER tasks_project_date_modified_trigger
+    BEFORE INSERT OR UPDATE ON tasks_project
+    FOR EACH ROW EXECUTE PROCEDURE tasks_touch_date_modified();
+
+CREATE FUNCTION tasks_projectmembership_touch_project() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE tasks_project SET date_modified = clock_timestamp() WHERE id = NEW.project_id;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE tasks_project SET date_modified = clock_timestamp() WHERE id = OLD.project_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_projectmembership_touch_project_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON tasks_projectmembership
+    FOR EACH ROW EXECUTE PROCEDURE tasks_projectmembership_touch_project();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER tasks_projectmembership_touch_project_trigger ON tasks_projectmembership;
+DROP FUNCTION tasks_projectmembership_touch_project();
+DROP TRIGGER tasks_project_date_modified_trigger ON tasks_project;
+DROP TRIGGER tasks_task_date_modified_trigger ON tasks_task;
+DROP FUNCTION tasks_touch_date_modified();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0016_comment_task_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='date_modified',
+            field=models.DateTimeField(auto_now=True, null=True, verbose_name='Modification date'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='date_modified',
+            field=models.DateTimeField(auto_now=True, null=True, verbose_name='Modification date'),
+        ),
+        migrations.RunSQL(BACKFILL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(CREATE_TRIGGERS, reverse_sql=DROP_TRIGGERS),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 3.0.11 on 2026-10-18 13:57
+
+from django.db import migrations, models
+import django.utils.timezone
+
+# A tombstone per deleted task, and per task moved to another project (it
+# disappears from the old one), written in the same transaction.
+CREATE_TRIGGERS = """
+CREATE FUNCTION tasks_task_tombstone() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO tasks_tasktombstone (task_id, project_id, date_deleted)
+        SELECT id, project_id, clock_timestamp() FROM old_rows;
+    ELSE
+        INSERT INTO tasks_tasktombstone (task_id, project_id, date_deleted)
+        SELECT old_rows.id, old_rows.project_id, clock_timestamp()
+        FROM old_rows JOIN new_rows ON new_rows.id = old_rows.id
+        WHERE new_rows.project_id <> old_rows.project_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_task_tombstone_delete
+    AFTER DELETE ON tasks_task REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE tasks_task_tombstone();
+
+CREATE TRIGGER tasks_task_tombstone_update
+    AFTER UPDATE ON tasks_task REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE tasks_task_tombstone();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER tasks_task_tombstone_delete ON tasks_task;
+DROP TRIGGER tasks_task_tombstone_update ON tasks_task;
+DROP FUNCTION tasks_task_tombstone();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0017_date_modified'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTombstone',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.IntegerField(verbose_name='Deleted task')),
+                ('project_id', models.IntegerField(verbose_name='Project')),
+                ('date_deleted', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Deletion date')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'date_modified', 'id'], name='task_project_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['project_id', 'date_deleted', 'id'], name='tasktombstone_project_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['date_deleted'], name='tasktombstone_deleted_idx'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS, reverse_sql=DROP_TRIGGERS),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.11 on 2026-10-18 14:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0018_tasktombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='skipped_links',
+            field=models.PositiveIntegerField(default=0, verbose_name='Blocking links skipped as they close a cycle'),
+        ),
+    ]
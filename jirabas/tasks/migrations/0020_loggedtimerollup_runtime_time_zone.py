@@ -0,0 +1,62 @@
+from django.db import migrations
+
+# Days are counted in the zone the application passes to its connections
+# (jirabas.time_zone, see DATABASES in the settings), falling back to the
+# session time zone elsewhere. Existing rollups are not rewritten: after
+# TIME_ZONE changes, run the rebuild_time_rollups command.
+DAY = (
+    "(({row}date_logged AT TIME ZONE coalesce("
+    "nullif(current_setting('jirabas.time_zone', true), ''), "
+    "current_setting('TimeZone')))::date)"
+)
+
+CREATE_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION tasks_logtimetask_rollup() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND NEW.hours = OLD.hours
+        AND NEW.task_id = OLD.task_id
+        AND NEW.user_id = OLD.user_id
+        AND {DAY.format(row='NEW.')} = {DAY.format(row='OLD.')}
+    THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE tasks_loggedtimerollup
+        SET hours = hours - OLD.hours, entries = entries - 1
+        WHERE task_id = OLD.task_id
+            AND user_id = OLD.user_id
+            AND date = {DAY.format(row='OLD.')};
+
+        DELETE FROM tasks_loggedtimerollup
+        WHERE task_id = OLD.task_id
+            AND user_id = OLD.user_id
+            AND date = {DAY.format(row='OLD.')}
+            AND entries = 0;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO tasks_loggedtimerollup (task_id, user_id, date, hours, entries)
+        VALUES (NEW.task_id, NEW.user_id, {DAY.format(row='NEW.')}, NEW.hours, 1)
+        ON CONFLICT (task_id, user_id, date) DO UPDATE
+        SET hours = tasks_loggedtimerollup.hours + EXCLUDED.hours,
+            entries = tasks_loggedtimerollup.entries + 1;
+    END IF;
+
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0019_importjob_skipped_links'),
+    ]
+
+    operations = [
+        # The reverse keeps this version: 0014 would bake in the zone again
+        migrations.RunSQL(CREATE_FUNCTION, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,83 @@
+from django.db import migrations
+
+INSERT_DELTA = """
+SELECT project_id, status, type, count(*) AS count
+FROM new_rows GROUP BY 1, 2, 3
+"""
+
+DELETE_DELTA = """
+SELECT project_id, status, type, -count(*) AS count
+FROM old_rows GROUP BY 1, 2, 3
+"""
+
+UPDATE_DELTA = """
+SELECT project_id, status, type, sum(change) AS count
+FROM (
+    SELECT project_id, status, type, 1 AS change FROM new_rows
+    UNION ALL
+    SELECT project_id, status, type, -1 AS change FROM old_rows
+) AS changes
+GROUP BY 1, 2, 3
+HAVING sum(change) <> 0
+"""
+
+# Counter rows are locked in key order before any of them is written, the
+# same order ADD_COUNTS inserts in, so concurrent statements touching the
+# same counters wait for each other instead of deadlocking.
+LOCK_COUNTERS = """
+PERFORM 1
+FROM tasks_projecttaskcounter counter
+JOIN ({delta}) AS delta USING (project_id, status, type)
+ORDER BY counter.project_id, counter.status, counter.type
+FOR UPDATE OF counter
+"""
+
+ADD_COUNTS = """
+INSERT INTO tasks_projecttaskcounter (project_id, status, type, count)
+SELECT project_id, status, type, count FROM delta WHERE count > 0
+ORDER BY 1, 2, 3
+ON CONFLICT (project_id, status, type) DO UPDATE
+SET count = tasks_projecttaskcounter.count + EXCLUDED.count
+"""
+
+SUBTRACT_COUNTS = """
+UPDATE tasks_projecttaskcounter counter
+SET count = counter.count + delta.count
+FROM delta
+WHERE counter.project_id = delta.project_id
+    AND counter.status = delta.status
+    AND counter.type = delta.type
+    AND delta.count < 0
+"""
+
+CREATE_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION tasks_task_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        WITH delta AS ({INSERT_DELTA})
+        {ADD_COUNTS};
+    ELSIF TG_OP = 'DELETE' THEN
+        {LOCK_COUNTERS.format(delta=DELETE_DELTA)};
+        WITH delta AS ({DELETE_DELTA})
+        {SUBTRACT_COUNTS};
+    ELSE
+        {LOCK_COUNTERS.format(delta=UPDATE_DELTA)};
+        WITH delta AS ({UPDATE_DELTA}),
+        subtracted AS ({SUBTRACT_COUNTS})
+        {ADD_COUNTS};
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0020_loggedtimerollup_runtime_time_zone'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_FUNCTION, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 3.0.11 on 2026-10-18 15:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks', '0021_projecttaskcounter_lock_order'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_created_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_project_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_status_type_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_type_created_idx',
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='creator',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='creator_tasks', to=settings.AUTH_USER_MODEL, verbose_name='Creator of task'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'date_created', 'id'], name='task_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'type', 'date_created'], name='task_project_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['creator', 'status', 'date_created'], name='task_creator_status_idx'),
+        ),
+    ]
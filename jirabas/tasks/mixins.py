@@ -0,0 +1,124 @@
+from hashlib import md5
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
+
+from jirabas.tasks.permissions import IsProjectMember, get_project_roles
+
+
+class ConditionalGetMixin:
+    """ETag / Last-Modified for ``list`` and ``retrieve`` of a ModelViewSet.
+
+    Validators are derived from ``date_modified`` (maintained on every write,
+    see migration tasks.0017): a list page is described by the ids and
+    date_modified of its rows, an object by its own date_modified. Plain
+    requests take them from the rows they return; when If-None-Match /
+    If-Modified-Since is sent, only those two columns of the page are read
+    and 304 is returned before anything is serialized. Lists must use
+    CursorPagination.
+
+    Lists carry only an ETag: a task deleted from or moved off a page does
+    not raise the latest date_modified of the rows left on it, so
+    Last-Modified could not tell that the page changed.
+    """
+
+    VALIDATOR_FIELDS = ("id", "date_modified")
+
+    def _conditional_response(self, request, fingerprint, last_modified):
+        # The same data looks different under other query parameters
+        # (filters, cursor) or for another user (scoped querysets)
+        key = f"{request.get_full_path()}:{request.user.pk}:{fingerprint}"
+        etag = f'"{md5(key.encode()).hexdigest()}"'
+        timestamp = last_modified.timestamp() if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        return response, etag, timestamp
+
+    def _page_response(self, request, rows):
+        state = [
+            (
+                (row["id"], row["date_modified"])
+                if isinstance(row, dict)
+                else (row.pk, row.date_modified)
+            )
+            for row in rows
+        ]
+        return self._conditional_response(
+            request,
+            ",".join(f"{pk}:{date_modified}" for pk, date_modified in state),
+            None,
+        )
+
+    @staticmethod
+    def _set_validators(response, etag, timestamp):
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def filter_queryset(self, queryset):
+        # A list request that is revalidated but modified is filtered twice,
+        # and filters may query for their values (e.g. the project)
+        if self.action != "list":
+            return super().filter_queryset(queryset)
+        if not hasattr(self, "_filtered_queryset"):
+            self._filtered_queryset = super().filter_queryset(queryset)
+        return self._filtered_queryset.all()
+
+    def paginate_queryset(self, queryset):
+        self._page = super().paginate_queryset(queryset)
+        return self._page
+
+    def list(self, request, *args, **kwargs):
+        if request.META.keys() & {"HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE"}:
+            queryset = self.filter_queryset(self.get_queryset())
+            ordering = self.paginator.get_ordering(request, queryset, self)
+            fields = {field.lstrip("-") for field in ordering}
+            rows = self.paginate_queryset(
+                queryset.values(*self.VALIDATOR_FIELDS, *fields)
+            )
+            not_modified, etag, timestamp = self._page_response(request, rows)
+            if not_modified is not None:
+                return self._set_validators(not_modified, etag, timestamp)
+
+        response = super().list(request, *args, **kwargs)
+        _, etag, timestamp = self._page_response(request, self._page)
+        return self._set_validators(response, etag, timestamp)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        not_modified, etag, timestamp = self._conditional_response(
+            request,
+            f"{instance.pk}:{instance.date_modified}",
+            instance.date_modified,
+        )
+        if not_modified is not None:
+            return self._set_validators(not_modified, etag, timestamp)
+
+        response = Response(self.get_serializer(instance).data)
+        return self._set_validators(response, etag, timestamp)
+
+
+class ProjectScopedMixin:
+    """Limits a ModelViewSet to the projects the caller is a member of.
+
+    The queryset is filtered with ``<project_field>__in`` over the caller's
+    project map (see ``get_project_roles``), so no membership join is made.
+    """
+
+    project_field = "project_id"
+    permission_classes = (IsProjectMember,)
+
+    def get_queryset(self):
+        projects = get_project_roles(self.request)
+        return (
+            super()
+            .get_queryset()
+            .filter(**{f"{self.project_field}__in": list(projects)})
+        )
+
+    def check_project(self, project_id):
+        if project_id not in get_project_roles(self.request):
+            raise PermissionDenied(IsProjectMember.message)
@@ -1,16 +1,35 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connection
 from django.db.models import (
     CASCADE,
     CharField,
+    CheckConstraint,
+    DateField,
     DateTimeField,
+    F,
     FloatField,
     ForeignKey,
+    Index,
     IntegerField,
     Model,
+    PositiveIntegerField,
+    Q,
+    QuerySet,
     TextField,
+    UniqueConstraint,
 )
 from django.utils import timezone
 
-from jirabas.tasks.enums import PriorityTask, RelationType, StatusTask, TypeTask
+from jirabas.tasks.enums import (
+    OUTDATED_STATUSES,
+    ImportFormat,
+    ImportStage,
+    PriorityTask,
+    RelationType,
+    StatusTask,
+    TypeTask,
+)
 from jirabas.users.models import Role, User
 
 
@@ -22,10 +41,52 @@ class Project(Model):
         "Date start", blank=False, null=False, default=timezone.now
     )
     date_finish = DateTimeField("Date finish", blank=True, null=True)
+    # Also set by a database trigger on writes that bypass save() and on
+    # membership changes, see migration 0017
+    date_modified = DateTimeField("Modification date", auto_now=True, null=True)
+    task_counter = PositiveIntegerField(
+        "Number of allocated task numbers", default=0, editable=False
+    )
 
     def __str__(self):
         return "Project %s " % self.name
 
+    def allocate_task_numbers(self, count: int = 1) -> range:
+        """Reserve ``count`` consecutive task numbers in this project.
+
+        The counter is bumped with a single UPDATE ... RETURNING, so the row
+        lock taken by it serializes concurrent allocations until the
+        surrounding transaction ends and numbers are never handed out twice.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {self._meta.db_table} "
+                "SET task_counter = task_counter + %s "
+                "WHERE id = %s RETURNING task_counter",
+                [count, self.pk],
+            )
+            (self.task_counter,) = cursor.fetchone()
+
+        return range(self.task_counter - count, self.task_counter)
+
+
+class ProjectMembershipQuerySet(QuerySet):
+    def update(self, **kwargs):
+        # The cache module imports this one
+        from jirabas.tasks.cache import (
+            invalidate_member_projects,
+            invalidate_project_members,
+        )
+
+        # Caches are dropped on post_save, which update() does not send,
+        # e.g. changing the role of a member
+        rows = list(self.values_list("project_id", "member_id"))
+        updated = super().update(**kwargs)
+        for project_id in {project_id for project_id, _ in rows}:
+            invalidate_project_members(project_id)
+        invalidate_member_projects(*{member_id for _, member_id in rows})
+        return updated
+
 
 class ProjectMembership(Model):
     project = ForeignKey(
@@ -53,6 +114,8 @@ class ProjectMembership(Model):
         verbose_name="Role of member",
     )
 
+    objects = ProjectMembershipQuerySet.as_manager()
+
     class Meta:
         unique_together = ["project", "member"]
 
@@ -61,6 +124,9 @@ class ProjectMembership(Model):
 
 
 class Task(Model):
+    # Fields exposed by TaskShortSerializer
+    SHORT_FIELDS = ("id", "name", "type", "priority", "status")
+
     custom_number = CharField("Number of task", blank=False, max_length=20)
     name = CharField("Name of task", blank=False, max_length=255)
     description = TextField("Description", blank=True, max_length=5000)
@@ -77,8 +143,13 @@ class Task(Model):
     date_created = DateTimeField(
         "Creation date", blank=False, null=False, default=timezone.now
     )
-    date_modified = DateTimeField("Modification date", blank=True, null=True)
+    # Also set by a database trigger on writes that bypass save(), such as
+    # queryset update(), see migration 0017
+    date_modified = DateTimeField("Modification date", auto_now=True, null=True)
     deadline_date = DateTimeField("Deadline date", blank=True, null=True)
+    # Maintained by a database trigger from name, acceptance_criteria and
+    # description, see jirabas.tasks.search
+    search_vector = SearchVectorField(null=True, editable=False)
 
     creator = ForeignKey(
         User,
@@ -86,6 +157,7 @@ class Task(Model):
         on_delete=CASCADE,
         blank=False,
         null=False,
+        db_index=False,
         verbose_name="Creator of task",
     )
     project = ForeignKey(
@@ -94,6 +166,7 @@ class Task(Model):
         on_delete=CASCADE,
         blank=False,
         null=False,
+        db_index=False,
         verbose_name="Project",
     )
     performer = ForeignKey(
@@ -102,9 +175,109 @@ class Task(Model):
         on_delete=CASCADE,
         blank=True,
         null=True,
+        db_index=False,
         verbose_name="Performer of task",
     )
 
+    class Meta:
+        # Indexes follow TaskViewSet.filterset_fields combined with the
+        # pagination order. Task lists are always limited to the caller's
+        # projects, so the filter indexes lead with the project, except for
+        # performer and creator which narrow further on their own; project,
+        # performer and creator have no separate FK indexes.
+        constraints = [
+            UniqueConstraint(
+                fields=["project", "custom_number"],
+                name="task_project_custom_number_uniq",
+            ),
+        ]
+        indexes = [
+            # Keyset pagination order, see TaskCursorPagination
+            Index(
+                fields=["project", "date_created", "id"],
+                name="task_project_created_idx",
+            ),
+            # Also serves type alone: a project has only a few statuses to
+            # step over
+            Index(
+                fields=["project", "status", "type", "date_created"],
+                name="task_project_status_idx",
+            ),
+            Index(
+                fields=["performer", "status", "date_created"],
+                name="task_performer_status_idx",
+                condition=Q(performer__isnull=False),
+            ),
+            Index(
+                fields=["creator", "status", "date_created"],
+                name="task_creator_status_idx",
+            ),
+            # Only tasks that can still become overdue, see mark_overdue_tasks
+            Index(
+                fields=["deadline_date"],
+                name="task_overdue_deadline_idx",
+                condition=Q(status__in=OUTDATED_STATUSES),
+            ),
+            GinIndex(fields=["search_vector"], name="task_search_vector_idx"),
+            # Delta sync, see jirabas.tasks.sync
+            Index(
+                fields=["project", "date_modified", "id"],
+                name="task_project_modified_idx",
+            ),
+        ]
+
+
+class TaskTombstone(Model):
+    """A task that was deleted from (or moved out of) a project.
+
+    Written by database triggers on tasks_task for delta sync and purged
+    after SYNC_TOMBSTONE_RETENTION, see jirabas.tasks.sync. The ids are
+    plain integers: the task is gone and the project may be deleted too.
+    """
+
+    task_id = IntegerField("Deleted task")
+    project_id = IntegerField("Project")
+    date_deleted = DateTimeField(
+        "Deletion date", blank=False, null=False, default=timezone.now
+    )
+
+    class Meta:
+        indexes = [
+            Index(
+                fields=["project_id", "date_deleted", "id"],
+                name="tasktombstone_project_idx",
+            ),
+            Index(fields=["date_deleted"], name="tasktombstone_deleted_idx"),
+        ]
+
+
+class ProjectTaskCounter(Model):
+    """Number of tasks of a project with a given status and type.
+
+    Maintained by database triggers on every write to Task, see
+    jirabas.tasks.counters.
+    """
+
+    status = CharField(max_length=2, choices=StatusTask.choices)
+    type = CharField(max_length=3, choices=TypeTask.choices)
+    count = IntegerField(default=0)
+    project = ForeignKey(
+        Project,
+        related_name="task_counters",
+        on_delete=CASCADE,
+        blank=False,
+        null=False,
+        db_index=False,
+        verbose_name="Project",
+    )
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["project", "status", "type"], name="projecttaskcounter_uniq"
+            ),
+        ]
+
 
 class TasksRelation(Model):
     PAIRS = (
@@ -113,6 +286,8 @@ class TasksRelation(Model):
         (RelationType.HAS_TEST_CASE, RelationType.COVERS_REQUIREMENT),
         (RelationType.RELATES, RelationType.RELATES),
     )
+    # Relation type as seen from the other end of the link
+    INVERSE_TYPES = {**dict(PAIRS), **{right: left for left, right in PAIRS}}
 
     from_task = ForeignKey(
         Task,
@@ -120,6 +295,7 @@ class TasksRelation(Model):
         on_delete=CASCADE,
         blank=False,
         null=False,
+        db_index=False,
     )
 
     to_task = ForeignKey(
@@ -132,6 +308,17 @@ class TasksRelation(Model):
 
     relation_type = IntegerField(choices=RelationType.choices)
 
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["from_task", "to_task", "relation_type"],
+                name="tasksrelation_unique_link",
+            ),
+            CheckConstraint(
+                check=~Q(from_task=F("to_task")), name="tasksrelation_no_self_link"
+            ),
+        ]
+
 
 class Comment(Model):
     text = TextField("Text of comment", blank=False, max_length=1000)
@@ -152,9 +339,18 @@ class Comment(Model):
         on_delete=CASCADE,
         blank=False,
         null=False,
+        db_index=False,
         verbose_name="Task",
     )
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of a task's comments, see CommentCursorPagination
+            Index(
+                fields=["task", "date_create", "id"], name="comment_task_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return "Comment to task %s text: %s, creator %s" % (
             self.task.custom_number,
@@ -193,3 +389,116 @@ class LogTimeTask(Model):
             self.task.custom_number,
             self.user,
         )
+
+
+class LoggedTimeRollup(Model):
+    """Hours logged per task, user and day (in settings.TIME_ZONE).
+
+    Maintained by a database trigger on every insert, update and delete of
+    LogTimeTask, see jirabas.tasks.timesheet.
+    """
+
+    date = DateField("Day")
+    hours = FloatField(default=0.0)
+    # Number of LogTimeTask rows summed up, the row is dropped at zero
+    entries = PositiveIntegerField(default=0)
+    user = ForeignKey(
+        User,
+        related_name="time_rollups",
+        on_delete=CASCADE,
+        blank=False,
+        null=False,
+        db_index=False,
+        verbose_name="Performer",
+    )
+    task = ForeignKey(
+        Task,
+        related_name="time_rollups",
+        on_delete=CASCADE,
+        blank=False,
+        null=False,
+        db_index=False,
+        verbose_name="Task",
+    )
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["task", "user", "date"], name="loggedtimerollup_uniq"
+            ),
+        ]
+        indexes = [
+            Index(fields=["user", "date"], name="loggedtimerollup_user_idx"),
+        ]
+
+
+class ImportJob(Model):
+    """Progress of a Jira export import, see jirabas.tasks.importer."""
+
+    source = CharField("Path to the export file", blank=False, max_length=1000)
+    format = CharField(max_length=3, choices=ImportFormat.choices)
+    stage = CharField(
+        max_length=10, choices=ImportStage.choices, default=ImportStage.TASKS
+    )
+    # Issues of the file already handled in the current stage
+    position = PositiveIntegerField("Processed issues", default=0)
+    skipped_links = PositiveIntegerField(
+        "Blocking links skipped as they close a cycle", default=0
+    )
+    date_created = DateTimeField(
+        "Creation date", blank=False, null=False, default=timezone.now
+    )
+    date_modified = DateTimeField("Modification date", blank=True, null=True)
+
+    project = ForeignKey(
+        Project,
+        related_name="imports",
+        on_delete=CASCADE,
+        blank=False,
+        null=False,
+        verbose_name="Project",
+    )
+    user = ForeignKey(
+        User,
+        related_name="imports",
+        on_delete=CASCADE,
+        blank=False,
+        null=False,
+        verbose_name="Started by",
+    )
+
+    def __str__(self):
+        return "Import %s into %s: %s, %s issues" % (
+            self.source,
+            self.project_id,
+            self.stage,
+            self.position,
+        )
+
+
+class ImportedIssue(Model):
+    """Maps the key of an imported Jira issue to the created task."""
+
+    key = CharField("Issue key", blank=False, max_length=255)
+    job = ForeignKey(
+        ImportJob,
+        related_name="issues",
+        on_delete=CASCADE,
+        blank=False,
+        null=False,
+        db_index=False,
+        verbose_name="Import",
+    )
+    task = ForeignKey(
+        Task,
+        related_name="+",
+        on_delete=CASCADE,
+        blank=False,
+        null=False,
+        verbose_name="Task",
+    )
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=["job", "key"], name="importedissue_job_key_uniq")
+        ]
@@ -0,0 +1,149 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    Cursor,
+    CursorPagination,
+    LimitOffsetPagination,
+    _reverse_ordering,
+)
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Cursor pagination positioned on every column of ``ordering``.
+
+    CursorPagination keeps only the first ordering column in the cursor and
+    steps over rows sharing its value with an offset, so a long run of ties
+    (tasks imported at once share date_created) turns into ever growing
+    OFFSET scans. Here the cursor holds the values of all the columns for
+    the row the page starts after, and the page is read with a row
+    comparison such as ``(date_created, id) < (%s, %s)``, which an index on
+    the same columns serves directly. The columns must all be ascending or
+    all descending and the last one unique.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        queryset = queryset.order_by(
+            *(_reverse_ordering(self.ordering) if reverse else self.ordering)
+        )
+        if self.cursor is not None:
+            queryset = queryset.filter(self._after(queryset.model, reverse))
+
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_following = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            # Paging back: the page we came from follows this one
+            self.has_next, self.has_previous = True, has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def _after(self, model, reverse):
+        """Rows past the cursor position in the direction of travel."""
+        fields = [model._meta.get_field(name.lstrip("-")) for name in self.ordering]
+        try:
+            values = json.loads(self.cursor.position)
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError(values)
+            values = [field.to_python(value) for field, value in zip(fields, values)]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        quote = connection.ops.quote_name
+        columns = ", ".join(
+            f"{quote(model._meta.db_table)}.{quote(field.column)}" for field in fields
+        )
+        placeholders = ", ".join(["%s"] * len(values))
+        descending = self.ordering[0].startswith("-")
+        operator = ">" if descending == reverse else "<"
+        return RawSQL(
+            f"({columns}) {operator} ({placeholders})",
+            values,
+            output_field=BooleanField(),
+        )
+
+    def _position(self, row):
+        values = []
+        for name in self.ordering:
+            name = name.lstrip("-")
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return json.dumps(values)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        # An empty page backwards still leads to the page we came from
+        position = self._position(self.page[-1]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._position(self.page[0]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+
+class TaskCursorPagination(KeysetCursorPagination):
+    """Keyset pagination over the (project, date_created, id) index.
+
+    Pages are addressed by an opaque cursor instead of an offset and no
+    COUNT(*) is issued, so every page costs the same regardless of depth,
+    also within runs of tasks created at the same moment.
+    """
+
+    ordering = ("-date_created", "-id")
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class ProjectCursorPagination(CursorPagination):
+    ordering = "-id"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class UserCursorPagination(CursorPagination):
+    ordering = "username"
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class CommentCursorPagination(KeysetCursorPagination):
+    ordering = ("date_create", "id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class LogTimeCursorPagination(KeysetCursorPagination):
+    ordering = ("-date_logged", "-id")
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class TaskSearchPagination(LimitOffsetPagination):
+    """Search results are ordered by rank, which has no stable keyset, so
+    they are paged by offset; the match is served by the GIN index."""
+
+    default_limit = 20
+    max_limit = 100
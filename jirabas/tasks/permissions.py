@@ -0,0 +1,26 @@
+from operator import attrgetter
+
+from rest_framework.permissions import IsAuthenticated
+
+from jirabas.tasks.cache import get_member_projects
+
+
+def get_project_roles(request) -> dict:
+    """``{project_id: role_id}`` of the caller, loaded once per request."""
+    if not hasattr(request, "_project_roles"):
+        request._project_roles = get_member_projects(request.user.pk)
+    return request._project_roles
+
+
+class IsProjectMember(IsAuthenticated):
+    """Allows access to objects of the projects the caller is a member of.
+
+    The project of an object is found through the ``project_field`` of the
+    view, see ProjectScopedMixin.
+    """
+
+    message = "Вы не участник этого проекта"
+
+    def has_object_permission(self, request, view, obj):
+        project_id = attrgetter(view.project_field.replace("__", "."))(obj)
+        return project_id in get_project_roles(request)
@@ -0,0 +1,43 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Func, TextField, Value
+from django.db.models.functions import Concat
+
+# Text search configuration of the search_vector trigger (migration 0013).
+# It stems Russian words and, through english_stem, Latin ones.
+SEARCH_CONFIG = "russian"
+
+HEADLINE_OPTIONS = "StartSel=<b>, StopSel=</b>, MaxFragments=2"
+
+
+class Headline(Func):
+    """ts_headline(config, document, query, options); SearchHeadline only
+    appears in Django 3.1."""
+
+    function = "ts_headline"
+    output_field = TextField()
+
+    def __init__(self, expression, query, options=HEADLINE_OPTIONS):
+        super().__init__(
+            Value(SEARCH_CONFIG),
+            expression,
+            query,
+            Value(options),
+        )
+
+
+def search_tasks(queryset, text: str):
+    """Match ``text`` against the tasks' search_vector (GIN index), best
+    matches first, with highlighted fragments of the name and the text."""
+    query = SearchQuery(text, config=SEARCH_CONFIG)
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(
+            rank=SearchRank(F("search_vector"), query),
+            name_headline=Headline(F("name"), query),
+            headline=Headline(
+                Concat(F("description"), Value("\n"), F("acceptance_criteria")),
+                query,
+            ),
+        )
+        .order_by("-rank", "-id")
+    )
@@ -1,9 +1,23 @@
+from django.db.models import DateTimeField, Q
 from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer, Serializer
 
 from jirabas.tasks.enums import PriorityTask, RelationType, StatusTask, TypeTask
-from jirabas.tasks.models import Project, ProjectMembership, Task
+from jirabas.tasks.export import EXPORT_INCLUDES
+from jirabas.tasks.graph import BLOCKING_TYPES, creates_blocking_cycle, lock_task_links
+from jirabas.tasks.models import (
+    Comment,
+    LogTimeTask,
+    Project,
+    ProjectMembership,
+    Task,
+    TasksRelation,
+)
+from jirabas.tasks.sync import SYNC_PAGE_SIZE, InvalidCursor, decode_cursor
 from jirabas.users.models import Role, User
+from jirabas.users.serializers import UserShortInfoSerializer
+
+BULK_MAX_ITEMS = 5000
 
 
 class ProjectSerializer(ModelSerializer):
@@ -33,15 +47,36 @@ class ProjectRoleSerializer(ProjectUserSerializer):
     )
 
 
+class TaskCounterSerializer(Serializer):
+    status = serializers.ChoiceField(choices=StatusTask.choices)
+    type = serializers.ChoiceField(choices=TypeTask.choices)
+    count = serializers.IntegerField()
+
+
+class ProjectStatsSerializer(Serializer):
+    total = serializers.IntegerField()
+    by_status = serializers.DictField(child=serializers.IntegerField())
+    by_type = serializers.DictField(child=serializers.IntegerField())
+    counters = serializers.ListField(child=TaskCounterSerializer())
+
+
 class TaskSerializer(ModelSerializer):
+    """``fields`` limits the output to the given field names (?fields=)."""
+
     class Meta:
         model = Task
-        fields = "__all__"
+        exclude = ("search_vector",)
         read_only_fields = ("creator", "date_created", "custom_number")
 
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     def create(self, validated_data):
         project = validated_data["project"]
-        number = project.tasks.all().count()
+        number = project.allocate_task_numbers()[0]
 
         validated_data["creator"] = self.context["request"].user
         validated_data["custom_number"] = f"{project.short_name}-{number}"
@@ -49,11 +84,214 @@ class TaskSerializer(ModelSerializer):
 
         return task
 
+    def update(self, instance, validated_data):
+        project = validated_data.get("project")
+        if project is not None and project.pk != instance.project_id:
+            # Numbers are unique per project, see task_project_custom_number_uniq
+            number = project.allocate_task_numbers()[0]
+            validated_data["custom_number"] = f"{project.short_name}-{number}"
+        return super().update(instance, validated_data)
+
+
+# Output fields of TaskSerializer, in its order
+TASK_FIELDS = tuple(
+    field.name
+    for field in Task._meta.concrete_fields
+    if field.name not in TaskSerializer.Meta.exclude
+)
+
+
+def parse_task_fields(value) -> tuple:
+    """Validate a ?fields= value, None when all fields are requested."""
+    if not value:
+        return None
+    fields = tuple(dict.fromkeys(name for name in value.split(",") if name))
+    unknown = set(fields) - set(TASK_FIELDS)
+    if unknown:
+        raise serializers.ValidationError(
+            {"fields": "Неизвестные поля: %s" % ", ".join(sorted(unknown))}
+        )
+    return fields
+
+
+class TaskValuesSerializer:
+    """Read-only counterpart of ``TaskSerializer(many=True)`` for rows
+    fetched with ``values(*TaskValuesSerializer.columns(fields))``.
+
+    Produces the same output, but converters are chosen once per field
+    instead of building and running serializer fields for every task.
+    """
+
+    def __init__(self, rows, fields=None):
+        self.rows = rows
+        self.fields = fields or TASK_FIELDS
+
+    @staticmethod
+    def columns(fields=None) -> list:
+        return [Task._meta.get_field(name).attname for name in fields or TASK_FIELDS]
+
+    @staticmethod
+    def _converter(name):
+        if isinstance(Task._meta.get_field(name), DateTimeField):
+            to_representation = serializers.DateTimeField().to_representation
+            return lambda value: None if value is None else to_representation(value)
+        return None
+
+    @property
+    def data(self) -> list:
+        fields = [
+            (name, Task._meta.get_field(name).attname, self._converter(name))
+            for name in self.fields
+        ]
+        return [
+            {
+                name: row[column] if convert is None else convert(row[column])
+                for name, column, convert in fields
+            }
+            for row in self.rows
+        ]
+
+
+class TaskSearchQuerySerializer(Serializer):
+    q = serializers.CharField(max_length=255)
+
+
+class TaskSearchResultSerializer(ModelSerializer):
+    rank = serializers.FloatField()
+    name_headline = serializers.CharField()
+    headline = serializers.CharField()
+
+    class Meta:
+        model = Task
+        fields = Task.SHORT_FIELDS + (
+            "custom_number",
+            "project",
+            "rank",
+            "name_headline",
+            "headline",
+        )
+
+
+class TaskChangesQuerySerializer(Serializer):
+    since = serializers.CharField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=SYNC_PAGE_SIZE * 2, default=SYNC_PAGE_SIZE
+    )
+
+    def validate_since(self, value):
+        try:
+            decode_cursor(value)
+        except InvalidCursor:
+            raise serializers.ValidationError("Некорректный курсор")
+        return value
+
+
+class TaskBulkItemSerializer(TaskSerializer):
+    """Validates the items of a bulk request one batch at a time.
+
+    Projects and performers referenced by the batch are looked up once and
+    passed in ``context["projects"]`` / ``context["users"]`` (``in_bulk``
+    maps), so validating an item does not query the database.
+    """
+
+    project = serializers.IntegerField()
+    performer = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate_project(self, value):
+        try:
+            return self.context["projects"][value]
+        except KeyError:
+            raise serializers.ValidationError("Проект не найден")
+
+    def validate_performer(self, value):
+        if value is None:
+            return None
+        try:
+            return self.context["users"][value]
+        except KeyError:
+            raise serializers.ValidationError("Пользователь не найден")
+
+
+class TaskBulkSerializer(Serializer):
+    create = serializers.ListField(
+        child=serializers.DictField(), required=False, max_length=BULK_MAX_ITEMS
+    )
+    update = serializers.ListField(
+        child=serializers.DictField(), required=False, max_length=BULK_MAX_ITEMS
+    )
+    delete = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=BULK_MAX_ITEMS
+    )
+
+
+class ProjectExportQuerySerializer(Serializer):
+    output = serializers.ChoiceField(choices=["ndjson", "csv"], default="ndjson")
+    include = serializers.CharField(required=False, default="")
+
+    def validate_include(self, value):
+        include = [name for name in value.split(",") if name]
+        unknown = set(include) - set(EXPORT_INCLUDES)
+        if unknown:
+            raise serializers.ValidationError(
+                "Неизвестные разделы: %s" % ", ".join(sorted(unknown))
+            )
+        return include
+
+    def validate(self, attrs):
+        if attrs["output"] == "csv" and attrs["include"]:
+            raise serializers.ValidationError(
+                {"include": "Доступно только для формата ndjson"}
+            )
+        return attrs
+
 
 class ConnectTasksSerializer(serializers.Serializer):
+    """Expects the task being linked from in ``context["from_task"]`` and the
+    caller's project ids in ``context["project_ids"]``; tasks of other
+    projects are reported as not found.
+
+    Validate and save the link in one transaction: validation of a blocking
+    link takes the lock_task_links lock that keeps the cycle check true until
+    the insert.
+    """
+
     to_task = serializers.PrimaryKeyRelatedField(queryset=Task.objects.all())
     relation_type = serializers.ChoiceField(choices=RelationType.choices)
 
+    def get_fields(self):
+        fields = super().get_fields()
+        fields["to_task"].queryset = Task.objects.filter(
+            project_id__in=self.context["project_ids"]
+        )
+        return fields
+
+    def validate(self, attrs):
+        from_task = self.context["from_task"]
+        to_task = attrs["to_task"]
+        relation_type = attrs["relation_type"]
+
+        if from_task.pk == to_task.pk:
+            raise serializers.ValidationError("Задачу нельзя связать саму с собой")
+
+        if relation_type in BLOCKING_TYPES:
+            lock_task_links()
+        # The same link may be stored from either end
+        duplicate = TasksRelation.objects.filter(
+            Q(from_task=from_task, to_task=to_task, relation_type=relation_type)
+            | Q(
+                from_task=to_task,
+                to_task=from_task,
+                relation_type=TasksRelation.INVERSE_TYPES[relation_type],
+            )
+        )
+        if duplicate.exists():
+            raise serializers.ValidationError("Задачи уже связаны")
+
+        if creates_blocking_cycle(from_task, to_task, relation_type):
+            raise serializers.ValidationError("Связь создает цикл блокирующих задач")
+
+        return attrs
+
 
 class TaskShortSerializer(serializers.Serializer):
     id = serializers.IntegerField(read_only=True)
@@ -72,10 +310,110 @@ class TasksRelationCategoriesSerializer(serializers.Serializer):
     relations = serializers.ListField(child=TasksRelationCategorySerializer())
 
 
+class DependencyGraphQuerySerializer(serializers.Serializer):
+    depth = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class DependencyGraphNodeSerializer(TaskShortSerializer):
+    depth = serializers.IntegerField(read_only=True)
+
+
+class DependencyGraphEdgeSerializer(serializers.Serializer):
+    blocker = serializers.IntegerField(read_only=True)
+    blocked = serializers.IntegerField(read_only=True)
+
+
+class DependencyGraphSerializer(serializers.Serializer):
+    nodes = serializers.ListField(child=DependencyGraphNodeSerializer())
+    edges = serializers.ListField(child=DependencyGraphEdgeSerializer())
+
+
+class CommentSerializer(ModelSerializer):
+    """The task is taken from the URL and the author from the request."""
+
+    user = UserShortInfoSerializer(read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = ("id", "text", "date_create", "user", "task")
+        read_only_fields = ("date_create", "task")
+
+
 class LogTimeTaskSerializer(ModelSerializer):
-    user = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.all(), required=True
-    )
+    """The user is taken from the request."""
+
     task = serializers.PrimaryKeyRelatedField(
         queryset=Task.objects.all(), required=True
     )
+
+    class Meta:
+        model = LogTimeTask
+        fields = "__all__"
+        read_only_fields = ("user",)
+        extra_kwargs = {"hours": {"min_value": 0}}
+
+
+class TimesheetQuerySerializer(Serializer):
+    """Expects the requesting user in ``context["user"]``."""
+
+    MAX_DAYS = 366
+
+    user = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(), required=False
+    )
+    project = serializers.IntegerField(required=False)
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+
+    def validate(self, attrs):
+        attrs.setdefault("user", self.context["user"])
+        days = (attrs["date_to"] - attrs["date_from"]).days
+        if days < 0:
+            raise serializers.ValidationError(
+                {"date_to": "Дата окончания раньше даты начала"}
+            )
+        if days >= self.MAX_DAYS:
+            raise serializers.ValidationError(
+                {"date_to": f"Период не может быть больше {self.MAX_DAYS} дней"}
+            )
+        return attrs
+
+
+class TimesheetTaskSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    custom_number = serializers.CharField()
+    name = serializers.CharField()
+    hours = serializers.FloatField()
+
+
+class TimesheetDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    hours = serializers.FloatField()
+    tasks = serializers.ListField(child=TimesheetTaskSerializer())
+
+
+class TimesheetSerializer(serializers.Serializer):
+    user = serializers.IntegerField()
+    hours = serializers.FloatField()
+    days = serializers.ListField(child=TimesheetDaySerializer())
+
+
+class TaskTimeSpentSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    custom_number = serializers.CharField()
+    name = serializers.CharField()
+    estimate_hours = serializers.IntegerField(allow_null=True)
+    spent_hours = serializers.FloatField()
+
+
+class UserTimeSpentSerializer(serializers.Serializer):
+    user = serializers.IntegerField()
+    hours = serializers.FloatField()
+
+
+class TimeSpentSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    estimate_hours = serializers.IntegerField(allow_null=True)
+    spent_hours = serializers.FloatField()
+    remaining_hours = serializers.FloatField(allow_null=True)
+    users = serializers.ListField(child=UserTimeSpentSerializer())
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from jirabas.tasks.cache import invalidate_member_projects, invalidate_project_members
+from jirabas.tasks.models import ProjectMembership
+
+
+@receiver(post_save, sender=ProjectMembership)
+@receiver(post_delete, sender=ProjectMembership)
+def drop_cached_membership(sender, instance, **kwargs):
+    # Also sent for memberships deleted along with their project, member
+    # or role
+    invalidate_project_members(instance.project_id)
+    invalidate_member_projects(instance.member_id)
@@ -0,0 +1,155 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+from hashlib import md5
+
+from django.db import connection
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from jirabas.tasks.cache import get_member_projects
+from jirabas.tasks.models import Task, TaskTombstone
+
+SYNC_PAGE_SIZE = 500
+# A transaction commits some time after it stamped date_modified, so rows
+# may become visible behind a position already handed out. Once the client
+# has caught up, its cursor is set back to the start of the oldest
+# transaction still writing, and SYNC_OVERLAP before that for clock
+# differences between the application servers and the database. The next
+# poll returns the changes of that window again; clients apply them
+# idempotently.
+SYNC_OVERLAP = timedelta(seconds=5)
+SYNC_TOMBSTONE_RETENTION = timedelta(days=30)
+
+# Start of the oldest other transaction of this database that has written
+# (holds an xid); only committed rows are stamped later than it
+OLDEST_WRITE_SQL = """
+SELECT min(xact_start) FROM pg_stat_activity
+WHERE datname = current_database()
+    AND backend_xid IS NOT NULL
+    AND pid <> pg_backend_pid()
+"""
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class ExpiredCursor(ValueError):
+    """Tombstones behind the cursor may be purged, or the user joined or
+    left projects since; a full sync is needed."""
+
+
+def encode_cursor(position: dict, projects: str = "") -> str:
+    data = {key: [date.isoformat(), pk] for key, (date, pk) in position.items()}
+    data["projects"] = projects
+    return urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Return the position and the projects fingerprint of ``cursor``."""
+    try:
+        data = json.loads(urlsafe_b64decode(cursor.encode()))
+        position = {
+            key: (parse_datetime(data[key][0]), int(data[key][1]))
+            for key in ("tasks", "deleted")
+        }
+        projects = str(data.get("projects", ""))
+    except (ValueError, TypeError, KeyError, IndexError):
+        raise InvalidCursor(cursor)
+    if any(date is None for date, _ in position.values()):
+        raise InvalidCursor(cursor)
+    return position, projects
+
+
+def _fingerprint(project_ids) -> str:
+    return md5(",".join(map(str, sorted(project_ids))).encode()).hexdigest()
+
+
+def _horizon(now):
+    """Position a caught-up cursor can safely be moved to."""
+    with connection.cursor() as cursor:
+        cursor.execute(OLDEST_WRITE_SQL)
+        ((oldest,),) = cursor.fetchall()
+    return (min(oldest or now, now) - SYNC_OVERLAP, 0)
+
+
+def _after(queryset, field, position):
+    # (field, id) > position; the >= bound alone is usable by the index
+    date, pk = position
+    return queryset.filter(
+        Q(**{f"{field}__gt": date}) | Q(id__gt=pk), **{f"{field}__gte": date}
+    ).order_by(field, "id")
+
+
+def _read(queryset, field, position, limit):
+    """Rows after ``position``, with the exact position of the next page or
+    None when the reader has caught up."""
+    rows = list(_after(queryset, field, position)[: limit + 1])
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, (getattr(rows[-1], field), rows[-1].pk)
+    return rows, None
+
+
+def get_changes(user, cursor=None, limit=SYNC_PAGE_SIZE) -> dict:
+    """Tasks created, modified or removed in the user's projects since
+    ``cursor`` (everything when it is omitted), with the cursor to pass next.
+
+    Reads go through the (project, date_modified, id) index of tasks and the
+    (project_id, date_deleted, id) index of tombstones, so a poll costs in
+    proportion to the number of changes. The cursor is bound to the user's
+    set of projects: once it changes, tasks of joined projects would be
+    missed and tasks of left ones never removed, so ExpiredCursor is raised.
+    """
+    now = timezone.now()
+    project_ids = list(get_member_projects(user.pk))
+    projects = _fingerprint(project_ids)
+    horizon = None
+    if cursor is None:
+        horizon = _horizon(now)
+        position = {"tasks": (EPOCH, 0), "deleted": horizon}
+    else:
+        position, cursor_projects = decode_cursor(cursor)
+        expired = position["deleted"][0] < now - SYNC_TOMBSTONE_RETENTION
+        if expired or cursor_projects != projects:
+            raise ExpiredCursor(cursor)
+
+    visible = Task.objects.filter(project_id__in=project_ids)
+    tasks, tasks_next = _read(
+        visible,
+        "date_modified",
+        position["tasks"],
+        limit,
+    )
+    tombstones, deleted_next = _read(
+        # A task moved between two of the user's projects leaves a tombstone
+        # under the old one; it is still visible and must not be deleted
+        TaskTombstone.objects.filter(project_id__in=project_ids).filter(
+            ~Exists(visible.filter(pk=OuterRef("task_id")))
+        ),
+        "date_deleted",
+        position["deleted"],
+        limit,
+    )
+    if horizon is None and (tasks_next is None or deleted_next is None):
+        horizon = _horizon(now)
+    position["tasks"] = tasks_next or horizon
+    position["deleted"] = deleted_next or horizon
+
+    return {
+        "changed": tasks,
+        "deleted": [tombstone.task_id for tombstone in tombstones],
+        "cursor": encode_cursor(position, projects),
+        "has_more": tasks_next is not None or deleted_next is not None,
+    }
+
+
+def purge_tombstones() -> int:
+    deleted, _ = TaskTombstone.objects.filter(
+        date_deleted__lt=timezone.now() - SYNC_TOMBSTONE_RETENTION
+    ).delete()
+    return deleted
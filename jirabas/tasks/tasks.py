@@ -0,0 +1,82 @@
+from celery.exceptions import SoftTimeLimitExceeded
+from django.db import transaction
+from django.utils import timezone
+
+from config import celery_app
+from jirabas.tasks.enums import OUTDATED_STATUSES, StatusTask
+from jirabas.tasks.importer import IMPORT_BATCH_SIZE, run_import
+from jirabas.tasks.models import ImportJob, Task
+from jirabas.tasks.sync import purge_tombstones
+
+OVERDUE_CHUNK_SIZE = 1000
+
+
+@celery_app.task()
+def mark_overdue_tasks(chunk_size=OVERDUE_CHUNK_SIZE):
+    """Move tasks whose deadline has passed to the IS_DELAYED status.
+
+    Already delayed tasks are not touched, so each run only walks the tasks
+    that expired since the previous one (via the partial deadline index).
+    Rows are locked and updated in chunks to keep transactions short; rows
+    locked by concurrent requests are skipped and picked up next run.
+    Project task counters follow each update through the tasks_task
+    triggers, in the same transaction.
+    """
+    now = timezone.now()
+    updated = 0
+
+    while True:
+        with transaction.atomic():
+            ids = list(
+                Task.objects.filter(
+                    deadline_date__lte=now, status__in=OUTDATED_STATUSES
+                )
+                .order_by("deadline_date")
+                .select_for_update(skip_locked=True)
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+
+            updated += Task.objects.filter(id__in=ids).update(
+                status=StatusTask.IS_DELAYED
+            )
+
+    return updated
+
+
+@celery_app.task()
+def purge_task_tombstones():
+    """Drop tombstones older than SYNC_TOMBSTONE_RETENTION; sync cursors
+    that old are rejected anyway."""
+    return purge_tombstones()
+
+
+@celery_app.task(bind=True)
+def import_jira_export(self, job_id, batch_size=IMPORT_BATCH_SIZE):
+    """Run or resume an ImportJob, reporting progress as the PROGRESS state.
+
+    The export file must be readable by the worker. Imports outliving
+    CELERY_TASK_SOFT_TIME_LIMIT roll back the batch in flight and continue
+    in a new task from the last committed position.
+    """
+
+    def progress(job):
+        self.update_state(
+            state="PROGRESS", meta={"stage": job.stage, "position": job.position}
+        )
+
+    try:
+        job = run_import(
+            ImportJob.objects.select_related("project").get(pk=job_id),
+            batch_size=batch_size,
+            progress=progress,
+        )
+    except SoftTimeLimitExceeded:
+        result = import_jira_export.delay(job_id, batch_size)
+        return {"resumed_in": result.id}
+    return {
+        "stage": job.stage,
+        "position": job.position,
+        "skipped_links": job.skipped_links,
+    }
@@ -0,0 +1,25 @@
+from factory import Faker, Sequence, SubFactory
+from factory.django import DjangoModelFactory
+
+from jirabas.tasks.models import Project, Task
+from jirabas.users.tests.factories import UserFactory
+
+
+class ProjectFactory(DjangoModelFactory):
+
+    name = Faker("catch_phrase")
+    short_name = Sequence(lambda n: f"P{n % 1000}")
+
+    class Meta:
+        model = Project
+
+
+class TaskFactory(DjangoModelFactory):
+
+    custom_number = Sequence(lambda n: f"T-{n}")
+    name = Faker("sentence", nb_words=4)
+    creator = SubFactory(UserFactory)
+    project = SubFactory(ProjectFactory)
+
+    class Meta:
+        model = Task
@@ -0,0 +1,35 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+from jirabas.tasks.benchmarks import DataGenerator
+from jirabas.tasks.counters import reconcile_task_counters
+from jirabas.tasks.models import Comment, LogTimeTask, Project, Task, TasksRelation
+from jirabas.users.models import Role
+
+pytestmark = pytest.mark.django_db
+
+
+def test_seed_benchmark_data(capsys):
+    call_command("seed_benchmark_data", projects=4, tasks=20, users=15, seed=7)
+
+    out = capsys.readouterr().out
+    assert f"Created 4 projects, {Task.objects.count()} tasks" in out
+    assert f"{TasksRelation.objects.count()} relations" in out
+    assert f"{Comment.objects.count()} comments" in out
+    assert f"{LogTimeTask.objects.count()} time logs" in out
+    for project in Project.objects.all():
+        assert project.members.filter(role=Role.get_project_manager()).count() == 1
+        assert project.tasks.count() == project.task_counter
+    # Written through the counter triggers like any other task
+    assert reconcile_task_counters() == 0
+
+    with pytest.raises(CommandError):
+        call_command("seed_benchmark_data", users=15)
+
+
+def test_data_generator_is_deterministic():
+    def sample(generator):
+        return [generator.text(5), generator.date(), generator.rng.random()]
+
+    assert sample(DataGenerator(7)) == sample(DataGenerator(7))
+    assert sample(DataGenerator(7)) != sample(DataGenerator(8))
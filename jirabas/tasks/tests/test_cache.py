@@ -0,0 +1,96 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from jirabas.tasks.cache import get_cache_stats
+from jirabas.tasks.models import ProjectMembership
+from jirabas.tasks.tests.factories import ProjectFactory
+from jirabas.users.models import Role, User
+from jirabas.users.tests.factories import UserFactory
+
+
+@pytest.mark.django_db
+def test_project_members_cache(run_on_commit):
+    cache.clear()
+    pm, developer = UserFactory.create_batch(2)
+    project = ProjectFactory()
+    ProjectMembership.objects.create(
+        project=project, member=pm, role=Role.objects.get(name=Role.PROJECT_MANAGER)
+    )
+    client = APIClient()
+    client.force_authenticate(pm)
+
+    first = client.get(f"/api/projects/{project.pk}/info/").json()
+    second = client.get(f"/api/projects/{project.pk}/info/").json()
+    client.get(f"/api/projects/{project.pk}/users/")
+
+    assert first == second
+    assert first["pm"]["id"] == pm.pk
+    assert first["users"] == []
+    assert get_cache_stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+
+    client.post(
+        f"/api/projects/{project.pk}/add_user/",
+        {"user": developer.pk, "role": Role.objects.get(abbreviation="DEV").pk},
+    )
+    run_on_commit()
+    users = client.get(f"/api/projects/{project.pk}/users/").json()
+
+    assert {user["id"] for user in users} == {pm.pk, developer.pk}
+    assert get_cache_stats()["misses"] == 2
+
+    # Only ids are cached: user edits show up without an invalidation
+    User.objects.filter(pk=pm.pk).update(name="Renamed")
+    info = client.get(f"/api/projects/{project.pk}/info/").json()
+    assert info["pm"]["name"] == "Renamed"
+    assert get_cache_stats()["misses"] == 2
+
+
+@pytest.mark.django_db
+def test_project_info_without_manager(run_on_commit):
+    developer = UserFactory()
+    project = ProjectFactory()
+    ProjectMembership.objects.create(
+        project=project, member=developer, role=Role.objects.get(abbreviation="DEV")
+    )
+    client = APIClient()
+    client.force_authenticate(developer)
+
+    info = client.get(f"/api/projects/{project.pk}/info/").json()
+
+    assert info["pm"] is None
+    assert [user["id"] for user in info["users"]] == [developer.pk]
+
+
+@pytest.mark.django_db
+def test_member_projects_follow_membership(run_on_commit):
+    pm, developer = UserFactory.create_batch(2)
+    pm_client, developer_client = APIClient(), APIClient()
+    pm_client.force_authenticate(pm)
+    developer_client.force_authenticate(developer)
+
+    response = pm_client.post("/api/projects/", {"name": "Jirabas", "short_name": "JB"})
+    run_on_commit()
+    project_id = response.json()["id"]
+    assert pm_client.get(f"/api/projects/{project_id}/").status_code == 200
+    assert developer_client.get(f"/api/projects/{project_id}/").status_code == 404
+
+    pm_client.post(
+        f"/api/projects/{project_id}/add_user/",
+        {"user": developer.pk, "role": Role.objects.get(abbreviation="DEV").pk},
+    )
+    run_on_commit()
+    response = developer_client.get("/api/users/project_role/", {"project": project_id})
+    assert response.json()["role"] == "Разработчик"
+
+    pm_client.post(
+        f"/api/projects/{project_id}/change_role/",
+        {"user": developer.pk, "role": Role.get_project_manager().pk},
+    )
+    run_on_commit()
+    response = developer_client.get("/api/users/project_role/", {"project": project_id})
+    assert response.json()["role"] == Role.PROJECT_MANAGER
+
+    pm_client.post(f"/api/projects/{project_id}/remove_user/", {"user": developer.pk})
+    run_on_commit()
+    assert developer_client.get(f"/api/projects/{project_id}/").status_code == 404
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from jirabas.tasks.enums import StatusTask, TypeTask
+from jirabas.tasks.models import ProjectMembership, ProjectTaskCounter, Task
+from jirabas.tasks.tasks import mark_overdue_tasks
+from jirabas.tasks.tests.factories import ProjectFactory, TaskFactory
+from jirabas.users.models import Role, User
+
+pytestmark = pytest.mark.django_db
+
+
+def _counters(project):
+    return {
+        (counter.status, counter.type): counter.count
+        for counter in ProjectTaskCounter.objects.filter(project=project, count__gt=0)
+    }
+
+
+def _actual(project):
+    return {
+        (task.status, task.type): Task.objects.filter(
+            project=project, status=task.status, type=task.type
+        ).count()
+        for task in Task.objects.filter(project=project)
+    }
+
+
+def test_counters_follow_task_writes():
+    project, other = ProjectFactory.create_batch(2)
+    bug = TaskFactory(project=project, type=TypeTask.BUG)
+    TaskFactory.create_batch(3, project=project)
+    Task.objects.bulk_create(
+        [
+            Task(project=project, creator=bug.creator, custom_number=f"B-{n}")
+            for n in range(2)
+        ]
+    )
+    assert _counters(project) == {
+        (StatusTask.BACKLOG, TypeTask.BUG): 1,
+        (StatusTask.BACKLOG, TypeTask.WORK_ITEM): 5,
+    }
+
+    bug.status = StatusTask.IN_PROGRESS
+    bug.save()
+    Task.objects.filter(project=project, type=TypeTask.WORK_ITEM).exclude(
+        custom_number__startswith="B-"
+    ).update(status=StatusTask.DONE)
+    Task.objects.filter(custom_number="B-0").update(project=other)
+    Task.objects.filter(custom_number="B-1").delete()
+    assert (
+        _counters(project)
+        == _actual(project)
+        == {
+            (StatusTask.IN_PROGRESS, TypeTask.BUG): 1,
+            (StatusTask.DONE, TypeTask.WORK_ITEM): 3,
+        }
+    )
+    assert _counters(other) == {(StatusTask.BACKLOG, TypeTask.WORK_ITEM): 1}
+
+    TaskFactory.create_batch(
+        2, project=project, deadline_date=timezone.now() - timedelta(days=1)
+    )
+    mark_overdue_tasks()
+    assert _counters(project) == _actual(project)
+    assert _counters(project)[StatusTask.IS_DELAYED, TypeTask.WORK_ITEM] == 2
+
+    project.delete()
+    assert not ProjectTaskCounter.objects.filter(project_id=project.pk).exists()
+
+
+def test_reconcile_and_stats(user: User):
+    project = ProjectFactory()
+    ProjectMembership.objects.create(
+        project=project, member=user, role=Role.get_project_manager()
+    )
+    TaskFactory.create_batch(2, project=project)
+    TaskFactory(project=project, type=TypeTask.BUG, status=StatusTask.DONE)
+
+    ProjectTaskCounter.objects.filter(project=project, type=TypeTask.BUG).delete()
+    ProjectTaskCounter.objects.filter(project=project).update(count=7)
+    ProjectTaskCounter.objects.create(
+        project=project, status=StatusTask.REVIEW, type=TypeTask.TEST, count=1
+    )
+    other = TaskFactory().project
+    ProjectTaskCounter.objects.filter(project=other).update(count=0)
+
+    with CaptureQueriesContext(connection) as queries:
+        call_command("reconcile_task_counters", project=[project.pk, other.pk])
+    assert _counters(project) == _actual(project)
+    assert _counters(other) == _actual(other)
+    # Writes to tasks are blocked once for the run, not once per project
+    assert sum(q["sql"].startswith("LOCK TABLE") for q in queries) == 1
+
+    client = APIClient()
+    client.force_authenticate(user)
+    response = client.get(f"/api/projects/{project.pk}/stats/")
+    assert response.json() == {
+        "total": 3,
+        "by_status": {StatusTask.BACKLOG: 2, StatusTask.DONE: 1},
+        "by_type": {TypeTask.WORK_ITEM: 2, TypeTask.BUG: 1},
+        "counters": [
+            {"status": StatusTask.BACKLOG, "type": TypeTask.WORK_ITEM, "count": 2},
+            {"status": StatusTask.DONE, "type": TypeTask.BUG, "count": 1},
+        ],
+    }
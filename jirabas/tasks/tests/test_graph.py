@@ -0,0 +1,44 @@
+import pytest
+
+from jirabas.tasks.enums import RelationType
+from jirabas.tasks.graph import creates_blocking_cycle
+from jirabas.tasks.models import TasksRelation
+from jirabas.tasks.tests.factories import ProjectFactory, TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_creates_blocking_cycle():
+    project = ProjectFactory()
+    first, second, third, other = TaskFactory.create_batch(4, project=project)
+    # first blocks second, second blocks third, stored from both ends
+    TasksRelation.objects.bulk_create(
+        [
+            TasksRelation(
+                from_task=first, to_task=second, relation_type=RelationType.BLOCKS
+            ),
+            TasksRelation(
+                from_task=third,
+                to_task=second,
+                relation_type=RelationType.IS_BLOCKED_BY,
+            ),
+        ]
+    )
+
+    assert creates_blocking_cycle(third, first, RelationType.BLOCKS)
+    assert creates_blocking_cycle(first, third, RelationType.IS_BLOCKED_BY)
+    assert not creates_blocking_cycle(first, third, RelationType.BLOCKS)
+    assert not creates_blocking_cycle(third, other, RelationType.BLOCKS)
+    assert not creates_blocking_cycle(third, first, RelationType.RELATES)
+
+
+def test_long_blocking_cycle_is_found():
+    chain = TaskFactory.create_batch(150)
+    TasksRelation.objects.bulk_create(
+        TasksRelation(
+            from_task=blocker, to_task=blocked, relation_type=RelationType.BLOCKS
+        )
+        for blocker, blocked in zip(chain, chain[1:])
+    )
+
+    assert creates_blocking_cycle(chain[-1], chain[0], RelationType.BLOCKS)
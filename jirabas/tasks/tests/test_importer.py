@@ -0,0 +1,199 @@
+from types import SimpleNamespace
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+from django.core.management import call_command
+
+from jirabas.tasks.enums import (
+    ImportFormat,
+    ImportStage,
+    PriorityTask,
+    RelationType,
+    StatusTask,
+    TypeTask,
+)
+from jirabas.tasks.importer import run_import
+from jirabas.tasks.models import ImportJob, Task, TasksRelation
+from jirabas.tasks.tasks import import_jira_export
+from jirabas.tasks.tests.factories import ProjectFactory
+from jirabas.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+CSV_EXPORT = """\
+Summary,Issue key,Issue Type,Status,Priority,Description,Created,Assignee,Reporter,\
+Original Estimate,Comment,Comment,Log Work,Outward issue link (Blocks),\
+Outward issue link (Relates)
+Login page,JB-1,Story,In Progress,High,Form,12/Mar/21 10:15 AM,dev,pm,7200,\
+12/Mar/21 11:00 AM;dev;Started,13/Mar/21 9:00 AM;ghost;Any news?,\
+Layout;13/Mar/21 10:00 AM;dev;5400,JB-2,JB-3
+Broken button,JB-2,Bug,Closed,Lowest,,14/Mar/21 10:15 AM,,ghost,,,,,JB-1,
+Docs,JB-3,Epic,Whatever,Medium,,14/Mar/21 11:15 AM,,pm,,,,,JB-3,JB-1
+"""
+
+XML_EXPORT = """\
+<rss version="0.92"><channel><title>Jira</title>
+<item>
+  <key>JB-1</key><summary>Login page</summary><type>Story</type>
+  <status>To Do</status><priority>Medium</priority>
+  <created>Fri, 12 Mar 2021 10:15:00 +0000</created>
+  <assignee username="dev">Dev</assignee><reporter username="pm">PM</reporter>
+  <timeoriginalestimate seconds="3600">1 hour</timeoriginalestimate>
+  <comments>
+    <comment author="dev" created="Fri, 12 Mar 2021 11:00:00 +0000">Started</comment>
+  </comments>
+  <issuelinks>
+    <issuelinktype><name>Cloners</name>
+      <outwardlinks><issuelink><issuekey>JB-2</issuekey></issuelink></outwardlinks>
+    </issuelinktype>
+  </issuelinks>
+</item>
+<item>
+  <key>JB-2</key><summary>Login page copy</summary><type>Test</type>
+  <status>Done</status><priority>High</priority>
+  <reporter username="pm">PM</reporter>
+</item>
+</channel></rss>
+"""
+
+
+@pytest.fixture
+def users():
+    return UserFactory(username="pm"), UserFactory(username="dev")
+
+
+def _job(tmp_path, content, import_format, user):
+    source = tmp_path / f"export.{import_format}"
+    source.write_text(content)
+    return ImportJob.objects.create(
+        source=str(source),
+        format=import_format,
+        project=ProjectFactory(short_name="JB"),
+        user=user,
+    )
+
+
+def test_import_csv(tmp_path, users):
+    pm, dev = users
+    job = _job(tmp_path, CSV_EXPORT, ImportFormat.CSV, pm)
+
+    positions = []
+    run_import(job, batch_size=2, progress=lambda job: positions.append(job.position))
+
+    assert positions == [2, 3, 2, 3]
+    assert job.stage == ImportStage.DONE
+
+    tasks = {task.name: task for task in Task.objects.filter(project=job.project)}
+    assert sorted(task.custom_number for task in tasks.values()) == [
+        "JB-0",
+        "JB-1",
+        "JB-2",
+    ]
+
+    login = tasks["Login page"]
+    assert (login.type, login.status, login.priority) == (
+        TypeTask.REQUIREMENT,
+        StatusTask.IN_PROGRESS,
+        PriorityTask.HIGH,
+    )
+    assert (login.creator, login.performer, login.estimate_hours) == (pm, dev, 2)
+    assert login.date_created.day == 12
+    assert [(c.user, c.text) for c in login.comments.order_by("date_create")] == [
+        (dev, "Started"),
+        (pm, "Any news?"),
+    ]
+    (logged,) = login.logged_time.all()
+    assert (logged.user, logged.hours, logged.description) == (dev, 1.5, "Layout")
+
+    button = tasks["Broken button"]
+    assert (button.type, button.status, button.priority) == (
+        TypeTask.BUG,
+        StatusTask.DONE,
+        PriorityTask.LOW,
+    )
+    assert (button.creator, button.performer) == (pm, None)
+    assert (tasks["Docs"].type, tasks["Docs"].status) == (
+        TypeTask.WORK_ITEM,
+        StatusTask.BACKLOG,
+    )
+
+    # JB-2 blocking JB-1 back would close a cycle and is skipped; the
+    # self-link of JB-3 and the relates link listed by both ends are
+    # stored once
+    assert set(
+        TasksRelation.objects.values_list("from_task", "to_task", "relation_type")
+    ) == {
+        (login.pk, button.pk, RelationType.BLOCKS),
+        (login.pk, tasks["Docs"].pk, RelationType.RELATES),
+    }
+    job.refresh_from_db()
+    assert job.skipped_links == 1
+
+
+def test_import_xml(tmp_path, users):
+    pm, dev = users
+    job = _job(tmp_path, XML_EXPORT, ImportFormat.XML, pm)
+
+    run_import(job)
+
+    login = Task.objects.get(name="Login page")
+    copy = Task.objects.get(name="Login page copy")
+    assert (login.type, login.performer, login.estimate_hours) == (
+        TypeTask.REQUIREMENT,
+        dev,
+        1,
+    )
+    assert (copy.type, copy.status, copy.priority) == (
+        TypeTask.TEST,
+        StatusTask.DONE,
+        PriorityTask.HIGH,
+    )
+    assert list(login.comments.values_list("text", flat=True)) == ["Started"]
+    assert TasksRelation.objects.filter(
+        from_task=login, to_task=copy, relation_type=RelationType.CLONES
+    ).exists()
+
+
+def test_import_resumes_after_last_batch(tmp_path, users):
+    pm, _ = users
+    job = _job(tmp_path, CSV_EXPORT, ImportFormat.CSV, pm)
+
+    def interrupt(job):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        run_import(job, batch_size=2, progress=interrupt)
+    assert Task.objects.count() == 2
+
+    call_command("import_jira", resume=job.pk, batch_size=2)
+
+    job.refresh_from_db()
+    assert job.stage == ImportStage.DONE
+    assert sorted(Task.objects.values_list("name", flat=True)) == [
+        "Broken button",
+        "Docs",
+        "Login page",
+    ]
+    assert TasksRelation.objects.count() == 2
+
+
+def test_import_task_resumes_after_soft_time_limit(tmp_path, users, monkeypatch):
+    pm, _ = users
+    job = _job(tmp_path, CSV_EXPORT, ImportFormat.CSV, pm)
+    queued = []
+
+    def update_state(**kwargs):
+        # The limit strikes right after the first batch is committed
+        raise SoftTimeLimitExceeded()
+
+    def delay(*args):
+        queued.append(args)
+        return SimpleNamespace(id="next")
+
+    monkeypatch.setattr(import_jira_export, "update_state", update_state)
+    monkeypatch.setattr(import_jira_export, "delay", delay)
+
+    assert import_jira_export(job.pk, batch_size=2) == {"resumed_in": "next"}
+    assert queued == [(job.pk, 2)]
+    job.refresh_from_db()
+    assert (job.stage, job.position) == (ImportStage.TASKS, 2)
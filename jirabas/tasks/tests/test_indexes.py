@@ -0,0 +1,111 @@
+import random
+from datetime import timedelta
+from itertools import combinations
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from jirabas.tasks.enums import StatusTask, TypeTask
+from jirabas.tasks.models import ProjectMembership, Task
+from jirabas.tasks.pagination import TaskCursorPagination
+from jirabas.tasks.tests.factories import ProjectFactory
+from jirabas.tasks.tests.utils import explain_scans
+from jirabas.tasks.views import TaskViewSet
+from jirabas.users.models import Role, User
+
+pytestmark = pytest.mark.django_db
+
+TASKS_COUNT = 40000
+PROJECTS_COUNT = 20
+
+# The composite index of each filter; a combination is served by the index of
+# its most selective filter, in this order, and by the project order when it
+# filters on nothing but the project
+FILTER_INDEXES = (
+    ("performer", "task_performer_status_idx"),
+    ("creator", "task_creator_status_idx"),
+    ("status", "task_project_status_idx"),
+    ("type", "task_project_status_idx"),
+)
+ORDER_INDEX = "task_project_created_idx"
+
+
+def _rare(rnd, value, values):
+    """``value`` one time in twenty, like a status or type filtered on."""
+    if rnd.random() < 0.05:
+        return value
+    return rnd.choice([other for other in values if other != value])
+
+
+@pytest.fixture
+def task_dataset():
+    """Tasks of PROJECTS_COUNT projects, the caller being a member of one.
+
+    Tasks are created by a fifth of the users and assigned to all of them,
+    so the filters are selective in the order of FILTER_INDEXES.
+    """
+    rnd = random.Random(42)
+    users = User.objects.bulk_create(User(username=f"index-{i}") for i in range(5000))
+    projects = ProjectFactory.create_batch(PROJECTS_COUNT)
+    now = timezone.now()
+    Task.objects.bulk_create(
+        Task(
+            custom_number=f"T-{i}",
+            name=f"Task {i}",
+            status=_rare(rnd, StatusTask.IN_PROGRESS, StatusTask.values),
+            type=_rare(rnd, TypeTask.BUG, TypeTask.values),
+            creator=rnd.choice(users[:1000]),
+            performer=rnd.choice(users),
+            project=projects[i % len(projects)],
+            date_created=now - timedelta(minutes=rnd.randrange(100000)),
+        )
+        for i in range(TASKS_COUNT)
+    )
+    user = users[0]
+    ProjectMembership.objects.create(
+        project=projects[0], member=user, role=Role.get_project_manager()
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {Task._meta.db_table}")
+
+    return user, {
+        "performer": user.pk,
+        "creator": user.pk,
+        "project": projects[0].pk,
+        "type": TypeTask.BUG,
+        "status": StatusTask.IN_PROGRESS,
+    }
+
+
+def _list_queryset(user, params):
+    """The page query of GET /api/tasks/, limited to the caller's projects."""
+    request = APIRequestFactory().get("/api/tasks/", params)
+    force_authenticate(request, user)
+    view = TaskViewSet(action="list", format_kwarg=None, kwargs={})
+    view.request = Request(request)
+    queryset = view.filter_queryset(view.get_queryset())
+    return queryset.order_by(*TaskCursorPagination.ordering)[
+        : TaskCursorPagination.page_size + 1
+    ]
+
+
+def test_task_filters_use_indexes(task_dataset):
+    user, values = task_dataset
+
+    offenders = {}
+    for size in range(len(TaskViewSet.filterset_fields) + 1):
+        for fields in combinations(TaskViewSet.filterset_fields, size):
+            own = [index for field, index in FILTER_INDEXES if field in fields]
+            expected = own[0] if own else ORDER_INDEX
+            indexes = set(
+                explain_scans(_list_queryset(user, {f: values[f] for f in fields}))
+            ) - {"Bitmap Heap Scan", "BitmapAnd", "BitmapOr"}
+            # Other filters may narrow the scan with their own indexes too,
+            # but never with a sequential scan or by walking the project order
+            if expected not in indexes or not indexes <= {expected, *own}:
+                offenders[fields] = indexes
+
+    assert offenders == {}
@@ -0,0 +1,150 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from jirabas.tasks.enums import StatusTask
+from jirabas.tasks.models import ProjectMembership, Task, TaskTombstone
+from jirabas.tasks.sync import (
+    SYNC_OVERLAP,
+    SYNC_TOMBSTONE_RETENTION,
+    decode_cursor,
+    encode_cursor,
+    purge_tombstones,
+)
+from jirabas.tasks.tests.factories import ProjectFactory, TaskFactory
+from jirabas.users.models import Role, User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def _sync(api_client, since=None, limit=2):
+    """Page through the changes, returning them with the final cursor."""
+    changed, deleted = [], []
+    while True:
+        params = {"limit": limit}
+        if since:
+            params["since"] = since
+        data = api_client.get("/api/tasks/changes/", params).json()
+        changed += [task["id"] for task in data["changed"]]
+        deleted += data["deleted"]
+        since = data["cursor"]
+        if not data["has_more"]:
+            return changed, deleted, since
+
+
+def test_changes(api_client: APIClient, user: User):
+    project, moved_to, foreign = ProjectFactory.create_batch(3)
+    ProjectMembership.objects.create(
+        project=project, member=user, role=Role.get_project_manager()
+    )
+    tasks = TaskFactory.create_batch(5, project=project)
+    TaskFactory(project=foreign)
+
+    changed, deleted, cursor = _sync(api_client)
+    assert sorted(changed) == sorted(task.pk for task in tasks)
+    assert deleted == []
+
+    # Pretend everything above was synced long ago, beyond the overlap window
+    Task.objects.update(date_modified=timezone.now() - timedelta(hours=1))
+    changed, deleted, cursor = _sync(api_client, cursor)
+    assert changed == deleted == []
+
+    Task.objects.filter(pk=tasks[0].pk).update(status=StatusTask.DONE)
+    Task.objects.filter(pk=tasks[1].pk).update(project=moved_to)
+    deleted_pk = tasks[2].pk
+    tasks[2].delete()
+    TaskFactory(project=foreign)
+    new = TaskFactory(project=project)
+
+    changed, deleted, _ = _sync(api_client, cursor)
+    assert sorted(changed) == [tasks[0].pk, new.pk]
+    assert sorted(deleted) == [tasks[1].pk, deleted_pk]
+
+
+def test_invalid_and_expired_cursor(api_client: APIClient):
+    response = api_client.get("/api/tasks/changes/", {"since": "garbage"})
+    assert response.status_code == 400
+
+    old = timezone.now() - SYNC_TOMBSTONE_RETENTION - timedelta(days=1)
+    TaskTombstone.objects.create(task_id=1, project_id=1, date_deleted=old)
+    assert purge_tombstones() == 1
+
+    cursor = encode_cursor({"tasks": (old, 0), "deleted": (old, 0)})
+    response = api_client.get("/api/tasks/changes/", {"since": cursor})
+    assert response.status_code == 410
+
+
+def test_membership_change_expires_cursor(
+    api_client: APIClient, user: User, run_on_commit
+):
+    project, joined = ProjectFactory.create_batch(2)
+    ProjectMembership.objects.create(
+        project=project, member=user, role=Role.get_project_manager()
+    )
+    old = TaskFactory(project=joined)
+    _, _, cursor = _sync(api_client)
+
+    # The tasks of a joined project were modified before the cursor
+    ProjectMembership.objects.create(
+        project=joined, member=user, role=Role.get_project_manager()
+    )
+    run_on_commit()
+    response = api_client.get("/api/tasks/changes/", {"since": cursor})
+    assert response.status_code == 410
+
+    changed, _, cursor = _sync(api_client)
+    assert old.pk in changed
+
+    # Tasks of a left project are dropped by the full sync
+    ProjectMembership.objects.filter(project=joined, member=user).delete()
+    run_on_commit()
+    response = api_client.get("/api/tasks/changes/", {"since": cursor})
+    assert response.status_code == 410
+    changed, _, _ = _sync(api_client)
+    assert old.pk not in changed
+
+
+def test_cursor_waits_for_running_transactions(api_client: APIClient, user: User):
+    other = connection.get_new_connection(connection.get_connection_params())
+    try:
+        with other.cursor() as cursor:
+            # Assigns an xid as the first write of a transaction would
+            cursor.execute("SELECT txid_current(), now()")
+            _, started = cursor.fetchone()
+
+        _, _, cursor = _sync(api_client)
+        position, _ = decode_cursor(cursor)
+        assert position["tasks"][0] <= started - SYNC_OVERLAP
+        assert position["deleted"][0] <= started - SYNC_OVERLAP
+    finally:
+        other.close()
+
+
+def test_task_moved_between_member_projects_is_not_deleted(
+    api_client: APIClient, user: User
+):
+    source, target = ProjectFactory.create_batch(2)
+    for project in (source, target):
+        ProjectMembership.objects.create(
+            project=project, member=user, role=Role.get_project_manager()
+        )
+    task = TaskFactory(project=source)
+    _, _, cursor = _sync(api_client)
+
+    task.project = target
+    task.save()
+    assert TaskTombstone.objects.filter(task_id=task.pk).exists()
+
+    changed, deleted, _ = _sync(api_client, cursor, limit=1)
+    assert changed == [task.pk]
+    assert deleted == []
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from jirabas.tasks.enums import StatusTask
+from jirabas.tasks.tasks import mark_overdue_tasks
+from jirabas.tasks.tests.factories import TaskFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_mark_overdue_tasks():
+    past = timezone.now() - timedelta(days=1)
+    future = timezone.now() + timedelta(days=1)
+    expired = TaskFactory.create_batch(3, deadline_date=past)
+    done = TaskFactory(deadline_date=past, status=StatusTask.DONE)
+    pending = TaskFactory(deadline_date=future)
+    no_deadline = TaskFactory()
+
+    assert mark_overdue_tasks(chunk_size=2) == 3
+    assert mark_overdue_tasks() == 0
+
+    for task in expired:
+        task.refresh_from_db()
+        assert task.status == StatusTask.IS_DELAYED
+    for task, status in (
+        (done, StatusTask.DONE),
+        (pending, StatusTask.BACKLOG),
+        (no_deadline, StatusTask.BACKLOG),
+    ):
+        task.refresh_from_db()
+        assert task.status == status
@@ -0,0 +1,197 @@
+from datetime import date, datetime
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from jirabas.tasks.models import LoggedTimeRollup, LogTimeTask, ProjectMembership
+from jirabas.tasks.tests.factories import ProjectFactory, TaskFactory
+from jirabas.users.models import Role, User
+from jirabas.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _at(day, hour=12):
+    return timezone.make_aware(datetime(2021, 3, day, hour))
+
+
+def _rollups():
+    return set(
+        LoggedTimeRollup.objects.values_list(
+            "task_id", "user_id", "date", "hours", "entries"
+        )
+    )
+
+
+def test_rollups_follow_logged_time():
+    user, other = UserFactory.create_batch(2)
+    task, second = TaskFactory.create_batch(2)
+
+    first = LogTimeTask.objects.create(
+        task=task, user=user, hours=2, date_logged=_at(1)
+    )
+    LogTimeTask.objects.bulk_create(
+        [
+            LogTimeTask(task=task, user=user, hours=1.5, date_logged=_at(1, 23)),
+            LogTimeTask(task=task, user=other, hours=3, date_logged=_at(2)),
+        ]
+    )
+    assert _rollups() == {
+        (task.pk, user.pk, date(2021, 3, 1), 3.5, 2),
+        (task.pk, other.pk, date(2021, 3, 2), 3, 1),
+    }
+
+    first.hours, first.date_logged = 4, _at(2)
+    first.save()
+    LogTimeTask.objects.filter(user=other).update(task=second)
+    assert _rollups() == {
+        (task.pk, user.pk, date(2021, 3, 1), 1.5, 1),
+        (task.pk, user.pk, date(2021, 3, 2), 4, 1),
+        (second.pk, other.pk, date(2021, 3, 2), 3, 1),
+    }
+
+    LogTimeTask.objects.filter(user=user, hours=1.5).delete()
+    second.delete()
+    assert _rollups() == {(task.pk, user.pk, date(2021, 3, 2), 4, 1)}
+
+
+def test_rollup_days_follow_the_connection_time_zone():
+    task = TaskFactory()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT current_setting('jirabas.time_zone')")
+        assert cursor.fetchone() == ("Europe/Moscow",)
+        cursor.execute("SET LOCAL jirabas.time_zone = 'UTC'")
+
+    # 01:00 in Moscow is still the previous day in UTC
+    LogTimeTask.objects.create(
+        task=task, user=task.creator, hours=1, date_logged=_at(1, 1)
+    )
+    assert _rollups() == {(task.pk, task.creator_id, date(2021, 2, 28), 1, 1)}
+
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL jirabas.time_zone = 'Europe/Moscow'")
+    call_command("rebuild_time_rollups")
+    assert _rollups() == {(task.pk, task.creator_id, date(2021, 3, 1), 1, 1)}
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def test_timesheet_and_time_spent(api_client: APIClient, user: User):
+    project = ProjectFactory()
+    ProjectMembership.objects.create(
+        project=project, member=user, role=Role.get_project_manager()
+    )
+    task = TaskFactory(project=project, estimate_hours=10)
+    other_task = TaskFactory(project=project)
+    colleague = UserFactory()
+
+    for hours, day in ((2, 1), (3, 1)):
+        response = api_client.post(
+            "/api/logged-time/",
+            {"task": task.pk, "user": user.pk, "hours": hours, "date_logged": _at(day)},
+        )
+        assert response.status_code == 201
+    LogTimeTask.objects.create(task=other_task, user=user, hours=1, date_logged=_at(2))
+    LogTimeTask.objects.create(task=task, user=colleague, hours=4, date_logged=_at(2))
+    LogTimeTask.objects.create(task=task, user=user, hours=8, date_logged=_at(20))
+
+    response = api_client.get(
+        "/api/logged-time/timesheet/",
+        {"date_from": "2021-03-01", "date_to": "2021-03-07"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "user": user.pk,
+        "hours": 6.0,
+        "days": [
+            {
+                "date": "2021-03-01",
+                "hours": 5.0,
+                "tasks": [
+                    {
+                        "id": task.pk,
+                        "custom_number": task.custom_number,
+                        "name": task.name,
+                        "hours": 5.0,
+                    }
+                ],
+            },
+            {
+                "date": "2021-03-02",
+                "hours": 1.0,
+                "tasks": [
+                    {
+                        "id": other_task.pk,
+                        "custom_number": other_task.custom_number,
+                        "name": other_task.name,
+                        "hours": 1.0,
+                    }
+                ],
+            },
+        ],
+    }
+
+    response = api_client.get(f"/api/tasks/{task.pk}/time_spent/")
+    assert response.json() == {
+        "id": task.pk,
+        "estimate_hours": 10,
+        "spent_hours": 17.0,
+        "remaining_hours": -7.0,
+        "users": [
+            {"user": user.pk, "hours": 13.0},
+            {"user": colleague.pk, "hours": 4.0},
+        ],
+    }
+
+    response = api_client.get(f"/api/projects/{project.pk}/time_spent/")
+    assert [
+        (row["id"], row["estimate_hours"], row["spent_hours"])
+        for row in response.data["results"]
+    ] == [(other_task.pk, None, 1.0), (task.pk, 10, 17.0)]
+
+    response = api_client.get(
+        "/api/logged-time/timesheet/",
+        {"date_from": "2021-03-07", "date_to": "2021-03-01"},
+    )
+    assert response.status_code == 400
+
+
+def test_logged_time_scoped_to_member_projects(api_client: APIClient, user: User):
+    project = ProjectFactory()
+    ProjectMembership.objects.create(
+        project=project, member=user, role=Role.get_project_manager()
+    )
+    task, foreign = TaskFactory(project=project), TaskFactory()
+    own = LogTimeTask.objects.create(task=task, user=user, hours=1, date_logged=_at(1))
+    LogTimeTask.objects.create(task=foreign, user=user, hours=2, date_logged=_at(1))
+
+    response = api_client.get("/api/logged-time/")
+    assert [row["id"] for row in response.data["results"]] == [own.pk]
+
+    response = api_client.post(
+        "/api/logged-time/",
+        {"task": foreign.pk, "user": user.pk, "hours": 1, "date_logged": _at(2)},
+    )
+    assert response.status_code == 403
+
+    # Time is always logged for the caller
+    response = api_client.post(
+        "/api/logged-time/",
+        {"task": task.pk, "user": UserFactory().pk, "hours": 1, "date_logged": _at(9)},
+    )
+    assert response.json()["user"] == user.pk
+
+    params = {"date_from": "2021-03-01", "date_to": "2021-03-07"}
+    assert api_client.get("/api/logged-time/timesheet/", params).json()["hours"] == 1
+    response = api_client.get(
+        "/api/logged-time/timesheet/", {**params, "project": foreign.project_id}
+    )
+    assert response.status_code == 403
@@ -0,0 +1,652 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from jirabas.tasks.enums import RelationType, StatusTask
+from jirabas.tasks.models import (
+    Comment,
+    LogTimeTask,
+    Project,
+    ProjectMembership,
+    Task,
+    TasksRelation,
+)
+from jirabas.tasks.serializers import TaskSerializer
+from jirabas.tasks.tests.factories import ProjectFactory, TaskFactory
+from jirabas.users.models import Role, User
+from jirabas.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def project(user: User) -> Project:
+    project = ProjectFactory()
+    ProjectMembership.objects.create(
+        project=project, member=user, role=Role.get_project_manager()
+    )
+    return project
+
+
+class TestTaskViewSet:
+    def test_list_is_cursor_paginated(self, api_client: APIClient, project: Project):
+        tasks = TaskFactory.create_batch(5, project=project)
+        TaskFactory.create_batch(2)
+
+        response = api_client.get(
+            "/api/tasks/", {"project": project.pk, "page_size": 2}
+        )
+        seen = [task["id"] for task in response.data["results"]]
+        while response.data["next"]:
+            response = api_client.get(response.data["next"])
+            seen += [task["id"] for task in response.data["results"]]
+
+        assert "count" not in response.data
+        assert seen == [task.pk for task in reversed(tasks)]
+
+    def test_list_pages_through_ties_without_offset(
+        self, api_client: APIClient, project: Project
+    ):
+        tasks = TaskFactory.create_batch(7, project=project)
+        # Imported tasks share their creation time
+        Task.objects.filter(project=project).update(date_created=timezone.now())
+
+        response = api_client.get(
+            "/api/tasks/", {"project": project.pk, "page_size": 2}
+        )
+        pages = [[task["id"] for task in response.data["results"]]]
+        while response.data["next"]:
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.get(response.data["next"])
+            pages.append([task["id"] for task in response.data["results"]])
+            assert not any("OFFSET" in query["sql"] for query in queries)
+
+        assert sum(pages, []) == [task.pk for task in reversed(tasks)]
+
+        # And back again from the last page
+        while response.data["previous"]:
+            response = api_client.get(response.data["previous"])
+            assert [task["id"] for task in response.data["results"]] == pages[-2]
+            pages.pop()
+        assert len(pages) == 1
+
+    def test_list_rejects_malformed_cursor(
+        self, api_client: APIClient, project: Project
+    ):
+        TaskFactory.create_batch(3, project=project)
+        response = api_client.get("/api/tasks/", {"page_size": 2})
+        next_link = response.data["next"].replace("cursor=", "cursor=x")
+
+        assert api_client.get(next_link).status_code == 404
+
+    def test_create_allocates_unique_numbers(
+        self, api_client: APIClient, project: Project
+    ):
+        project.short_name = "JB"
+        project.save()
+
+        def create():
+            response = api_client.post(
+                "/api/tasks/", {"name": "Task", "project": project.pk}
+            )
+            return response.data
+
+        first = create()
+        api_client.delete(f"/api/tasks/{first['id']}/")
+        second = create()
+
+        assert first["custom_number"] == "JB-0"
+        assert second["custom_number"] == "JB-1"
+
+    def test_move_reallocates_number(
+        self, api_client: APIClient, user: User, project: Project
+    ):
+        other = ProjectFactory(short_name="MV", task_counter=1)
+        ProjectMembership.objects.create(
+            project=other, member=user, role=Role.get_project_manager()
+        )
+        TaskFactory(project=other, custom_number="MV-0")
+        task = TaskFactory(project=project, custom_number="MV-0")
+
+        response = api_client.patch(f"/api/tasks/{task.pk}/", {"project": other.pk})
+
+        assert response.status_code == 200
+        assert response.data["custom_number"] == "MV-1"
+
+    def test_list_matches_task_serializer(
+        self, api_client: APIClient, project: Project
+    ):
+        TaskFactory.create_batch(
+            3,
+            project=project,
+            estimate_hours=3,
+            deadline_date=timezone.now(),
+            performer=UserFactory(),
+        )
+        TaskFactory(project=project)
+
+        response = api_client.get("/api/tasks/", {"project": project.pk})
+
+        tasks = Task.objects.filter(project=project).order_by("-date_created", "-id")
+        expected = json.loads(json.dumps(TaskSerializer(tasks, many=True).data))
+        assert response.json()["results"] == expected
+
+    def test_sparse_fieldsets(self, api_client: APIClient, project: Project):
+        task = TaskFactory(project=project, description="Long text")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(
+                "/api/tasks/",
+                {"fields": "name,status,project", "project": task.project_id},
+            )
+        assert response.json()["results"] == [
+            {"name": task.name, "status": task.status, "project": task.project_id}
+        ]
+        (select,) = [q["sql"] for q in queries if '"tasks_task"."name"' in q["sql"]]
+        assert '"tasks_task"."description"' not in select
+
+        response = api_client.get(f"/api/tasks/{task.pk}/", {"fields": "id,name"})
+        assert response.json() == {"id": task.pk, "name": task.name}
+
+        response = api_client.get("/api/tasks/", {"fields": "name,secret"})
+        assert response.status_code == 400
+
+    def test_conditional_get(
+        self, api_client: APIClient, project: Project, django_assert_num_queries
+    ):
+        task, other = TaskFactory.create_batch(2, project=project)
+        list_url = f"/api/tasks/?project={project.pk}"
+        detail_url = f"/api/tasks/{task.pk}/"
+
+        def revalidate(url, response):
+            headers = {"HTTP_IF_NONE_MATCH": response["ETag"]}
+            if response.has_header("Last-Modified"):
+                headers["HTTP_IF_MODIFIED_SINCE"] = response["Last-Modified"]
+            return api_client.get(url, **headers)
+
+        listed, detailed = api_client.get(list_url), api_client.get(detail_url)
+        assert detailed.data["date_modified"] is not None
+        assert not listed.has_header("Last-Modified")
+        # Request savepoint, project filter lookup and the page validators only
+        with django_assert_num_queries(4):
+            assert revalidate(list_url, listed).status_code == 304
+        assert revalidate(detail_url, detailed).status_code == 304
+
+        # Writes bypassing save() refresh date_modified as well. The page is
+        # read again, but the filter is not run twice
+        Task.objects.filter(pk=task.pk).update(status=StatusTask.DONE)
+        with django_assert_num_queries(5):
+            assert revalidate(list_url, listed).status_code == 200
+        assert revalidate(detail_url, detailed).status_code == 200
+
+        listed = api_client.get(list_url)
+        other.delete()
+        assert revalidate(list_url, listed).status_code == 200
+        assert revalidate(f"{list_url}&status=BL", listed).status_code == 200
+
+    def test_list_ignores_if_modified_since(
+        self, api_client: APIClient, project: Project
+    ):
+        task, other = TaskFactory.create_batch(2, project=project)
+        list_url = f"/api/tasks/?project={project.pk}"
+        detailed = api_client.get(f"/api/tasks/{task.pk}/")
+
+        # The page lost a row, the newest date_modified left on it did not move
+        other.delete()
+        response = api_client.get(
+            list_url, HTTP_IF_MODIFIED_SINCE=detailed["Last-Modified"]
+        )
+
+        assert response.status_code == 200
+        assert [row["id"] for row in response.data["results"]] == [task.pk]
+
+    def test_search(self, api_client: APIClient, project: Project):
+        in_name = TaskFactory(project=project, name="Кнопка входа не работает")
+        in_criteria = TaskFactory(
+            project=project, name="Форма", acceptance_criteria="Кнопки активны"
+        )
+        in_description = TaskFactory(
+            project=project, name="Вход", description="Нажатие на кнопку"
+        )
+        TaskFactory(project=project, name="Отчёт")
+        TaskFactory(name="Кнопка в другом проекте")
+
+        response = api_client.get(
+            "/api/tasks/search/", {"q": "кнопки", "project": project.pk}
+        )
+
+        assert response.status_code == 200
+        assert response.data["count"] == 3
+        results = response.data["results"]
+        assert [task["id"] for task in results] == [
+            in_name.pk,
+            in_criteria.pk,
+            in_description.pk,
+        ]
+        assert results[0]["name_headline"] == "<b>Кнопка</b> входа не работает"
+        assert "<b>кнопку</b>" in results[2]["headline"]
+
+        # The vector follows updates made by queryset update() as well
+        Task.objects.filter(pk=in_name.pk).update(name="Вход в систему")
+        response = api_client.get(
+            "/api/tasks/search/", {"q": "кнопки", "project": project.pk}
+        )
+        assert in_name.pk not in [task["id"] for task in response.data["results"]]
+
+        assert api_client.get("/api/tasks/search/").status_code == 400
+
+    def test_related(self, api_client: APIClient, project: Project):
+        task, blocker, blocked, clone = TaskFactory.create_batch(4, project=project)
+        TasksRelation.objects.bulk_create(
+            [
+                TasksRelation(
+                    from_task=task,
+                    to_task=blocker,
+                    relation_type=RelationType.IS_BLOCKED_BY,
+                ),
+                TasksRelation(
+                    from_task=blocked,
+                    to_task=task,
+                    relation_type=RelationType.IS_BLOCKED_BY,
+                ),
+                TasksRelation(
+                    from_task=clone, to_task=task, relation_type=RelationType.CLONES
+                ),
+            ]
+        )
+
+        response = api_client.get(f"/api/tasks/{task.pk}/related/")
+
+        relations = {
+            relation["relation_type"]: [t["id"] for t in relation["tasks"]]
+            for relation in response.json()["results"]["relations"]
+        }
+        assert relations == {
+            RelationType.IS_BLOCKED_BY: [blocker.pk],
+            RelationType.BLOCKS: [blocked.pk],
+            RelationType.IS_CLONED_BY: [clone.pk],
+        }
+        assert set(response.json()["results"]["relations"][0]["tasks"][0]) == {
+            "id",
+            "name",
+            "type",
+            "priority",
+            "status",
+        }
+
+    def test_dependency_graph(self, api_client: APIClient, project: Project):
+        first, second, third, fourth, unrelated = TaskFactory.create_batch(
+            5, project=project
+        )
+        TasksRelation.objects.bulk_create(
+            [
+                TasksRelation(
+                    from_task=first, to_task=second, relation_type=RelationType.BLOCKS
+                ),
+                TasksRelation(
+                    from_task=third,
+                    to_task=second,
+                    relation_type=RelationType.IS_BLOCKED_BY,
+                ),
+                TasksRelation(
+                    from_task=third, to_task=fourth, relation_type=RelationType.BLOCKS
+                ),
+                # cycle back to the start
+                TasksRelation(
+                    from_task=fourth, to_task=first, relation_type=RelationType.BLOCKS
+                ),
+                TasksRelation(
+                    from_task=first,
+                    to_task=unrelated,
+                    relation_type=RelationType.RELATES,
+                ),
+            ]
+        )
+
+        response = api_client.get(f"/api/tasks/{second.pk}/dependency_graph/")
+        graph = response.json()
+
+        assert {node["id"]: node["depth"] for node in graph["nodes"]} == {
+            second.pk: 0,
+            first.pk: 1,
+            third.pk: 1,
+            fourth.pk: 2,
+        }
+        assert {(edge["blocker"], edge["blocked"]) for edge in graph["edges"]} == {
+            (first.pk, second.pk),
+            (second.pk, third.pk),
+            (third.pk, fourth.pk),
+            (fourth.pk, first.pk),
+        }
+
+        response = api_client.get(
+            f"/api/tasks/{second.pk}/dependency_graph/", {"depth": 1}
+        )
+        assert len(response.json()["nodes"]) == 3
+
+    def test_connect_rejects_invalid_links(
+        self, api_client: APIClient, project: Project
+    ):
+        first, second, third = TaskFactory.create_batch(3, project=project)
+
+        def connect(from_task, to_task, relation_type):
+            return api_client.post(
+                f"/api/tasks/{from_task.pk}/connect/",
+                {"to_task": to_task.pk, "relation_type": relation_type},
+            )
+
+        assert connect(first, second, RelationType.BLOCKS).status_code == 200
+        assert connect(second, third, RelationType.BLOCKS).status_code == 200
+
+        # self link, duplicate stored from the other end, cycle
+        assert connect(first, first, RelationType.RELATES).status_code == 400
+        assert connect(second, first, RelationType.IS_BLOCKED_BY).status_code == 400
+        assert connect(first, third, RelationType.IS_BLOCKED_BY).status_code == 400
+        assert connect(third, first, RelationType.BLOCKS).status_code == 400
+
+        assert connect(first, third, RelationType.BLOCKS).status_code == 200
+        assert TasksRelation.objects.count() == 3
+
+    def test_links_to_foreign_tasks_are_hidden(
+        self, api_client: APIClient, project: Project
+    ):
+        task, blocked = TaskFactory.create_batch(2, project=project)
+        foreign = TaskFactory()
+        TasksRelation.objects.bulk_create(
+            [
+                TasksRelation(
+                    from_task=task, to_task=blocked, relation_type=RelationType.BLOCKS
+                ),
+                TasksRelation(
+                    from_task=foreign, to_task=task, relation_type=RelationType.BLOCKS
+                ),
+                TasksRelation(
+                    from_task=task, to_task=foreign, relation_type=RelationType.RELATES
+                ),
+            ]
+        )
+
+        response = api_client.post(
+            f"/api/tasks/{task.pk}/connect/",
+            {"to_task": foreign.pk, "relation_type": RelationType.CLONES},
+        )
+        assert response.status_code == 400
+        assert "to_task" in response.json()
+
+        response = api_client.get(f"/api/tasks/{task.pk}/related/")
+        assert [
+            t["id"]
+            for relation in response.json()["results"]["relations"]
+            for t in relation["tasks"]
+        ] == [blocked.pk]
+
+        response = api_client.get(f"/api/tasks/{task.pk}/dependency_graph/")
+        graph = response.json()
+        assert {node["id"] for node in graph["nodes"]} == {task.pk, blocked.pk}
+        assert graph["edges"] == [{"blocker": task.pk, "blocked": blocked.pk}]
+
+    def test_scoped_to_member_projects(
+        self,
+        api_client: APIClient,
+        user: User,
+        project: Project,
+        run_on_commit,
+        django_assert_num_queries,
+    ):
+        task = TaskFactory(project=project)
+        foreign = TaskFactory()
+
+        api_client.get("/api/tasks/")
+        # Savepoint and the page, which also gives the ETag; the caller's
+        # projects come from the cache
+        with django_assert_num_queries(3):
+            response = api_client.get("/api/tasks/")
+        assert [row["id"] for row in response.data["results"]] == [task.pk]
+        assert api_client.get(f"/api/tasks/{foreign.pk}/").status_code == 404
+        response = api_client.post(
+            "/api/tasks/", {"name": "Task", "project": foreign.project_id}
+        )
+        assert response.status_code == 403
+
+        ProjectMembership.objects.create(
+            project=foreign.project, member=user, role=Role.get_project_manager()
+        )
+        run_on_commit()
+        assert api_client.get(f"/api/tasks/{foreign.pk}/").status_code == 200
+
+    def test_bulk(self, api_client: APIClient, user: User, project: Project):
+        project.short_name = "BK"
+        project.save()
+        to_update, to_delete = TaskFactory.create_batch(2, project=project)
+        foreign = TaskFactory()
+
+        response = api_client.post(
+            "/api/tasks/bulk/",
+            {
+                "create": [
+                    {"name": "First", "project": project.pk},
+                    {"name": "Broken", "project": 0},
+                    {"name": "Second", "project": project.pk, "performer": user.pk},
+                    {"name": "Foreign", "project": foreign.project_id},
+                ],
+                "update": [
+                    {"id": to_update.pk, "status": "DN"},
+                    {"id": 0, "status": "DN"},
+                    {"id": foreign.pk, "status": "DN"},
+                    {"id": to_update.pk, "project": foreign.project_id},
+                ],
+                "delete": [to_delete.pk, 0, foreign.pk],
+            },
+            format="json",
+        )
+
+        data = response.json()
+        assert [item.get("custom_number") for item in data["create"]] == [
+            "BK-0",
+            None,
+            "BK-1",
+            None,
+        ]
+        assert "project" in data["create"][1]["errors"]
+        assert "project" in data["create"][3]["errors"]
+        assert "errors" not in data["update"][0]
+        assert "id" in data["update"][1]["errors"]
+        assert "id" in data["update"][2]["errors"]
+        assert "project" in data["update"][3]["errors"]
+        assert data["delete"] == [
+            {"id": to_delete.pk, "deleted": True},
+            {"id": 0, "deleted": False},
+            {"id": foreign.pk, "deleted": False},
+        ]
+        foreign.refresh_from_db()
+        assert foreign.status != "DN"
+
+        to_update.refresh_from_db()
+        assert to_update.status == "DN"
+        assert Task.objects.get(pk=data["create"][2]["id"]).performer == user
+        assert not Task.objects.filter(pk=to_delete.pk).exists()
+
+    def test_bulk_update_writes_sent_fields(
+        self, api_client: APIClient, user: User, project: Project
+    ):
+        other = ProjectFactory(short_name="MV")
+        ProjectMembership.objects.create(
+            project=other, member=user, role=Role.get_project_manager()
+        )
+        renamed, closed, moved = TaskFactory.create_batch(3, project=project)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                "/api/tasks/bulk/",
+                {
+                    "update": [
+                        {"id": renamed.pk, "name": "Renamed"},
+                        {"id": closed.pk, "status": "DN"},
+                        {"id": moved.pk, "project": other.pk},
+                    ]
+                },
+                format="json",
+            )
+        assert all("errors" not in item for item in response.json()["update"])
+
+        updates = [
+            q["sql"] for q in queries if q["sql"].startswith('UPDATE "tasks_task"')
+        ]
+        assert len(updates) == 3
+        assert all(sql.count("CASE WHEN") == 1 for sql in updates[:2])
+        moved.refresh_from_db()
+        assert (moved.project, moved.custom_number) == (other, "MV-0")
+
+
+class TestProjectViewSet:
+    def test_users_to_add(self, api_client: APIClient, user: User):
+        project = ProjectFactory()
+        ProjectMembership.objects.create(
+            project=project, member=user, role=Role.get_project_manager()
+        )
+        UserFactory(username="alice.smith")
+        UserFactory(username="bob", name="Alicia Keys")
+        UserFactory(username="carol", name="Carol")
+
+        response = api_client.get(
+            f"/api/projects/{project.pk}/users_to_add/",
+            {"search": "ali", "page_size": 1},
+        )
+        usernames = [row["username"] for row in response.data["results"]]
+        response = api_client.get(response.data["next"])
+        usernames += [row["username"] for row in response.data["results"]]
+
+        assert usernames == ["alice.smith", "bob"]
+        assert response.data["next"] is None
+
+        response = api_client.get(f"/api/projects/{project.pk}/users_to_add/")
+        assert user.username not in [
+            row["username"] for row in response.data["results"]
+        ]
+
+        foreign = ProjectFactory()
+        for url in ("users", "users_to_add"):
+            response = api_client.get(f"/api/projects/{foreign.pk}/{url}/")
+            assert response.status_code == 404
+
+    def test_list_etag_follows_membership(
+        self, api_client: APIClient, user: User, run_on_commit
+    ):
+        project, other = ProjectFactory.create_batch(2)
+        ProjectMembership.objects.create(
+            project=project, member=user, role=Role.get_project_manager()
+        )
+        response = api_client.get("/api/projects/")
+        etag = response["ETag"]
+        assert (
+            api_client.get("/api/projects/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+        )
+
+        ProjectMembership.objects.filter(project=project).delete()
+        ProjectMembership.objects.create(
+            project=other, member=user, role=Role.get_project_manager()
+        )
+        run_on_commit()
+        response = api_client.get("/api/projects/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert [row["id"] for row in response.data["results"]] == [other.pk]
+
+    def test_export(self, api_client: APIClient, user: User):
+        project = ProjectFactory(short_name="EX")
+        ProjectMembership.objects.create(
+            project=project, member=user, role=Role.get_project_manager()
+        )
+        first, second = TaskFactory.create_batch(2, project=project)
+        TaskFactory()
+        Comment.objects.create(task=first, user=user, text="Looks good")
+
+        response = api_client.get(
+            f"/api/projects/{project.pk}/export/", {"include": "comments"}
+        )
+        records = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        assert [(record["record"], record["id"]) for record in records] == [
+            ("task", first.pk),
+            ("task", second.pk),
+            ("comment", first.comments.get().pk),
+        ]
+
+        response = api_client.get(
+            f"/api/projects/{project.pk}/export/", {"output": "csv"}
+        )
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert response["Content-Type"] == "text/csv"
+        assert lines[0].startswith("id,custom_number,name")
+        assert len(lines) == 3
+
+        # The stream outlives the request transaction and opens its own
+        assert resolve(f"/api/projects/{project.pk}/export/").func._non_atomic_requests
+        assert not hasattr(
+            resolve(f"/api/projects/{project.pk}/").func, "_non_atomic_requests"
+        )
+
+
+class TestCommentViewSet:
+    def test_list_and_create(
+        self,
+        api_client: APIClient,
+        user: User,
+        project: Project,
+        django_assert_num_queries,
+    ):
+        task = TaskFactory(project=project)
+        for _ in range(5):
+            api_client.post(f"/api/tasks/{task.pk}/comments/", {"text": "Comment"})
+        Comment.objects.create(task=TaskFactory(), user=UserFactory(), text="Other")
+        comments = list(task.comments.order_by("date_create", "id"))
+        assert [comment.user for comment in comments] == [user] * 5
+
+        # One query per page (plus the request's savepoint), authors are joined
+        with django_assert_num_queries(3):
+            response = api_client.get(
+                f"/api/tasks/{task.pk}/comments/", {"page_size": 3}
+            )
+        seen = [comment["id"] for comment in response.data["results"]]
+        assert response.data["results"][0]["user"]["username"] == user.username
+        response = api_client.get(response.data["next"])
+        seen += [comment["id"] for comment in response.data["results"]]
+        assert seen == [comment.pk for comment in comments]
+
+        response = api_client.post("/api/tasks/0/comments/", {"text": "Comment"})
+        assert response.status_code == 404
+
+    def test_only_author_can_change(self, api_client: APIClient, project: Project):
+        comment = Comment.objects.create(
+            task=TaskFactory(project=project), user=UserFactory(), text="Comment"
+        )
+        url = f"/api/tasks/{comment.task_id}/comments/{comment.pk}/"
+
+        assert api_client.patch(url, {"text": "Changed"}).status_code == 403
+        assert api_client.delete(url).status_code == 403
+
+    def test_admin_changelists(self, admin_client, django_assert_max_num_queries):
+        for _ in range(10):
+            task = TaskFactory()
+            Comment.objects.create(task=task, user=task.creator, text="Comment")
+            LogTimeTask.objects.create(task=task, user=task.creator, hours=1)
+
+        for url in (
+            "/admin/tasks/comment/",
+            "/admin/tasks/logtimetask/",
+        ):
+            with django_assert_max_num_queries(8):
+                assert admin_client.get(url).status_code == 200
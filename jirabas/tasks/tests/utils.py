@@ -0,0 +1,23 @@
+from django.db import connection
+from django.db.models import QuerySet
+
+
+def _iter_plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _iter_plan_nodes(child)
+
+
+def explain_scans(queryset: QuerySet) -> list:
+    """Return how ``queryset`` reads its relations, as planned on the current
+    statistics: the index name for index scans, "Seq Scan" otherwise."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        ((explained,),) = cursor.fetchall()
+
+    return [
+        node.get("Index Name", node["Node Type"])
+        for node in _iter_plan_nodes(explained[0]["Plan"])
+        if "Relation Name" in node or "Index Name" in node
+    ]
@@ -0,0 +1,92 @@
+from django.db import connection, transaction
+from django.db.models import FloatField, Sum, Value
+from django.db.models.functions import Coalesce
+
+from jirabas.tasks.models import LoggedTimeRollup, LogTimeTask, Task
+
+# Day of a LogTimeTask row as counted by the rollup trigger (migration 0020)
+ROLLUP_DAY_SQL = (
+    "(date_logged AT TIME ZONE coalesce("
+    "nullif(current_setting('jirabas.time_zone', true), ''), "
+    "current_setting('TimeZone')))::date"
+)
+
+
+def get_timesheet(user_id, date_from, date_to, project_ids) -> dict:
+    """Hours logged by a user per day and task in the projects
+    ``project_ids``, read from the rollups (one row per task and day)
+    instead of the raw LogTimeTask rows."""
+    rollups = LoggedTimeRollup.objects.filter(
+        user_id=user_id,
+        date__gte=date_from,
+        date__lte=date_to,
+        task__project_id__in=project_ids,
+    )
+
+    days = {}
+    rows = rollups.order_by("date", "task_id").values_list(
+        "date", "task_id", "task__custom_number", "task__name", "hours"
+    )
+    for date, task_id, custom_number, name, hours in rows:
+        day = days.setdefault(date, {"date": date, "hours": 0.0, "tasks": []})
+        day["hours"] += hours
+        day["tasks"].append(
+            {
+                "id": task_id,
+                "custom_number": custom_number,
+                "name": name,
+                "hours": hours,
+            }
+        )
+
+    return {
+        "user": user_id,
+        "hours": sum(day["hours"] for day in days.values()),
+        "days": list(days.values()),
+    }
+
+
+def with_time_spent(tasks):
+    """Annotate ``tasks`` with ``spent_hours`` summed over their rollups."""
+    spent_hours = Coalesce(
+        Sum("time_rollups__hours"), Value(0.0), output_field=FloatField()
+    )
+    return tasks.annotate(spent_hours=spent_hours).values(
+        "id", "custom_number", "name", "estimate_hours", "spent_hours", "date_created"
+    )
+
+
+def get_time_spent(task: Task) -> dict:
+    """Hours spent on ``task`` in total and per user, against its estimate."""
+    users = list(
+        task.time_rollups.values("user").annotate(hours=Sum("hours")).order_by("user")
+    )
+    spent = sum(user["hours"] for user in users)
+    return {
+        "id": task.pk,
+        "estimate_hours": task.estimate_hours,
+        "spent_hours": spent,
+        "remaining_hours": (
+            None if task.estimate_hours is None else task.estimate_hours - spent
+        ),
+        "users": users,
+    }
+
+
+def rebuild_time_rollups() -> int:
+    """Recompute every rollup from the LogTimeTask rows, e.g. after
+    TIME_ZONE changed, returning the number of rollups.
+
+    Writes to logged time are blocked (SHARE lock) during the rebuild.
+    """
+    rollups = LoggedTimeRollup._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {LogTimeTask._meta.db_table} IN SHARE MODE")
+        cursor.execute(f"DELETE FROM {rollups}")
+        cursor.execute(f"""
+            INSERT INTO {rollups} (task_id, user_id, date, hours, entries)
+            SELECT task_id, user_id, {ROLLUP_DAY_SQL}, sum(hours), count(*)
+            FROM {LogTimeTask._meta.db_table}
+            GROUP BY 1, 2, 3
+            """)
+        return cursor.rowcount
@@ -1,36 +1,101 @@
 from collections import defaultdict
 
-from django.db import IntegrityError
-from django.http import JsonResponse
-from django.utils import timezone
+from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, Exists, F, OuterRef, Q, Value
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django_filters import rest_framework as filters
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from jirabas.tasks.enums import OUTDATED_STATUSES, RelationType, StatusTask
-from jirabas.tasks.models import Project, ProjectMembership, Task, TasksRelation
+from jirabas.tasks.bulk import bulk_create_tasks, bulk_delete_tasks, bulk_update_tasks
+from jirabas.tasks.cache import get_project_members
+from jirabas.tasks.counters import get_project_stats
+from jirabas.tasks.export import iter_csv, iter_ndjson
+from jirabas.tasks.graph import get_dependency_graph
+from jirabas.tasks.mixins import ConditionalGetMixin, ProjectScopedMixin
+from jirabas.tasks.models import (
+    Comment,
+    LogTimeTask,
+    Project,
+    ProjectMembership,
+    Task,
+    TasksRelation,
+)
+from jirabas.tasks.pagination import (
+    CommentCursorPagination,
+    LogTimeCursorPagination,
+    ProjectCursorPagination,
+    TaskCursorPagination,
+    TaskSearchPagination,
+    UserCursorPagination,
+)
+from jirabas.tasks.permissions import get_project_roles
+from jirabas.tasks.search import search_tasks
 from jirabas.tasks.serializers import (
+    CommentSerializer,
     ConnectTasksSerializer,
+    DependencyGraphQuerySerializer,
+    DependencyGraphSerializer,
+    LogTimeTaskSerializer,
+    ProjectExportQuerySerializer,
     ProjectRoleSerializer,
     ProjectSerializer,
+    ProjectStatsSerializer,
     ProjectUserSerializer,
+    TaskBulkSerializer,
+    TaskChangesQuerySerializer,
+    TaskSearchQuerySerializer,
+    TaskSearchResultSerializer,
     TaskSerializer,
     TasksRelationCategoriesSerializer,
+    TaskTimeSpentSerializer,
+    TaskValuesSerializer,
+    TimesheetQuerySerializer,
+    TimesheetSerializer,
+    TimeSpentSerializer,
+    parse_task_fields,
 )
+from jirabas.tasks.sync import ExpiredCursor, get_changes
+from jirabas.tasks.timesheet import get_time_spent, get_timesheet, with_time_spent
 from jirabas.users.models import Role, User
 from jirabas.users.serializers import UserProjectInfoSerializer, UserSerializer
+from jirabas.utils.json import JsonResponse
 
 
-class ProjectViewSet(ModelViewSet):
+class ProjectViewSet(ProjectScopedMixin, ConditionalGetMixin, ModelViewSet):
+    queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     lookup_field = "pk"
-    permission_classes = (IsAuthenticated,)
+    project_field = "pk"
+    pagination_class = ProjectCursorPagination
+    # Queries per request with cold user, membership and role caches, see
+    # jirabas.utils.middleware.QueryCountMiddleware
+    query_budgets = {
+        "list": 3,
+        "retrieve": 3,
+        "info": 6,
+        "users": 5,
+        "users_to_add": 3,
+        "stats": 4,
+        "time_spent": 3,
+    }
 
-    def get_queryset(self):
-        return Project.objects.filter(members__member=self.request.user)
+    # Streamed after the view returns; the body opens its own transaction,
+    # see jirabas.tasks.export
+    non_atomic_actions = {"export"}
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        # ATOMIC_REQUESTS is checked on the view of the route, not the action
+        if actions and set(actions.values()) <= cls.non_atomic_actions:
+            view = transaction.non_atomic_requests(view)
+        return view
 
     @action(detail=True, methods=["post"], serializer_class=ProjectRoleSerializer)
     def add_user(self, request, pk=None):
@@ -78,67 +143,115 @@ class ProjectViewSet(ModelViewSet):
 
     @action(detail=True, methods=["get"], serializer_class=UserProjectInfoSerializer)
     def users(self, request, pk=None):
-        membership = ProjectMembership.objects.filter(
-            project_id=self.kwargs[self.lookup_field]
-        ).select_related("member", "role")
+        project = self.get_object()
+        members = get_project_members(project.pk)
         data = [
             {
-                "id": entry.member.id,
-                "name": entry.member.name,
-                "username": entry.member.username,
-                "email": entry.member.email,
-                "role": entry.role.name,
+                "id": member["id"],
+                "name": member["name"],
+                "username": member["username"],
+                "email": member["email"],
+                "role": member["role"],
             }
-            for entry in membership
+            for member in members
         ]
 
         return JsonResponse(data=data, safe=False)
 
-    @action(detail=True, methods=["get"])
+    @action(detail=True, methods=["get"], pagination_class=UserCursorPagination)
     def users_to_add(self, request, pk=None):
-        users = User.objects.exclude(
-            projects__project_id=self.kwargs[self.lookup_field]
+        project = self.get_object()
+        membership = ProjectMembership.objects.filter(
+            project=project, member=OuterRef("pk")
         )
-        data = UserSerializer(users, many=True).data
-        return JsonResponse(data=data, safe=False)
+        users = User.objects.filter(~Exists(membership))
+
+        search = request.query_params.get("search")
+        if search:
+            # Served by the trigram indexes on UPPER(username/name/email)
+            users = users.filter(
+                Q(username__icontains=search)
+                | Q(name__icontains=search)
+                | Q(email__icontains=search)
+            )
+
+        page = self.paginate_queryset(users)
+        data = UserSerializer(page, many=True).data
+        return self.get_paginated_response(data)
+
+    @action(detail=True, methods=["get"])
+    def export(self, request, pk=None):
+        project = self.get_object()
+        query = ProjectExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        output = query.validated_data["output"]
+
+        if output == "csv":
+            response = StreamingHttpResponse(
+                iter_csv(project.pk), content_type="text/csv"
+            )
+        else:
+            response = StreamingHttpResponse(
+                iter_ndjson(project.pk, query.validated_data["include"]),
+                content_type="application/x-ndjson",
+            )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{project.short_name}-tasks.{output}"'
+        )
+        return response
+
+    @action(detail=True, methods=["get"], serializer_class=ProjectStatsSerializer)
+    def stats(self, request, pk=None):
+        """Task counts by status and type, without scanning the tasks."""
+        project = self.get_object()
+        data = ProjectStatsSerializer(get_project_stats(project.pk)).data
+        return JsonResponse(data=data)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        serializer_class=TaskTimeSpentSerializer,
+        pagination_class=TaskCursorPagination,
+    )
+    def time_spent(self, request, pk=None):
+        """Hours spent on every task of the project against its estimate."""
+        project = self.get_object()
+        page = self.paginate_queryset(with_time_spent(project.tasks.all()))
+        data = TaskTimeSpentSerializer(page, many=True).data
+        return self.get_paginated_response(data)
 
     @action(detail=True, methods=["get"])
     def info(self, request, pk=None):
         project = self.get_object()
-        pm = ProjectMembership.objects.filter(
-            project=project, role=Role.get_project_manager()
-        )[0]
-        membership = (
-            ProjectMembership.objects.filter(project_id=self.kwargs[self.lookup_field])
-            .select_related("member", "role")
-            .exclude(member=pm.member)
+        members = get_project_members(project.pk)
+        pm = next(
+            (member for member in members if member["role"] == Role.PROJECT_MANAGER),
+            None,
         )
+
+        def with_abbreviation(member):
+            return {
+                "id": member["id"],
+                "name": member["name"],
+                "username": member["username"],
+                "email": member["email"],
+                "role": member["role_abbreviation"],
+            }
+
         data = {
             "project": ProjectSerializer(project).data,
-            "pm": {
-                "id": pm.member.id,
-                "name": pm.member.name,
-                "username": pm.member.username,
-                "email": pm.member.email,
-                "role": pm.role.abbreviation,
-            },
+            "pm": with_abbreviation(pm) if pm else None,
             "users": [
-                {
-                    "id": entry.member.id,
-                    "name": entry.member.name,
-                    "username": entry.member.username,
-                    "email": entry.member.email,
-                    "role": entry.role.abbreviation,
-                }
-                for entry in membership
+                with_abbreviation(member) for member in members if member is not pm
             ],
         }
         return JsonResponse(data=data)
 
 
-class TaskViewSet(ModelViewSet):
+class TaskViewSet(ProjectScopedMixin, ConditionalGetMixin, ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
+    pagination_class = TaskCursorPagination
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_fields = (
         "performer",
@@ -147,53 +260,281 @@ class TaskViewSet(ModelViewSet):
         "type",
         "status",
     )
+    query_budgets = {
+        "list": 4,
+        "retrieve": 3,
+        "create": 6,
+        "search": 5,
+        "changes": 4,
+        "related": 4,
+        "dependency_graph": 5,
+        "time_spent": 4,
+    }
+
+    def _requested_fields(self):
+        return parse_task_fields(self.request.query_params.get("fields"))
 
     def get_queryset(self):
-        Task.objects.filter(
-            deadline_date__lte=timezone.now(),
-            status__in=OUTDATED_STATUSES
-        ).update(status=StatusTask.IS_DELAYED)
+        queryset = super().get_queryset()
+        fields = self._requested_fields()
+        if self.action == "list":
+            # Plain rows for TaskValuesSerializer, with the pagination key and
+            # the ETag columns, see ConditionalGetMixin
+            columns = TaskValuesSerializer.columns(fields) + [
+                "date_created",
+                "id",
+                "date_modified",
+            ]
+            return queryset.values(*dict.fromkeys(columns))
+        if self.action == "retrieve" and fields:
+            # date_modified feeds the ETag, see ConditionalGetMixin
+            return queryset.only(*fields, "date_modified")
+        return queryset
 
-        return Task.objects.all()
+    def perform_create(self, serializer):
+        self.check_project(serializer.validated_data["project"].pk)
+        super().perform_create(serializer)
+
+    def perform_update(self, serializer):
+        if "project" in serializer.validated_data:
+            self.check_project(serializer.validated_data["project"].pk)
+        super().perform_update(serializer)
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action == "list" and kwargs.get("many"):
+            return TaskValuesSerializer(*args, fields=self._requested_fields())
+        if self.action == "retrieve":
+            kwargs["fields"] = self._requested_fields()
+        return super().get_serializer(*args, **kwargs)
+
+    @action(detail=False, methods=["post"], serializer_class=TaskBulkSerializer)
+    def bulk(self, request):
+        serializer = TaskBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        payload = serializer.validated_data
+        project_ids = list(get_project_roles(request))
+
+        data = {
+            "create": bulk_create_tasks(
+                payload.get("create", []), request.user, project_ids
+            ),
+            "update": bulk_update_tasks(payload.get("update", []), project_ids),
+            "delete": bulk_delete_tasks(payload.get("delete", []), project_ids),
+        }
+        return JsonResponse(data=data)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        serializer_class=TaskSearchResultSerializer,
+        pagination_class=TaskSearchPagination,
+    )
+    def search(self, request):
+        """Full-text search over name, description and acceptance criteria.
+
+        Combines with the regular filters, e.g. ?q=login&project=1&status=IP.
+        """
+        query = TaskSearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        tasks = search_tasks(
+            self.filter_queryset(self.get_queryset()), query.validated_data["q"]
+        ).only(*Task.SHORT_FIELDS, "custom_number", "project")
+
+        page = self.paginate_queryset(tasks)
+        data = TaskSearchResultSerializer(page, many=True).data
+        return self.get_paginated_response(data)
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        """Tasks created, modified or removed in the caller's projects since
+        the ``since`` cursor; pass the returned ``cursor`` to the next call
+        and keep calling while ``has_more`` is set. Answers 410 when the
+        cursor is too old or the caller joined or left projects since."""
+        query = TaskChangesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        try:
+            changes = get_changes(
+                request.user,
+                query.validated_data.get("since"),
+                limit=query.validated_data["limit"],
+            )
+        except ExpiredCursor:
+            return JsonResponse(
+                data={"error": "Курсор устарел, требуется полная синхронизация"},
+                status=status.HTTP_410_GONE,
+            )
+
+        changes["changed"] = TaskSerializer(changes["changed"], many=True).data
+        return JsonResponse(data=changes)
 
     @action(
         detail=True, methods=["get"], serializer_class=TasksRelationCategoriesSerializer
     )
     def related(self, request, pk=None):
         task = self.get_object()
+        project_ids = list(get_project_roles(request))
         data = defaultdict(list)
 
-        from_relations = TasksRelation.objects.filter(from_task=task).select_related(
-            "to_task"
-        )
-        for rel in from_relations:
-            data[RelationType(rel.relation_type).value].append(rel.to_task)
+        # Both directions in one UNION query, projecting only the fields of
+        # TaskShortSerializer; tasks of projects the caller is not in are left
+        # out
+        columns = [f"task_{field}" for field in Task.SHORT_FIELDS]
 
-        # Нахоодим пару
-        to_relations = TasksRelation.objects.filter(to_task=task).select_related(
-            "from_task"
+        def linked_tasks(relations, other, outgoing):
+            return relations.annotate(
+                outgoing=Value(outgoing, output_field=BooleanField()),
+                **{
+                    column: F(f"{other}__{field}")
+                    for column, field in zip(columns, Task.SHORT_FIELDS)
+                },
+            ).values_list("relation_type", "outgoing", *columns)
+
+        rows = linked_tasks(
+            TasksRelation.objects.filter(
+                from_task=task, to_task__project_id__in=project_ids
+            ),
+            "to_task",
+            True,
+        ).union(
+            linked_tasks(
+                TasksRelation.objects.filter(
+                    to_task=task, from_task__project_id__in=project_ids
+                ),
+                "from_task",
+                False,
+            ),
+            all=True,
         )
-        for rel in to_relations:
-            for row in TasksRelation.PAIRS:
-                if rel.relation_type in row:
-                    idx = 0 if row.index(rel.relation_type) == 1 else 1
-                    pair = row[idx]
-                    data[pair.value].append(rel.from_task)
+        for relation_type, outgoing, *fields in rows:
+            if not outgoing:
+                relation_type = TasksRelation.INVERSE_TYPES[relation_type]
+            data[relation_type].append(dict(zip(Task.SHORT_FIELDS, fields)))
 
         transformed_data = [{"relation_type": k, "tasks": v} for k, v in data.items()]
 
         data = TasksRelationCategoriesSerializer({"relations": transformed_data}).data
         return JsonResponse(data={"results": data})
 
+    @action(detail=True, methods=["get"], serializer_class=DependencyGraphSerializer)
+    def dependency_graph(self, request, pk=None):
+        query = DependencyGraphQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        graph = get_dependency_graph(
+            self.get_object(),
+            max_depth=query.validated_data["depth"],
+            project_ids=list(get_project_roles(request)),
+        )
+        return JsonResponse(data=DependencyGraphSerializer(graph).data)
+
+    @action(detail=True, methods=["get"], serializer_class=TimeSpentSerializer)
+    def time_spent(self, request, pk=None):
+        data = TimeSpentSerializer(get_time_spent(self.get_object())).data
+        return JsonResponse(data=data)
+
     @action(detail=True, methods=["post"], serializer_class=ConnectTasksSerializer)
     def connect(self, request, pk=None):
-        serializer = ConnectTasksSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        TasksRelation.objects.create(
-            from_task=self.get_object(),
-            to_task=serializer.validated_data["to_task"],
-            relation_type=serializer.validated_data["relation_type"],
+        task = self.get_object()
+        serializer = ConnectTasksSerializer(
+            data=request.data,
+            context={
+                "from_task": task,
+                "project_ids": list(get_project_roles(request)),
+            },
         )
 
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            try:
+                with transaction.atomic():
+                    TasksRelation.objects.create(
+                        from_task=task,
+                        to_task=serializer.validated_data["to_task"],
+                        relation_type=serializer.validated_data["relation_type"],
+                    )
+            except IntegrityError:
+                return JsonResponse(
+                    data={"error": "Задачи уже связаны"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
         return JsonResponse(data=serializer.data)
+
+
+class LogTimeTaskViewSet(ProjectScopedMixin, ModelViewSet):
+    queryset = LogTimeTask.objects.all()
+    serializer_class = LogTimeTaskSerializer
+    pagination_class = LogTimeCursorPagination
+    filter_backends = (filters.DjangoFilterBackend,)
+    filterset_fields = ("task", "user")
+    project_field = "task__project_id"
+
+    def perform_create(self, serializer):
+        self.check_project(serializer.validated_data["task"].project_id)
+        serializer.save(user=self.request.user)
+
+    def perform_update(self, serializer):
+        if "task" in serializer.validated_data:
+            self.check_project(serializer.validated_data["task"].project_id)
+        super().perform_update(serializer)
+
+    @action(detail=False, methods=["get"], serializer_class=TimesheetSerializer)
+    def timesheet(self, request):
+        """Hours per day and task of a user (the caller by default)."""
+        query = TimesheetQuerySerializer(
+            data=request.query_params, context={"user": request.user}
+        )
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        # Only time logged in the caller's projects is shown
+        project_ids = list(get_project_roles(request))
+        if "project" in params:
+            self.check_project(params["project"])
+            project_ids = [params["project"]]
+        timesheet = get_timesheet(
+            params["user"].pk, params["date_from"], params["date_to"], project_ids
+        )
+        return JsonResponse(data=TimesheetSerializer(timesheet).data)
+
+
+class CommentViewSet(ProjectScopedMixin, ModelViewSet):
+    """Comments of a task, nested under tasks/{task_pk}/comments/."""
+
+    queryset = Comment.objects.all()
+    serializer_class = CommentSerializer
+    pagination_class = CommentCursorPagination
+    project_field = "task__project_id"
+    # The queryset is scoped already; the object check would load the task
+    permission_classes = (IsAuthenticated,)
+    query_budgets = {"list": 3, "create": 4}
+
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .filter(task_id=self.kwargs["task_pk"])
+            .select_related("user")
+        )
+
+    def perform_create(self, serializer):
+        task = get_object_or_404(
+            Task,
+            pk=self.kwargs["task_pk"],
+            project_id__in=list(get_project_roles(self.request)),
+        )
+        serializer.save(task=task, user=self.request.user)
+
+    def _check_author(self, comment):
+        if comment.user_id != self.request.user.pk:
+            raise PermissionDenied("Можно изменять только свои комментарии")
+
+    def perform_update(self, serializer):
+        self._check_author(serializer.instance)
+        super().perform_update(serializer)
+
+    def perform_destroy(self, instance):
+        self._check_author(instance)
+        super().perform_destroy(instance)
@@ -0,0 +1,125 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from jirabas.users.models import User
+
+AUTH_USER_FIELDS = ("id", "is_active", "username", "name")
+AUTH_USER_CACHE_TIMEOUT = 5 * 60
+# Entries kept by every worker; a change made elsewhere is seen by this
+# worker at most AUTH_USER_LOCAL_TTL seconds later
+AUTH_USER_LOCAL_SIZE = 1024
+AUTH_USER_LOCAL_TTL = 5
+
+
+def _user_key(user_id) -> str:
+    return f"auth-user:{user_id}"
+
+
+class UserStateCache:
+    """Minimal state of authenticated users, looked up in a small in-process
+    LRU first and in the shared cache (Redis in production) second."""
+
+    def __init__(self, size=AUTH_USER_LOCAL_SIZE, ttl=AUTH_USER_LOCAL_TTL):
+        self._size = size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def _get_local(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, state = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return state
+
+    def _set_local(self, user_id, state):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self._ttl, state)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+
+    def get(self, user_id):
+        """Return the AUTH_USER_FIELDS of the user as a dict, or None when
+        there is no such user."""
+        state = self._get_local(user_id)
+        if state is not None:
+            return state
+
+        state = cache.get(_user_key(user_id))
+        if state is None:
+            state = User.objects.filter(pk=user_id).values(*AUTH_USER_FIELDS).first()
+            if state is None:
+                return None
+            cache.set(_user_key(user_id), state, AUTH_USER_CACHE_TIMEOUT)
+        self._set_local(user_id, state)
+        return state
+
+    def invalidate(self, user_id):
+        cache.delete(_user_key(user_id))
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_state_cache = UserStateCache()
+
+
+def invalidate_cached_user(*user_ids):
+    """Drop the cached state of users once the current transaction commits,
+    so the old state cannot be cached again before the change is visible."""
+
+    def invalidate():
+        for user_id in user_ids:
+            user_state_cache.invalidate(user_id)
+
+    transaction.on_commit(invalidate)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication without a users query on every request.
+
+    The user is built from the cached AUTH_USER_FIELDS; any other field is
+    deferred and loaded on first access.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        except (TypeError, ValueError):
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        state = user_state_cache.get(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        # from_db() expects the values in the order of the model fields
+        fields = [
+            field.attname
+            for field in User._meta.concrete_fields
+            if field.attname in state
+        ]
+        user = User.from_db(
+            DEFAULT_DB_ALIAS, fields, [state[field] for field in fields]
+        )
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,24 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Django compiles icontains to UPPER(column) LIKE UPPER(%s), so the trigram
+# indexes are built over the same expression to be usable by it.
+SEARCH_FIELDS = ('username', 'name', 'email')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_add_abbreviation_values'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+    ] + [
+        migrations.RunSQL(
+            f'CREATE INDEX users_user_{field}_trgm_idx '
+            f'ON users_user USING gin (UPPER({field}) gin_trgm_ops)',
+            reverse_sql=f'DROP INDEX users_user_{field}_trgm_idx',
+        )
+        for field in SEARCH_FIELDS
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.0.11 on 2026-10-18 14:46
+
+from django.db import migrations
+import jirabas.users.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_search_trgm_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', jirabas.users.models.UserManager()),
+            ],
+        ),
+    ]
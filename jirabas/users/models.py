@@ -1,15 +1,37 @@
 from django.contrib.auth.models import AbstractUser
-from django.db.models import CharField, Model, TextField
+from django.contrib.auth.models import UserManager as BaseUserManager
+from django.db.models import CharField, Model, QuerySet, TextField
+
+
+class UserQuerySet(QuerySet):
+    def update(self, **kwargs):
+        # The authentication module imports this one
+        from jirabas.users.authentication import invalidate_cached_user
+
+        # Cached users are dropped on post_save, which update() (and
+        # bulk_update()) does not send, e.g. deactivating users in bulk
+        user_ids = list(self.values_list("pk", flat=True))
+        updated = super().update(**kwargs)
+        invalidate_cached_user(*user_ids)
+        return updated
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    pass
 
 
 class User(AbstractUser):
     name = CharField("Name of User", blank=True, max_length=255)
 
+    objects = UserManager()
+
     def __str__(self):
         return self.name
 
 
 class Role(Model):
+    PROJECT_MANAGER = "Проектный менеджер"
+
     name = CharField("Name", blank=False, max_length=255, unique=True, db_index=True)
     abbreviation = CharField("Abbreviation", blank=True, max_length=3, db_index=True)
     description = TextField("Description", blank=True, max_length=700)
@@ -19,4 +41,7 @@ class Role(Model):
 
     @classmethod
     def get_project_manager(cls) -> "Role":
-        return cls.objects.get(name="Проектный менеджер")
+        # The registry module imports this one
+        from jirabas.users.roles import role_registry
+
+        return role_registry.get_by_name(cls.PROJECT_MANAGER)
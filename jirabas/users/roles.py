@@ -0,0 +1,88 @@
+import time
+
+from django.core.cache import cache
+
+from jirabas.users.models import Role
+
+ROLES_VERSION_KEY = "roles:version"
+# How often a worker compares its copy with the shared version key
+ROLES_VERSION_CHECK_INTERVAL = 5
+
+
+class RoleRegistry:
+    """In-process copy of all roles with O(1) lookups.
+
+    Roles are loaded once per worker. Saving a role bumps a version key in
+    the shared cache (Redis in production); every worker compares it with
+    its own copy at most every ROLES_VERSION_CHECK_INTERVAL seconds and
+    reloads when it changed.
+    """
+
+    def __init__(self):
+        self._version = None
+        self._checked_at = None
+        self._by_id = {}
+        self._by_name = {}
+        self._by_abbreviation = {}
+        # (index, key) pairs missing from the current version
+        self._missing = set()
+
+    def _load(self, version):
+        roles = list(Role.objects.all())
+        self._by_id = {role.pk: role for role in roles}
+        self._by_name = {role.name: role for role in roles}
+        self._by_abbreviation = {role.abbreviation: role for role in roles}
+        self._missing = set()
+        self._version = version
+
+    def _refresh(self):
+        now = time.monotonic()
+        if (
+            self._checked_at is not None
+            and now - self._checked_at < ROLES_VERSION_CHECK_INTERVAL
+        ):
+            return
+
+        version = cache.get(ROLES_VERSION_KEY, 0)
+        if self._checked_at is None or version != self._version:
+            self._load(version)
+        self._checked_at = now
+
+    def _lookup(self, index: str, key) -> Role:
+        self._refresh()
+        try:
+            return getattr(self, index)[key]
+        except KeyError:
+            pass
+
+        if (index, key) not in self._missing:
+            version = cache.get(ROLES_VERSION_KEY, 0)
+            if version != self._version:
+                # Created by another worker since the last version check
+                self._load(version)
+        try:
+            return getattr(self, index)[key]
+        except KeyError:
+            self._missing.add((index, key))
+            raise Role.DoesNotExist(f"Role {key!r} does not exist")
+
+    def get_by_id(self, pk: int) -> Role:
+        return self._lookup("_by_id", pk)
+
+    def get_by_name(self, name: str) -> Role:
+        return self._lookup("_by_name", name)
+
+    def get_by_abbreviation(self, abbreviation: str) -> Role:
+        return self._lookup("_by_abbreviation", abbreviation)
+
+    def invalidate(self):
+        """Make every worker reload the roles on its next lookup."""
+        try:
+            cache.incr(ROLES_VERSION_KEY)
+        except ValueError:
+            if not cache.add(ROLES_VERSION_KEY, 1, timeout=None):
+                cache.incr(ROLES_VERSION_KEY)
+        self._checked_at = None
+
+
+role_registry = RoleRegistry()
@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from jirabas.users.authentication import invalidate_cached_user
+from jirabas.users.models import Role, User
+from jirabas.users.roles import role_registry
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    # Covers UserViewSet, the admin and deactivation from the shell alike
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def drop_cached_roles(sender, instance, **kwargs):
+    transaction.on_commit(role_registry.invalidate)
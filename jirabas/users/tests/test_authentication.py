@@ -0,0 +1,67 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from jirabas.users.authentication import user_state_cache
+from jirabas.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def token_client(user: User) -> APIClient:
+    user_state_cache.clear()
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client
+
+
+def test_authentication_is_cached(user: User, token_client: APIClient):
+    with CaptureQueriesContext(connection) as queries:
+        response = token_client.get("/api/roles/")
+    assert response.status_code == 200
+    assert any('"users_user"' in query["sql"] for query in queries)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = token_client.get("/api/roles/")
+    assert response.status_code == 200
+    assert not any('"users_user"' in query["sql"] for query in queries)
+
+
+def test_authentication_invalidated_on_update(
+    user: User, token_client: APIClient, run_on_commit
+):
+    token_client.get("/api/roles/")
+
+    response = token_client.patch(f"/api/users/{user.pk}/", {"name": "Renamed"})
+    assert response.status_code == 200
+    run_on_commit()
+
+    assert token_client.get("/api/users/me/").json()["name"] == "Renamed"
+
+
+def test_deactivated_user_is_rejected(
+    user: User, token_client: APIClient, run_on_commit
+):
+    assert token_client.get("/api/roles/").status_code == 200
+
+    user.is_active = False
+    user.save(update_fields=["is_active"])
+    run_on_commit()
+
+    response = token_client.get("/api/roles/")
+    assert response.status_code == 401
+    assert response.json()["code"] == "user_inactive"
+
+
+def test_queryset_update_invalidates_cached_user(
+    user: User, token_client: APIClient, run_on_commit
+):
+    assert token_client.get("/api/roles/").status_code == 200
+
+    User.objects.filter(pk=user.pk).update(is_active=False)
+    run_on_commit()
+
+    assert token_client.get("/api/roles/").status_code == 401
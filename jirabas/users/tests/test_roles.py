@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from jirabas.tasks.cache import get_member_projects
+from jirabas.tasks.models import ProjectMembership
+from jirabas.tasks.tests.factories import ProjectFactory
+from jirabas.users.models import Role, User
+from jirabas.users.roles import RoleRegistry
+from jirabas.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_role_registry_lookups():
+    registry = RoleRegistry()
+    pm = Role.objects.get(name=Role.PROJECT_MANAGER)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert registry.get_by_name(Role.PROJECT_MANAGER) == pm
+        assert registry.get_by_abbreviation(pm.abbreviation) == pm
+        assert registry.get_by_id(pm.pk) == pm
+    assert len(queries) == 1
+
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(3):
+            with pytest.raises(Role.DoesNotExist):
+                registry.get_by_name("Unknown")
+    # Misses are remembered until the next version bump
+    assert len(queries) == 0
+
+    created = Role.objects.create(name="Unknown", abbreviation="UN")
+    registry.invalidate()
+    assert registry.get_by_name("Unknown") == created
+
+
+def test_role_viewset_invalidates_registry(user: User, run_on_commit):
+    registry = RoleRegistry()
+    registry.get_by_name(Role.PROJECT_MANAGER)
+    client = APIClient()
+    client.force_authenticate(user)
+
+    role = Role.objects.get(abbreviation="AN")
+    client.patch(f"/api/roles/{role.pk}/", {"abbreviation": "BA"})
+    run_on_commit()
+    # Skip the wait for the periodic version check
+    registry._checked_at = None
+
+    assert registry.get_by_id(role.pk).abbreviation == "BA"
+
+
+def test_role_change_shows_in_project_members(user: User, run_on_commit):
+    project = ProjectFactory()
+    role = Role.objects.get(abbreviation="DEV")
+    ProjectMembership.objects.create(project=project, member=user, role=role)
+    client = APIClient()
+    client.force_authenticate(user)
+    client.get(f"/api/projects/{project.pk}/users/")
+
+    client.patch(f"/api/roles/{role.pk}/", {"name": "Инженер"})
+    run_on_commit()
+    users = client.get(f"/api/projects/{project.pk}/users/").json()
+
+    assert users[0]["role"] == "Инженер"
+
+
+def test_role_delete_drops_cached_memberships(user: User, run_on_commit):
+    project = ProjectFactory()
+    observer = UserFactory()
+    role = Role.objects.create(name="Наблюдатель", abbreviation="OBS")
+    ProjectMembership.objects.create(
+        project=project, member=user, role=Role.get_project_manager()
+    )
+    ProjectMembership.objects.create(project=project, member=observer, role=role)
+    run_on_commit()
+    client = APIClient()
+    client.force_authenticate(user)
+    client.get(f"/api/projects/{project.pk}/users/")
+    assert project.pk in get_member_projects(observer.pk)
+
+    client.delete(f"/api/roles/{role.pk}/")
+    run_on_commit()
+    response = client.get(f"/api/projects/{project.pk}/users/")
+
+    assert response.status_code == 200
+    assert [row["id"] for row in response.json()] == [user.pk]
+    assert get_member_projects(observer.pk) == {}
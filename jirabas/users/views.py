@@ -1,6 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.http import JsonResponse
-from django.shortcuts import get_object_or_404
+from django.http import Http404
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
@@ -9,14 +8,16 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from jirabas.tasks.models import Project, ProjectMembership
+from jirabas.tasks.permissions import get_project_roles
 from jirabas.users.models import Role
+from jirabas.users.roles import role_registry
 from jirabas.users.serializers import (
     RoleSerializer,
     UserProjectInfoSerializer,
     UserSerializer,
     UserShortInfoSerializer,
 )
+from jirabas.utils.json import JsonResponse
 
 User = get_user_model()
 
@@ -59,17 +60,17 @@ class UserViewSet(ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        project = get_object_or_404(Project, pk=request.query_params["project"])
-        membership = get_object_or_404(
-            ProjectMembership, member=request.user, project=project
-        )
+        try:
+            role_id = get_project_roles(request)[int(request.query_params["project"])]
+        except (KeyError, ValueError):
+            raise Http404
 
         serializer = UserProjectInfoSerializer(
             {
                 "username": request.user.username,
                 "email": request.user.email,
                 "name": request.user.name,
-                "role": membership.role.name,
+                "role": role_registry.get_by_id(role_id).name,
             }
         )
         return JsonResponse(status=status.HTTP_200_OK, data=serializer.data)
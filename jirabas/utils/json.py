@@ -0,0 +1,79 @@
+"""orjson-based JSON rendering for the API.
+
+Types orjson does not handle itself are passed to the stdlib-based encoder
+they used to go through (DRF's for API responses, DjangoJSONEncoder for
+JsonResponse), so datetimes, Decimals and lazy translations keep their
+previous representation.
+"""
+
+import orjson
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Datetimes go through the fallback encoder as well: orjson formats them
+# differently (no "Z" suffix, microseconds where Django keeps milliseconds)
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+_django_default = DjangoJSONEncoder().default
+_drf_default = JSONEncoder().default
+
+
+def dumps(data, default=_django_default, indent=False) -> bytes:
+    """Encode ``data`` like ``json.dumps(data, cls=DjangoJSONEncoder)``."""
+    option = (OPTIONS | orjson.OPT_INDENT_2) if indent else OPTIONS
+    return orjson.dumps(data, default=default, option=option)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Drop-in replacement for DRF's JSONRenderer.
+
+    Any requested indentation is rendered with orjson's 2 spaces.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        content = dumps(data, default=_drf_default, indent=bool(indent))
+        # Keep the output a strict JavaScript subset, as JSONRenderer does
+        return content.replace(LINE_SEPARATOR, b"\\u2028").replace(
+            PARAGRAPH_SEPARATOR, b"\\u2029"
+        )
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        content = stream.read() if stream is not None else b""
+        if encoding.lower().replace("-", "") != "utf8":
+            content = content.decode(encoding)
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
+
+
+class JsonResponse(HttpResponse):
+    """django.http.JsonResponse encoding with orjson."""
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                "In order to allow non-dict objects to be serialized set the "
+                "safe parameter to False."
+            )
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
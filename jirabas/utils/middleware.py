@@ -0,0 +1,120 @@
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("jirabas.sql")
+
+# Transaction control issued around the view (ATOMIC_REQUESTS), not by it
+IGNORED_SQL_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryStats:
+    """``connection.execute_wrapper`` that counts the queries, their total
+    time and repeated SQL (the same statement with any parameters)."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.startswith(IGNORED_SQL_PREFIXES):
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self) -> int:
+        return sum(count - 1 for count in self.statements.values())
+
+
+class QueryCountMiddleware:
+    """Counts the SQL queries of every request.
+
+    The number of queries, DB time and repeated statements are returned in
+    the Server-Timing header and logged to ``jirabas.sql``. A viewset can
+    declare ``query_budgets = {action: queries}``; requests over the budget
+    are logged as warnings, or fail with QueryBudgetExceeded when
+    QUERY_BUDGET_RAISE is set (tests). Queries of a streamed body run after
+    the response is returned and are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        request._query_view = None
+        request._query_budget = None
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        response["Server-Timing"] = (
+            f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", '
+            f'dup;desc="{stats.duplicates} repeated", '
+            f"total;dur={total * 1000:.1f}"
+        )
+        self._log(request, response, stats, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # DRF views keep their class, viewsets also the method -> action map
+        cls = getattr(view_func, "cls", None)
+        if cls is None:
+            return None
+
+        action = (getattr(view_func, "actions", None) or {}).get(request.method.lower())
+        request._query_view = f"{cls.__name__}.{action}" if action else cls.__name__
+        request._query_budget = getattr(cls, "query_budgets", {}).get(action)
+        return None
+
+    @staticmethod
+    def _log(request, response, stats, total):
+        data = {
+            "method": request.method,
+            "path": request.path,
+            "view": request._query_view,
+            "status": response.status_code,
+            "queries": stats.count,
+            "db_ms": round(stats.duration * 1000, 1),
+            "duplicates": stats.duplicates,
+            "total_ms": round(total * 1000, 1),
+            "budget": request._query_budget,
+        }
+        logger.info(
+            "%(method)s %(path)s %(status)s: %(queries)s queries in %(db_ms)s ms",
+            data,
+            extra={"sql": data},
+        )
+
+        budget = request._query_budget
+        if budget is None or stats.count <= budget:
+            return
+
+        message = (
+            f"{request._query_view} made {stats.count} queries, "
+            f"over its budget of {budget}"
+        )
+        if settings.QUERY_BUDGET_RAISE:
+            repeated = [sql for sql, count in stats.statements.items() if count > 1]
+            raise QueryBudgetExceeded(f"{message}; repeated: {repeated}")
+        logger.warning(message, extra={"sql": data})
@@ -0,0 +1,51 @@
+import io
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from django.http import JsonResponse as DjangoJsonResponse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from jirabas.utils.json import JsonResponse, ORJSONParser, ORJSONRenderer
+
+DATA = {
+    "created": timezone.make_aware(datetime(2021, 3, 12, 10, 15, 1, 123456)),
+    "utc": datetime(2021, 3, 12, 10, 15, tzinfo=timezone.utc),
+    "naive": datetime(2021, 3, 12, 10, 15),
+    "day": date(2021, 3, 12),
+    "duration": timedelta(hours=1, seconds=30),
+    "amount": Decimal("1.50"),
+    "label": gettext_lazy("Name"),
+    "uuid": UUID("12345678123456781234567812345678"),
+    "text": "Задача готова",
+    1: [None, True, 2.5],
+}
+
+
+def test_renderer_matches_drf():
+    assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+    assert ORJSONRenderer().render(None) == b""
+
+    indented = ORJSONRenderer().render(DATA, "application/json; indent=4")
+    assert json.loads(indented) == json.loads(JSONRenderer().render(DATA))
+
+
+def test_json_response_matches_django():
+    assert json.loads(JsonResponse(DATA).content) == json.loads(
+        DjangoJsonResponse(DATA).content
+    )
+    assert JsonResponse([1], safe=False)["Content-Type"] == "application/json"
+    with pytest.raises(TypeError):
+        JsonResponse([1])
+
+
+def test_parser():
+    parser = ORJSONParser()
+    assert parser.parse(io.BytesIO('{"name": "Задача"}'.encode())) == {"name": "Задача"}
+    with pytest.raises(ParseError):
+        parser.parse(io.BytesIO(b"{"))
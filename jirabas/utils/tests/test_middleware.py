@@ -0,0 +1,52 @@
+import logging
+
+import pytest
+from rest_framework.test import APIClient
+
+from jirabas.tasks.models import ProjectMembership
+from jirabas.tasks.tests.factories import ProjectFactory, TaskFactory
+from jirabas.tasks.views import TaskViewSet
+from jirabas.users.models import Role, User
+from jirabas.utils.middleware import QueryBudgetExceeded
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    project = ProjectFactory()
+    ProjectMembership.objects.create(
+        project=project, member=user, role=Role.get_project_manager()
+    )
+    TaskFactory.create_batch(3, project=project)
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def test_server_timing_and_log(api_client: APIClient, caplog):
+    with caplog.at_level(logging.INFO, logger="jirabas.sql"):
+        response = api_client.get("/api/tasks/")
+
+    db, dup, total = response["Server-Timing"].split(", ")
+    assert db.startswith("db;dur=")
+    assert total.startswith("total;dur=")
+    (record,) = [r for r in caplog.records if r.name == "jirabas.sql"]
+    # Membership map and the page; savepoints are skipped
+    assert record.sql["view"] == "TaskViewSet.list"
+    assert record.sql["queries"] == 2
+    assert db.endswith('desc="2 queries"')
+
+
+def test_query_budget(api_client: APIClient, monkeypatch, settings, caplog):
+    monkeypatch.setattr(TaskViewSet, "query_budgets", {"list": 0})
+
+    with pytest.raises(QueryBudgetExceeded):
+        api_client.get("/api/tasks/")
+
+    settings.QUERY_BUDGET_RAISE = False
+    with caplog.at_level(logging.WARNING, logger="jirabas.sql"):
+        assert api_client.get("/api/tasks/").status_code == 200
+    assert caplog.records[-1].getMessage() == (
+        "TaskViewSet.list made 1 queries, over its budget of 0"
+    )